@@ -1,4 +1,5 @@
 from .pynab import Pynab
+from .async_pynab import AsyncPynab
 from pynab import Pynab
 
-__all__ = ["Pynab"]
+__all__ = ["Pynab", "AsyncPynab"]
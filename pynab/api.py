@@ -1,9 +1,15 @@
 import pynab.schemas as schemas
 from pynab.endpoints import Endpoints
+from pynab.frame import TransactionFrame
+from pynab.instrumentation import timed
+import pynab.constants as constants
 import pynab.enums as enums
-from datetime import datetime
+from datetime import date, datetime
+from enum import Enum
 import pynab.utils as utils
 
+import time
+
 
 class Api:
     def __init__(self, pynab=None):
@@ -19,6 +25,134 @@ class Api:
         self.pynab = pynab
         self.endpoints = Endpoints(pynab=self.pynab)
 
+    # Budget attribute holding the collection returned by each tracked endpoint
+    _budget_collections = {
+        "get_accounts": "_accounts",
+        "get_categories": "_category_groups",
+        "get_months": "_months",
+        "get_payees": "_payees",
+        "get_transactions": "_transactions",
+        "get_scheduled_transactions": "_scheduled_transactions",
+    }
+
+    def _server_knowledge(
+        self,
+        endpoint: str = None,
+        budget_id: str = "last-used",
+        resource_id: str = None,
+        track: bool = True,
+    ):
+        """
+        Returns the server knowledge to send with a delta request.
+
+        Args:
+            endpoint (str, optional): The name of the endpoint, e.g. "get_transactions". Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            resource_id (str, optional): The ID of the account, category, payee or month the request is scoped to. Defaults to None.
+            track (bool, optional): Whether the request is eligible for delta tracking. Defaults to True.
+
+        Returns:
+            int: The last known server knowledge, or 0 to request the full collection.
+        """
+        if not track:
+            return 0
+        return self.pynab.server_knowledges(
+            endpoint=endpoint, budget_id=budget_id, resource_id=resource_id
+        )
+
+    def _merge_delta(
+        self,
+        endpoint: str = None,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        resource_id: str = None,
+        data_json: dict = None,
+        collection=None,
+    ):
+        """
+        Records the server knowledge of a response and merges a delta into the tracked collection.
+
+        The first response for a `(budget_id, endpoint, resource_id)` key is
+        kept as the tracked collection. Later (delta) responses are merged into
+        it: changed entities are upserted and deleted ones are dropped. When a
+        budget is given, its matching collection is pointed at the tracked one.
+
+        Merges hold the Pynab instance's state lock, so concurrent requests
+        (e.g. from `AsyncPynab`) apply one at a time, and a response older than
+        the tracked server knowledge, which finished after a newer one, is not
+        merged over it.
+
+        Args:
+            endpoint (str, optional): The name of the endpoint, e.g. "get_transactions". Defaults to None.
+            budget (schemas.Budget, optional): The budget whose collection is kept in sync. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            resource_id (str, optional): The ID of the account, category, payee or month the request is scoped to. Defaults to None.
+            data_json (dict, optional): The `data` object of the response. Defaults to None.
+            collection (Union[utils._dict, schemas.Budget], optional): The collection parsed from the response. Defaults to None.
+
+        Returns:
+            Union[utils._dict, schemas.Budget]: The tracked collection, or `collection` if tracking is disabled.
+        """
+        if not self.pynab._track_server_knowledge:
+            return collection
+
+        key = (budget_id, endpoint, resource_id)
+        server_knowledge = data_json.get("server_knowledge", 0)
+        with self.pynab._state_lock, utils._dict._lock:
+            tracked = self.pynab._server_collections.get(key)
+            if tracked is None:
+                tracked = collection
+            elif server_knowledge >= self.pynab._server_knowledges.get(key, 0):
+                tracked.merge(collection)
+            else:
+                # An older response finished after a newer one was merged
+                server_knowledge = self.pynab._server_knowledges[key]
+
+            self.pynab._server_knowledges[key] = server_knowledge
+            self.pynab._server_collections[key] = tracked
+            self.pynab._synced_on[budget_id] = time.time()
+
+        if budget is not None and resource_id is None:
+            attribute = self._budget_collections.get(endpoint)
+            if attribute is not None:
+                setattr(budget, attribute, tracked)
+        return tracked
+
+    def _iter_response(
+        self,
+        response=None,
+        path: tuple = ("data",),
+        schema: type = None,
+        budget: schemas.Budget = None,
+    ):
+        """
+        Yields schema objects parsed incrementally from a streamed response.
+
+        Args:
+            response (Response, optional): The streamed response. Defaults to None.
+            path (tuple, optional): The keys leading to the array of items, e.g. ("data", "transactions"). Defaults to ("data",).
+            schema (type, optional): The schema class built from each item. Defaults to None.
+            budget (schemas.Budget, optional): The budget the items belong to. Defaults to None.
+
+        Yields:
+            object: One schema object per item.
+
+        Raises:
+            Exception: If the API response status code is not 200.
+        """
+        with response:
+            if response.status_code != 200:
+                error_json = response.json().get("error", {})
+                raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
+
+            items = utils.JsonStream(
+                chunks=response.iter_content(chunk_size=constants.STREAM_CHUNK_SIZE),
+                path=path,
+            )
+            for item_json in items:
+                yield schema(pynab=self.pynab, budget=budget, _json=item_json)
+
+    @timed
     def get_user(self):
         """
         Retrieves the user information from the API.
@@ -39,6 +173,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_budgets(self, include_accounts: bool = False):
         """
         Retrieves budgets from the API.
@@ -79,6 +214,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_budget(
         self,
         budget: schemas.Budget = None,
@@ -101,20 +237,27 @@ class Api:
 
         response = self.endpoints.request_get_budget(
             budget_id=budget_id,
-            last_knowledge_of_server=self.pynab._server_knowledges["get_budget"],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_budget", budget_id=budget_id
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_budget"] = data_json.get(
-                "server_knowledge", 0
+            return self._merge_delta(
+                endpoint="get_budget",
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=schemas.Budget(
+                    pynab=self.pynab, _json=data_json.get("budget", {})
+                ),
             )
-            return schemas.Budget(pynab=self.pynab, _json=data_json.get("budget", {}))
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_budget_settings(
         self, budget: schemas.Budget = None, budget_id: str = "last-used"
     ):
@@ -144,6 +287,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_accounts(
         self,
         budget: schemas.Budget = None,
@@ -166,26 +310,32 @@ class Api:
 
         response = self.endpoints.request_get_accounts(
             budget_id=budget_id,
-            last_knowledge_of_server=self.pynab._server_knowledges["get_accounts"],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_accounts", budget_id=budget_id
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_accounts"] = data_json.get(
-                "server_knowledge", 0
-            )
             accounts = utils._dict()
             for account_json in data_json.get("accounts", []):
                 account = schemas.Account(
                     pynab=self.pynab, budget=budget, _json=account_json
                 )
                 accounts[account.id] = account
-            return accounts
+            return self._merge_delta(
+                endpoint="get_accounts",
+                budget=budget,
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=accounts,
+            )
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def create_account(
         self,
         budget: schemas.Budget = None,
@@ -237,6 +387,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_account(
         self,
         budget: schemas.Budget = None,
@@ -274,6 +425,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_categories(
         self,
         budget: schemas.Budget = None,
@@ -297,27 +449,33 @@ class Api:
 
         response = self.endpoints.request_get_categories(
             budget_id=budget_id,
-            last_knowledge_of_server=self.pynab._server_knowledges["get_categories"],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_categories", budget_id=budget_id
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_categories"] = data_json.get(
-                "server_knowledge", 0
-            )
             category_groups = utils._dict()
             for category_group in data_json.get("category_groups", []):
                 category_group = schemas.CategoryGroup(
                     pynab=self.pynab, budget=budget, _json=category_group
                 )
                 category_groups[category_group.id] = category_group
-            return category_groups
+            return self._merge_delta(
+                endpoint="get_categories",
+                budget=budget,
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=category_groups,
+            )
 
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_category(
         self,
         budget: schemas.Budget = None,
@@ -359,6 +517,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def update_category(
         self,
         budget: schemas.Budget = None,
@@ -418,6 +577,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_category_for_month(
         self,
         budget: schemas.Budget = None,
@@ -461,6 +621,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def update_category_for_month(
         self,
         budget: schemas.Budget = None,
@@ -518,6 +679,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_payees(
         self,
         budget: schemas.Budget = None,
@@ -541,6 +703,9 @@ class Api:
 
         response = self.endpoints.request_get_payees(
             budget_id=budget_id,
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_payees", budget_id=budget_id
+            ),
         )
         _json = response.json()
 
@@ -550,11 +715,18 @@ class Api:
             for payee in data_json.get("payees", []):
                 payee = schemas.Payee(pynab=self.pynab, budget=budget, _json=payee)
                 payees[payee.id] = payee
-            return payees
+            return self._merge_delta(
+                endpoint="get_payees",
+                budget=budget,
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=payees,
+            )
 
         else:
             return schemas.Error(pynab=self.pynab, _json=_json.get("error", {}))
 
+    @timed
     def get_payee(
         self,
         budget: schemas.Budget = None,
@@ -595,6 +767,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def update_payee(
         self,
         budget: schemas.Budget = None,
@@ -641,6 +814,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_budget_payee_locations(
         self, budget: schemas.Budget = None, budget_id: str = "last-used"
     ):
@@ -676,6 +850,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_payee_location(
         self,
         budget: schemas.Budget = None,
@@ -719,6 +894,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_payee_locations(
         self,
         budget: schemas.Budget = None,
@@ -763,6 +939,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_months(
         self,
         budget: schemas.Budget = None,
@@ -785,15 +962,14 @@ class Api:
 
         response = self.endpoints.request_get_months(
             budget_id=budget_id,
-            last_knowledge_of_server=self.pynab._server_knowledges["get_months"],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_months", budget_id=budget_id
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_months"] = data_json.get(
-                "server_knowledge", 0
-            )
             months = utils._dict()
             for month in data_json.get("months", []):
                 month = schemas.Month(pynab=self.pynab, budget=budget, _json=month)
@@ -801,12 +977,19 @@ class Api:
                 year = month.month.strftime("%Y")
                 month_name = month.month.strftime("%B")
                 months[f"{year} - {month_name}"] = month
-            return months
+            return self._merge_delta(
+                endpoint="get_months",
+                budget=budget,
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=months,
+            )
 
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_month(
         self,
         budget: schemas.Budget = None,
@@ -848,6 +1031,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_transactions(
         self,
         budget: schemas.Budget = None,
@@ -872,31 +1056,175 @@ class Api:
         """
         budget_id = budget.id if budget else budget_id
 
+        track = not (since_date or type)
+
         response = self.endpoints.request_get_transactions(
             budget_id=budget_id,
             since_date=since_date,
             type=type,
-            last_knowledge_of_server=self.pynab._server_knowledges["get_transactions"],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_transactions", budget_id=budget_id, track=track
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_transactions"] = data_json.get(
-                "server_knowledge", 0
-            )
             transactions = utils._dict()
             for transaction in data_json.get("transactions", []):
                 transaction = schemas.Transaction(
                     pynab=self.pynab, budget=budget, _json=transaction
                 )
                 transactions[transaction.id] = transaction
-            return transactions
+            if not track:
+                return transactions
+            return self._merge_delta(
+                endpoint="get_transactions",
+                budget=budget,
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=transactions,
+            )
 
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    def iter_transactions(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        since_date: str = None,
+        type: str = None,
+    ):
+        """
+        Yields the transactions of a budget one at a time, parsing the response as it streams in.
+
+        Unlike `get_transactions`, the response is never held in memory as a
+        whole, so memory stays bounded however large the budget is. The request
+        is sent when iteration starts, and server knowledge is not tracked.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object to retrieve transactions from. Defaults to None.
+            budget_id (str, optional): The ID of the budget to retrieve transactions from. Defaults to "last-used".
+            since_date (str, optional): The date to retrieve transactions from. Defaults to None.
+            type (str, optional): The type of transactions to retrieve. Defaults to None.
+
+        Yields:
+            schemas.Transaction: The transactions, in the order the server returns them.
+
+        Raises:
+            Exception: If there is an error retrieving the transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+
+        response = self.endpoints.request_get_transactions(
+            budget_id=budget_id,
+            since_date=since_date,
+            type=type,
+            stream=True,
+        )
+        yield from self._iter_response(
+            response=response,
+            path=("data", "transactions"),
+            schema=schemas.Transaction,
+            budget=budget,
+        )
+
+    @timed
+    def get_transaction_frame(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        since_date: str = None,
+        type: str = None,
+    ):
+        """
+        Retrieves transactions as a columnar `TransactionFrame` instead of transaction objects.
+
+        Server knowledge is not tracked: the full (or date/type filtered) list is always fetched.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object to retrieve transactions from. Defaults to None.
+            budget_id (str, optional): The ID of the budget to retrieve transactions from. Defaults to "last-used".
+            since_date (str, optional): The date to retrieve transactions from. Defaults to None.
+            type (str, optional): The type of transactions to retrieve. Defaults to None.
+
+        Returns:
+            TransactionFrame: The transactions, one row each.
+
+        Raises:
+            Exception: If there is an error retrieving the transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+
+        response = self.endpoints.request_get_transactions(
+            budget_id=budget_id,
+            since_date=since_date,
+            type=type,
+        )
+        _json = response.json()
+
+        if response.status_code == 200:
+            data_json = _json.get("data", {})
+            return TransactionFrame.from_json(
+                pynab=self.pynab,
+                budget=budget,
+                transactions=data_json.get("transactions", []),
+            )
+        else:
+            error_json = _json.get("error", {})
+            raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
+
+    @staticmethod
+    def _save_transaction(transaction=None):
+        """
+        Builds the body of a transaction to create, as expected by `POST /budgets/{budget_id}/transactions`.
+
+        Dictionaries may hold `date` / `datetime` objects and enums, as the
+        schema objects do; they are converted to the JSON values the API
+        expects.
+
+        Args:
+            transaction (Union[schemas.Transaction, dict]): The transaction, or a dictionary with the same fields.
+
+        Returns:
+            dict: The transaction body.
+        """
+        if isinstance(transaction, dict):
+            transaction_dict = transaction
+        else:
+            transaction_dict = transaction.to_dict()
+
+        subtransactions = transaction_dict.get("subtransactions") or []
+        body = {
+            "account_id": transaction_dict.get("account_id"),
+            "date": transaction_dict.get("date"),
+            "amount": transaction_dict.get("amount"),
+            "payee_id": transaction_dict.get("payee_id"),
+            "payee_name": transaction_dict.get("payee_name"),
+            "category_id": transaction_dict.get("category_id"),
+            "memo": transaction_dict.get("memo"),
+            "cleared": transaction_dict.get("cleared"),
+            "approved": transaction_dict.get("approved"),
+            "flag_color": transaction_dict.get("flag_color"),
+            "subtransactions": [
+                schemas.SubTransaction._save(subtransaction)
+                for subtransaction in subtransactions
+            ],
+            "import_id": transaction_dict.get("import_id"),
+        }
+        for field in ("date", "cleared", "flag_color"):
+            value = body[field]
+            if isinstance(value, datetime):
+                value = value.date()
+            if isinstance(value, date):
+                body[field] = value.isoformat()
+            elif isinstance(value, Enum):
+                body[field] = value.value
+        return body
+
+    @timed
     def create_transactions(
         self,
         budget: schemas.Budget = None,
@@ -906,10 +1234,13 @@ class Api:
         """
         Create transactions in the specified budget.
 
+        All transactions are sent in one request; use `pynab.bulk.BulkWriter`
+        to create large lists in chunks.
+
         Args:
             budget (schemas.Budget, optional): The budget object. Defaults to None.
             budget_id (str, optional): The ID of the budget. Defaults to "last-used".
-            transactions (list, optional): The list of transactions to create. Defaults to None.
+            transactions (list, optional): The list of transactions to create, as `schemas.Transaction` objects or dictionaries. Defaults to None.
 
         Returns:
             Union[List[schemas.Transaction], Dict[str, Any]]: If a single transaction is created, returns the created transaction as a dictionary. If multiple transactions are created, returns a list of created transactions.
@@ -920,48 +1251,13 @@ class Api:
         budget_id = budget.id if budget else budget_id
 
         if len(transactions) == 1:
-            transaction_dict = transactions[0].to_dict()
-
+            request_body = {"transaction": self._save_transaction(transactions[0])}
+        else:
             request_body = {
-                "transaction": {
-                    "account_id": transaction_dict.get("account_id"),
-                    "date": transaction_dict.get("date"),
-                    "amount": transaction_dict.get("amount"),
-                    "payee_id": transaction_dict.get("payee_id"),
-                    "payee_name": transaction_dict.get("payee_name"),
-                    "category_id": transaction_dict.get("category_id"),
-                    "memo": transaction_dict.get("memo"),
-                    "flag_color": transaction_dict.get("flag_color"),
-                    "cleared": transaction_dict.get("cleared"),
-                    "approved": transaction_dict.get("approved"),
-                    "flag_color": transaction_dict.get("flag_color"),
-                    "subtransactions": transaction_dict.get("subtransactions"),
-                    "import_id": transaction_dict.get("import_id"),
-                }
+                "transactions": [
+                    self._save_transaction(transaction) for transaction in transactions
+                ]
             }
-        else:
-            transactions_list = []
-            for transaction in transactions:
-                transaction_dict = transactions[0].to_dict()
-
-                transactions_list.append(
-                    {
-                        "account_id": transaction_dict.get("account_id"),
-                        "date": transaction_dict.get("date"),
-                        "amount": transaction_dict.get("amount"),
-                        "payee_id": transaction_dict.get("payee_id"),
-                        "payee_name": transaction_dict.get("payee_name"),
-                        "category_id": transaction_dict.get("category_id"),
-                        "memo": transaction_dict.get("memo"),
-                        "flag_color": transaction_dict.get("flag_color"),
-                        "cleared": transaction_dict.get("cleared"),
-                        "approved": transaction_dict.get("approved"),
-                        "flag_color": transaction_dict.get("flag_color"),
-                        "subtransactions": transaction_dict.get("subtransactions"),
-                        "import_id": transaction_dict.get("import_id"),
-                    }
-                )
-            request_body = {"transactions": transactions_list}
 
         response = self.endpoints.request_create_transactions(
             budget_id=budget_id, request_body=request_body
@@ -983,6 +1279,7 @@ class Api:
                     budget=budget,
                     _json=data_json.get("transaction", {}),
                 )
+                return ret_val
             else:
                 transactions = []
                 for transaction in data_json.get("transactions", []):
@@ -996,6 +1293,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def update_transactions(
         self,
         budget: schemas.Budget = None,
@@ -1005,6 +1303,11 @@ class Api:
         """
         Update transactions in the budget.
 
+        Only the fields changed since each transaction was loaded are sent
+        (see `schemas.Transaction.changes`), and transactions without changes
+        are left out. If no transaction changed, no request is sent. Sent
+        transactions are marked clean once the update succeeds.
+
         Args:
             budget (schemas.Budget, optional): The budget object. Defaults to None.
             budget_id (str, optional): The ID of the budget. Defaults to "last-used".
@@ -1018,9 +1321,22 @@ class Api:
         """
         budget_id = budget.id if budget else budget_id
 
-        request_body = {
-            "transactions": [transaction.to_dict() for transaction in transactions]
+        changed = []
+        request_body = {"transactions": []}
+        for transaction in transactions:
+            changes = transaction.changes()
+            if changes:
+                changed.append((transaction, changes))
+                request_body["transactions"].append({"id": transaction.id, **changes})
+
+        ret_val = {
+            "transaction_ids": [],
+            "duplicate_import_ids": [],
+            "server_knowledge": 0,
+            "transactions": [],
         }
+        if not changed:
+            return ret_val
 
         response = self.endpoints.request_update_transactions(
             budget_id=budget_id, request_body=request_body
@@ -1029,11 +1345,14 @@ class Api:
 
         if response.status_code == 209:
             data_json = _json.get("data", {})
+            for transaction, changes in changed:
+                transaction.mark_clean(changes)
 
             ret_val = {
                 "transaction_ids": data_json.get("transaction_ids", []),
                 "duplicate_import_ids": data_json.get("duplicate_import_ids", []),
                 "server_knowledge": data_json.get("server_knowledge", 0),
+                "transactions": [],
             }
 
             if "transaction" in data_json:
@@ -1055,6 +1374,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def import_transactions(
         self, budget: schemas.Budget = None, budget_id: str = "last-used"
     ):
@@ -1078,6 +1398,7 @@ class Api:
         else:
             return schemas.Error(pynab=self.pynab, _json=_json.get("error", {}))
 
+    @timed
     def get_transaction(
         self,
         budget: schemas.Budget = None,
@@ -1118,6 +1439,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def update_transaction(
         self,
         budget: schemas.Budget = None,
@@ -1129,12 +1451,16 @@ class Api:
         """
         Update a transaction in the budget.
 
+        Given a transaction object, only the fields changed since it was
+        loaded are sent (see `schemas.Transaction.changes`); if none changed,
+        no request is sent and the transaction is returned as is.
+
         Args:
             budget (schemas.Budget, optional): The budget object. Defaults to None.
             budget_id (str, optional): The ID of the budget. Defaults to "last-used".
             transaction (schemas.Transaction, optional): The transaction object. Defaults to None.
             transaction_id (str, optional): The ID of the transaction. Defaults to None.
-            request_body (str, optional): The request body. Defaults to None.
+            request_body (str, optional): The request body, used when no transaction object is given. Defaults to None.
 
         Returns:
             schemas.Transaction: The updated transaction object.
@@ -1145,7 +1471,11 @@ class Api:
         budget_id = budget.id if budget else budget_id
         transaction_id = transaction.id if transaction else transaction_id
 
-        request_body = {"transaction": transaction.to_dict()}
+        if transaction is not None:
+            changes = transaction.changes()
+            if not changes:
+                return transaction
+            request_body = {"transaction": changes}
         response = self.endpoints.request_update_transaction(
             budget_id=budget_id,
             transaction_id=transaction_id,
@@ -1155,6 +1485,8 @@ class Api:
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
+            if transaction is not None:
+                transaction.mark_clean(changes)
             return schemas.Transaction(
                 pynab=self.pynab, _json=data_json.get("transaction", [])
             )
@@ -1162,6 +1494,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def delete_transaction(
         self,
         budget: schemas.Budget = None,
@@ -1201,6 +1534,7 @@ class Api:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    @timed
     def get_account_transactions(
         self,
         budget: schemas.Budget = None,
@@ -1230,34 +1564,91 @@ class Api:
         budget_id = budget.id if budget else budget_id
         account_id = account.id if account else account_id
 
+        track = not (since_date or type)
+
         response = self.endpoints.request_get_account_transactions(
             budget_id=budget_id,
             account_id=account_id,
             since_date=since_date,
             type=type,
-            last_knowledge_of_server=self.pynab._server_knowledges[
-                "get_account_transactions"
-            ],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_account_transactions",
+                budget_id=budget_id,
+                resource_id=account_id,
+                track=track,
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_account_transactions"] = data_json.get(
-                "server_knowledge", 0
-            )
             transactions = utils._dict()
             for transaction in data_json.get("transactions", []):
                 transaction = schemas.Transaction(
                     pynab=self.pynab, budget=budget, _json=transaction
                 )
                 transactions[transaction.id] = transaction
-            return transactions
+            if not track:
+                return transactions
+            return self._merge_delta(
+                endpoint="get_account_transactions",
+                budget=budget,
+                budget_id=budget_id,
+                resource_id=account_id,
+                data_json=data_json,
+                collection=transactions,
+            )
 
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    def iter_account_transactions(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        account: schemas.Account = None,
+        account_id: str = None,
+        since_date: str = None,
+        type: str = None,
+    ):
+        """
+        Yields the transactions of an account one at a time, parsing the response as it streams in.
+
+        See `iter_transactions`; server knowledge is not tracked.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            account (schemas.Account, optional): The account object. Defaults to None.
+            account_id (str, optional): The ID of the account. Defaults to None.
+            since_date (str, optional): The date to retrieve transactions since. Defaults to None.
+            type (str, optional): The type of transactions to retrieve. Defaults to None.
+
+        Yields:
+            schemas.Transaction: The transactions, in the order the server returns them.
+
+        Raises:
+            Exception: If there is an error retrieving the transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+        account_id = account.id if account else account_id
+
+        response = self.endpoints.request_get_account_transactions(
+            budget_id=budget_id,
+            account_id=account_id,
+            since_date=since_date,
+            type=type,
+            stream=True,
+        )
+        yield from self._iter_response(
+            response=response,
+            path=("data", "transactions"),
+            schema=schemas.Transaction,
+            budget=budget,
+        )
+
+    @timed
     def get_category_transactions(
         self,
         budget: schemas.Budget = None,
@@ -1287,33 +1678,90 @@ class Api:
         budget_id = budget.id if budget else budget_id
         category_id = category.id if category else category_id
 
+        track = not (since_date or type)
+
         response = self.endpoints.request_get_category_transactions(
             budget_id=budget_id,
             category_id=category_id,
             since_date=since_date,
             type=type,
-            last_knowledge_of_server=self.pynab._server_knowledges[
-                "get_category_transactions"
-            ],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_category_transactions",
+                budget_id=budget_id,
+                resource_id=category_id,
+                track=track,
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_category_transactions"] = data_json.get(
-                "server_knowledge", 0
-            )
             transactions = utils._dict()
             for transaction in data_json.get("transactions", []):
                 transaction = schemas.Transaction(
                     pynab=self.pynab, budget=budget, _json=transaction
                 )
                 transactions[transaction.id] = transaction
-            return transactions
+            if not track:
+                return transactions
+            return self._merge_delta(
+                endpoint="get_category_transactions",
+                budget=budget,
+                budget_id=budget_id,
+                resource_id=category_id,
+                data_json=data_json,
+                collection=transactions,
+            )
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    def iter_category_transactions(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        category: schemas.Category = None,
+        category_id: str = None,
+        since_date: str = None,
+        type: str = None,
+    ):
+        """
+        Yields the transactions of a category one at a time, parsing the response as it streams in.
+
+        See `iter_transactions`; server knowledge is not tracked.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            category (schemas.Category, optional): The category object. Defaults to None.
+            category_id (str, optional): The ID of the category. Defaults to None.
+            since_date (str, optional): The date to retrieve transactions since. Defaults to None.
+            type (str, optional): The type of transactions to retrieve. Defaults to None.
+
+        Yields:
+            schemas.Transaction: The transactions, in the order the server returns them.
+
+        Raises:
+            Exception: If there is an error retrieving the transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+        category_id = category.id if category else category_id
+
+        response = self.endpoints.request_get_category_transactions(
+            budget_id=budget_id,
+            category_id=category_id,
+            since_date=since_date,
+            type=type,
+            stream=True,
+        )
+        yield from self._iter_response(
+            response=response,
+            path=("data", "transactions"),
+            schema=schemas.Transaction,
+            budget=budget,
+        )
+
+    @timed
     def get_payee_transactions(
         self,
         budget: schemas.Budget = None,
@@ -1343,33 +1791,90 @@ class Api:
         budget_id = budget.id if budget else budget_id
         payee_id = payee.id if payee else payee_id
 
+        track = not (since_date or type)
+
         response = self.endpoints.request_get_payee_transactions(
             budget_id=budget_id,
             payee_id=payee_id,
             since_date=since_date,
             type=type,
-            last_knowledge_of_server=self.pynab._server_knowledges[
-                "get_payee_transactions"
-            ],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_payee_transactions",
+                budget_id=budget_id,
+                resource_id=payee_id,
+                track=track,
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_payee_transactions"] = data_json.get(
-                "server_knowledge", 0
-            )
             transactions = utils._dict()
             for transaction in data_json.get("transactions", []):
                 transaction = schemas.Transaction(
                     pynab=self.pynab, budget=budget, _json=transaction
                 )
                 transactions[transaction.id] = transaction
-            return transactions
+            if not track:
+                return transactions
+            return self._merge_delta(
+                endpoint="get_payee_transactions",
+                budget=budget,
+                budget_id=budget_id,
+                resource_id=payee_id,
+                data_json=data_json,
+                collection=transactions,
+            )
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    def iter_payee_transactions(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        payee: schemas.Payee = None,
+        payee_id: str = None,
+        since_date: str = None,
+        type: str = None,
+    ):
+        """
+        Yields the transactions of a payee one at a time, parsing the response as it streams in.
+
+        See `iter_transactions`; server knowledge is not tracked.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            payee (schemas.Payee, optional): The payee object. Defaults to None.
+            payee_id (str, optional): The ID of the payee. Defaults to None.
+            since_date (str, optional): The date to retrieve transactions since. Defaults to None.
+            type (str, optional): The type of transactions to retrieve. Defaults to None.
+
+        Yields:
+            schemas.Transaction: The transactions, in the order the server returns them.
+
+        Raises:
+            Exception: If there is an error retrieving the transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+        payee_id = payee.id if payee else payee_id
+
+        response = self.endpoints.request_get_payee_transactions(
+            budget_id=budget_id,
+            payee_id=payee_id,
+            since_date=since_date,
+            type=type,
+            stream=True,
+        )
+        yield from self._iter_response(
+            response=response,
+            path=("data", "transactions"),
+            schema=schemas.Transaction,
+            budget=budget,
+        )
+
+    @timed
     def get_month_transactions(
         self,
         budget: schemas.Budget = None,
@@ -1399,33 +1904,90 @@ class Api:
         budget_id = budget.id if budget else budget_id
         month_id = month.month if month else month_id
 
+        track = not (since_date or type)
+
         response = self.endpoints.request_get_month_transactions(
             budget_id=budget_id,
             month=month_id,
             since_date=since_date,
             type=type,
-            last_knowledge_of_server=self.pynab._server_knowledges[
-                "get_month_transactions"
-            ],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_month_transactions",
+                budget_id=budget_id,
+                resource_id=month_id,
+                track=track,
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_month_transactions"] = data_json.get(
-                "server_knowledge", 0
-            )
             transactions = utils._dict()
             for transaction in data_json.get("transactions", []):
                 transaction = schemas.Transaction(
                     pynab=self.pynab, budget=budget, _json=transaction
                 )
                 transactions[transaction.id] = transaction
-            return transactions
+            if not track:
+                return transactions
+            return self._merge_delta(
+                endpoint="get_month_transactions",
+                budget=budget,
+                budget_id=budget_id,
+                resource_id=month_id,
+                data_json=data_json,
+                collection=transactions,
+            )
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    def iter_month_transactions(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        month: schemas.Month = None,
+        month_id: str = "current",
+        since_date: str = None,
+        type: str = None,
+    ):
+        """
+        Yields the transactions of a budget month one at a time, parsing the response as it streams in.
+
+        See `iter_transactions`; server knowledge is not tracked.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            month (schemas.Month, optional): The month object. Defaults to None.
+            month_id (str, optional): The ID of the month. Defaults to "current".
+            since_date (str, optional): The date to retrieve transactions since. Defaults to None.
+            type (str, optional): The type of transactions to retrieve. Defaults to None.
+
+        Yields:
+            schemas.Transaction: The transactions, in the order the server returns them.
+
+        Raises:
+            Exception: If there is an error retrieving the transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+        month_id = month.month if month else month_id
+
+        response = self.endpoints.request_get_month_transactions(
+            budget_id=budget_id,
+            month=month_id,
+            since_date=since_date,
+            type=type,
+            stream=True,
+        )
+        yield from self._iter_response(
+            response=response,
+            path=("data", "transactions"),
+            schema=schemas.Transaction,
+            budget=budget,
+        )
+
+    @timed
     def get_scheduled_transactions(
         self,
         budget: schemas.Budget = None,
@@ -1449,29 +2011,65 @@ class Api:
 
         response = self.endpoints.request_get_scheduled_transactions(
             budget_id=budget_id,
-            last_knowledge_of_server=self.pynab._server_knowledges[
-                "get_scheduled_transactions"
-            ],
+            last_knowledge_of_server=self._server_knowledge(
+                endpoint="get_scheduled_transactions", budget_id=budget_id
+            ),
         )
         _json = response.json()
 
         if response.status_code == 200:
             data_json = _json.get("data", {})
-            self.pynab._server_knowledges["get_scheduled_transactions"] = data_json.get(
-                "server_knowledge", 0
-            )
             transactions = utils._dict()
             for scheduled_transaction in data_json.get("scheduled_transactions", []):
                 scheduled_transaction = schemas.ScheduledTransaction(
                     pynab=self.pynab, budget=budget, _json=scheduled_transaction
                 )
                 transactions[scheduled_transaction.id] = scheduled_transaction
-            return transactions
+            return self._merge_delta(
+                endpoint="get_scheduled_transactions",
+                budget=budget,
+                budget_id=budget_id,
+                data_json=data_json,
+                collection=transactions,
+            )
 
         else:
             error_json = _json.get("error", {})
             raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
 
+    def iter_scheduled_transactions(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+    ):
+        """
+        Yields the scheduled transactions of a budget one at a time, parsing the response as it streams in.
+
+        See `iter_transactions`; server knowledge is not tracked.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Yields:
+            schemas.ScheduledTransaction: The scheduled transactions, in the order the server returns them.
+
+        Raises:
+            Exception: If there is an error retrieving the scheduled transactions.
+        """
+        budget_id = budget.id if budget else budget_id
+
+        response = self.endpoints.request_get_scheduled_transactions(
+            budget_id=budget_id, stream=True
+        )
+        yield from self._iter_response(
+            response=response,
+            path=("data", "scheduled_transactions"),
+            schema=schemas.ScheduledTransaction,
+            budget=budget,
+        )
+
+    @timed
     def create_scheduled_transaction(
         self,
         budget: schemas.Budget = None,
@@ -1525,6 +2123,7 @@ class Api:
             error_json = _json.get("error", {})
             return schemas.Error(pynab=self.pynab, _json=error_json)
 
+    @timed
     def get_scheduled_transaction(
         self,
         budget: schemas.Budget = None,
@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+from pynab.api import Api
+from pynab import constants
+import asyncio
+import functools
+
+
+class AsyncApi:
+    """
+    Awaitable twin of `pynab.api.Api`.
+
+    Every `get_*`, `create_*`, `update_*`, `import_*` and `delete_*` method of
+    `Api` is exposed here as a coroutine with the same arguments and the same
+    `schemas` return values. Calls are dispatched onto a bounded pool of worker
+    threads that share the owning `Pynab` instance's keep-alive connection pool,
+    so `asyncio.gather` fans requests out over at most `max_concurrency`
+    connections at a time.
+
+    The workers share the `Pynab` instance's state: its rate limit count,
+    tracked server knowledge and collections, and sync times are guarded by
+    its state lock, and delta merges apply one at a time, newest knowledge
+    last. Schema objects returned to the caller are not locked; do not change
+    them while requests that merge into them are in flight.
+    """
+
+    def __init__(self, pynab=None, max_concurrency: int = constants.POOL_MAXSIZE):
+        """
+        Initializes an instance of the AsyncApi class.
+
+        Parameters:
+        - pynab (object): The synchronous Pynab instance that performs the requests.
+        - max_concurrency (int): The maximum number of requests in flight at once.
+
+        Returns:
+        - None
+        """
+        self.pynab = pynab
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="pynab"
+        )
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs a blocking callable on the request executor and awaits its result.
+
+        Args:
+            func (callable): The blocking callable, usually a bound `Api` method.
+            *args: Positional arguments for `func`.
+            **kwargs: Keyword arguments for `func`.
+
+        Returns:
+            The value returned by `func`.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def close(self):
+        """
+        Shuts down the request executor, waiting for in-flight requests.
+
+        Returns:
+            None
+        """
+        self._executor.shutdown(wait=True)
+
+
+def _awaitable(name: str):
+    """
+    Builds a coroutine method that forwards to the `Api` method of the same name.
+
+    Args:
+        name (str): The name of the `Api` method.
+
+    Returns:
+        function: The coroutine method.
+    """
+    method = getattr(Api, name)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self.run(getattr(self.pynab.api, name), *args, **kwargs)
+
+    return wrapper
+
+
+for _name, _member in vars(Api).items():
+    if callable(_member) and _name.startswith(
+        ("get_", "create_", "update_", "import_", "delete_")
+    ):
+        setattr(AsyncApi, _name, _awaitable(_name))
@@ -0,0 +1,80 @@
+from pynab.async_api import AsyncApi
+from pynab.pynab import Pynab
+from pynab import constants
+import asyncio
+
+
+class AsyncPynab:
+    def __init__(
+        self,
+        bearer: str = None,
+        max_concurrency: int = constants.POOL_MAXSIZE,
+        **kwargs,
+    ):
+        """
+        Initializes a new instance of the `AsyncPynab` class.
+
+        The instance wraps a synchronous `Pynab` client, which owns the
+        connection pool and the server knowledge, and exposes an `AsyncApi`
+        whose methods can be awaited and fanned out with `asyncio.gather`.
+        Schema objects returned by the async API belong to the wrapped client,
+        so their lazy properties still work but block while they fetch.
+
+        Args:
+            bearer (str, optional): The bearer token for authentication. Defaults to None.
+            max_concurrency (int, optional): The maximum number of requests in flight at once. Defaults to `constants.POOL_MAXSIZE`.
+            **kwargs: Additional keyword arguments forwarded to `Pynab`.
+        """
+        kwargs.setdefault("pool_maxsize", max_concurrency)
+
+        self.pynab = Pynab(bearer=bearer, **kwargs)
+        self.api = AsyncApi(pynab=self.pynab, max_concurrency=max_concurrency)
+
+    async def gather(self, *aws, return_exceptions: bool = False):
+        """
+        Awaits several API calls concurrently.
+
+        Args:
+            *aws: The awaitables to run, typically `AsyncApi` calls.
+            return_exceptions (bool, optional): Whether exceptions are returned as results instead of raised. Defaults to False.
+
+        Returns:
+            list: The results in the order the awaitables were given.
+        """
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+
+    async def close(self):
+        """
+        Waits for in-flight requests and releases pooled connections.
+
+        Returns:
+            None
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.api.close)
+        self.pynab.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def user(self):
+        """
+        Retrieves the user information from the API.
+
+        Returns:
+            Awaitable[schemas.User]: The user information.
+        """
+        return self.api.get_user()
+
+    @property
+    def budgets(self):
+        """
+        Retrieves the budgets from the API.
+
+        Returns:
+            Awaitable[dict]: The budgets, keyed by budget ID.
+        """
+        return self.api.get_budgets()
@@ -0,0 +1,257 @@
+from concurrent.futures import ThreadPoolExecutor
+from pynab import constants
+import pynab.schemas as schemas
+import pynab.utils as utils
+
+import json
+import logging
+
+
+class ChunkFailure:
+    """
+    A chunk of a bulk write that was not created.
+
+    Attributes:
+        index (int): The position of the chunk in the bulk write.
+        transactions (list): The transaction bodies of the chunk.
+        status_code (int): The HTTP status of the response, or None if no response was received.
+        error (Union[schemas.Error, Exception]): The API error, or the exception raised while sending.
+    """
+
+    def __init__(
+        self,
+        index: int = 0,
+        transactions: list = None,
+        status_code: int = None,
+        error: object = None,
+    ):
+        """
+        Initializes a new instance of the ChunkFailure class.
+
+        Args:
+            index (int, optional): The position of the chunk in the bulk write. Defaults to 0.
+            transactions (list, optional): The transaction bodies of the chunk. Defaults to None.
+            status_code (int, optional): The HTTP status of the response. Defaults to None.
+            error (Union[schemas.Error, Exception], optional): The reason the chunk failed. Defaults to None.
+        """
+        self.index = index
+        self.transactions = transactions or []
+        self.status_code = status_code
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"ChunkFailure(index={self.index}, transactions={len(self.transactions)}, "
+            f"status_code={self.status_code}, error={self.error!r})"
+        )
+
+
+class BulkResult:
+    """
+    The outcome of a bulk write, aggregated across its chunks.
+
+    Attributes:
+        chunks (int): The number of chunks the transactions were split into.
+        transaction_ids (list): The IDs of the created transactions, in chunk order.
+        duplicate_import_ids (list): The import IDs that already existed and were skipped.
+        server_knowledge (int): The highest server knowledge returned by a chunk.
+        failures (list): A `ChunkFailure` for every chunk that was not created.
+    """
+
+    def __init__(self, chunks: int = 0):
+        """
+        Initializes a new instance of the BulkResult class.
+
+        Args:
+            chunks (int, optional): The number of chunks. Defaults to 0.
+        """
+        self.chunks = chunks
+        self.transaction_ids = []
+        self.duplicate_import_ids = []
+        self.server_knowledge = 0
+        self.failures = []
+
+    @property
+    def ok(self):
+        """
+        Returns whether every chunk was created.
+
+        Returns:
+            bool: True if no chunk failed.
+        """
+        return not self.failures
+
+    @property
+    def failed_transactions(self):
+        """
+        Returns the transaction bodies of the failed chunks, e.g. to submit them again.
+
+        Returns:
+            list: The transaction bodies, in chunk order.
+        """
+        return [
+            transaction
+            for failure in self.failures
+            for transaction in failure.transactions
+        ]
+
+    def __repr__(self):
+        return (
+            f"BulkResult(chunks={self.chunks}, created={len(self.transaction_ids)}, "
+            f"duplicates={len(self.duplicate_import_ids)}, failures={len(self.failures)})"
+        )
+
+
+class BulkWriter:
+    """
+    Creates large lists of transactions in size-bounded chunks sent in parallel.
+
+    The transactions are split into chunks of at most `chunk_size` transactions
+    and `max_bytes` of JSON, and each chunk is sent as one
+    `POST /budgets/{budget_id}/transactions`. Up to `max_workers` chunks are in
+    flight at once over the pooled session; every request still goes through
+    the Pynab instance's rate limiter, so a large import is paced to stay
+    within the rate limit instead of being rejected with 429s.
+
+    A failing chunk does not stop the others. Its transactions and the error
+    are reported in `BulkResult.failures`, so it can be corrected and sent
+    again; transactions with an `import_id` are reported as duplicates
+    instead of being created twice.
+
+    Attributes:
+        pynab (Pynab): The Pynab instance used to send the chunks.
+        budget_id (str): The ID of the budget to create the transactions in.
+        chunk_size (int): The maximum number of transactions per request.
+        max_bytes (int): The maximum size of a request body in bytes.
+        max_workers (int): The maximum number of requests in flight at once.
+    """
+
+    def __init__(
+        self,
+        pynab=None,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        chunk_size: int = constants.BULK_CHUNK_SIZE,
+        max_bytes: int = constants.BULK_MAX_BYTES,
+        max_workers: int = constants.BULK_MAX_WORKERS,
+    ):
+        """
+        Initializes a new instance of the BulkWriter class.
+
+        Args:
+            pynab (Pynab): The Pynab instance used to send the chunks.
+            budget (schemas.Budget, optional): The budget to create the transactions in. Defaults to None.
+            budget_id (str, optional): The ID of the budget, if `budget` is not given. Defaults to "last-used".
+            chunk_size (int, optional): The maximum number of transactions per request. Defaults to `constants.BULK_CHUNK_SIZE`.
+            max_bytes (int, optional): The maximum size of a request body in bytes. Defaults to `constants.BULK_MAX_BYTES`.
+            max_workers (int, optional): The maximum number of requests in flight at once. Defaults to `constants.BULK_MAX_WORKERS`.
+        """
+        self.pynab = pynab
+        self.budget_id = budget.id if budget else budget_id
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+
+    def chunks(self, transactions: list = None):
+        """
+        Splits transactions into request-sized chunks.
+
+        A transaction whose body alone exceeds `max_bytes` is sent in a chunk
+        of its own.
+
+        Args:
+            transactions (list): The transactions, as `schemas.Transaction` objects or dictionaries.
+
+        Returns:
+            list: The chunks, each a list of transaction bodies.
+        """
+        # '{"transactions":[' + ']}'
+        overhead = 19
+        chunks = []
+        chunk = []
+        size = overhead
+        for transaction in transactions or []:
+            body = self.pynab.api._save_transaction(transaction)
+            body_size = (
+                len(
+                    json.dumps(
+                        body, cls=utils.CustomJsonEncoder, separators=(",", ":")
+                    ).encode("utf-8")
+                )
+                + 1
+            )
+            if chunk and (
+                len(chunk) >= self.chunk_size or size + body_size > self.max_bytes
+            ):
+                chunks.append(chunk)
+                chunk = []
+                size = overhead
+            chunk.append(body)
+            size += body_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _submit(self, index: int = 0, chunk: list = None):
+        """
+        Sends one chunk.
+
+        Args:
+            index (int): The position of the chunk.
+            chunk (list): The transaction bodies of the chunk.
+
+        Returns:
+            Union[dict, ChunkFailure]: The `data` of the response, or the failure.
+        """
+        try:
+            response = self.pynab.api.endpoints.request_create_transactions(
+                budget_id=self.budget_id, request_body={"transactions": chunk}
+            )
+            _json = response.json()
+        except Exception as error:
+            logging.warning(f"Bulk chunk {index} failed: {error!r}")
+            return ChunkFailure(index=index, transactions=chunk, error=error)
+
+        if response.status_code == 201:
+            return _json.get("data", {})
+
+        error = schemas.Error(pynab=self.pynab, _json=_json.get("error", {}))
+        logging.warning(f"Bulk chunk {index} failed: {response.status_code}")
+        return ChunkFailure(
+            index=index,
+            transactions=chunk,
+            status_code=response.status_code,
+            error=error,
+        )
+
+    def create(self, transactions: list = None):
+        """
+        Creates the transactions, chunked and in parallel.
+
+        Args:
+            transactions (list): The transactions, as `schemas.Transaction` objects or dictionaries.
+
+        Returns:
+            BulkResult: The created transaction IDs, duplicate import IDs and failed chunks.
+        """
+        chunks = self.chunks(transactions)
+        result = BulkResult(chunks=len(chunks))
+        if not chunks:
+            return result
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(chunks)),
+            thread_name_prefix="pynab-bulk",
+        ) as executor:
+            outcomes = list(executor.map(self._submit, range(len(chunks)), chunks))
+
+        for outcome in outcomes:
+            if isinstance(outcome, ChunkFailure):
+                result.failures.append(outcome)
+                continue
+            result.transaction_ids.extend(outcome.get("transaction_ids", []))
+            result.duplicate_import_ids.extend(outcome.get("duplicate_import_ids", []))
+            result.server_knowledge = max(
+                result.server_knowledge, outcome.get("server_knowledge", 0)
+            )
+        return result
@@ -0,0 +1,243 @@
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from pynab import constants
+import logging
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    An in-memory cache of GET responses with per-endpoint TTLs and LRU eviction.
+
+    Successful (200) responses are kept for the TTL of the first pattern in
+    `ttls` that matches their endpoint path (query string excluded); endpoints
+    matching no pattern fall back to `default_ttl`, and a TTL of 0 means the
+    endpoint is never cached. When the cached bodies exceed `max_bytes`, the
+    least recently used responses are evicted first.
+
+    Any write (POST, PATCH, PUT or DELETE) to a budget invalidates every cached
+    response of that budget, and of "last-used"; a write to "last-used"
+    invalidates every budget. A cache must only be shared between Pynab
+    instances using the same access token.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached bodies in bytes.
+        ttls (dict): The TTL in seconds, keyed by endpoint glob pattern, e.g. "/budgets/*/categories*".
+        default_ttl (float): The TTL of endpoints matching no pattern.
+        hits (int): The number of requests answered from the cache.
+        misses (int): The number of cacheable requests sent to the API.
+        evictions (int): The number of responses evicted to stay within `max_bytes`.
+        invalidations (int): The number of responses dropped because their budget was written to.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = constants.CACHE_MAX_BYTES,
+        ttls: dict = None,
+        default_ttl: float = 0,
+    ):
+        """
+        Initializes a new instance of the ResponseCache class.
+
+        Args:
+            max_bytes (int, optional): The maximum total size of the cached bodies in bytes. Defaults to `constants.CACHE_MAX_BYTES`.
+            ttls (dict, optional): The TTL in seconds, keyed by endpoint glob pattern. Defaults to `constants.CACHE_TTLS`.
+            default_ttl (float, optional): The TTL of endpoints matching no pattern. Defaults to 0 (not cached).
+        """
+        self.max_bytes = max_bytes
+        self.ttls = dict(constants.CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # Keyed by endpoint, as (response, size, expires) in LRU order
+        self._entries = OrderedDict()
+        self._size = 0
+        # Bumped by every write
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _budget_id(endpoint: str = ""):
+        """
+        Extracts the budget ID from an endpoint.
+
+        Args:
+            endpoint (str): The endpoint, e.g. "/budgets/{budget_id}/categories".
+
+        Returns:
+            str: The budget ID, or None if the endpoint is not scoped to a budget.
+        """
+        parts = endpoint.split("?", 1)[0].split("/")
+        if len(parts) > 2 and parts[1] == "budgets":
+            return parts[2]
+        return None
+
+    def ttl(self, endpoint: str = ""):
+        """
+        Returns how long the responses of an endpoint are cached.
+
+        Args:
+            endpoint (str): The endpoint, e.g. "/budgets/{budget_id}/categories".
+
+        Returns:
+            float: The TTL in seconds; 0 if the endpoint is not cached.
+        """
+        path = endpoint.split("?", 1)[0]
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(path, pattern):
+                return ttl
+        return self.default_ttl
+
+    @property
+    def generation(self):
+        """
+        Returns the number of writes seen so far.
+
+        Pass it back to `put`, so a response fetched while a write was being
+        sent is not cached.
+
+        Returns:
+            int: The write generation.
+        """
+        return self._generation
+
+    def get(self, endpoint: str = ""):
+        """
+        Returns the cached response of an endpoint.
+
+        Args:
+            endpoint (str): The endpoint, including its query string.
+
+        Returns:
+            requests.Response: The cached response, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is not None:
+                if entry[2] > time.monotonic():
+                    self._entries.move_to_end(endpoint)
+                    self.hits += 1
+                    return entry[0]
+                self._drop(endpoint)
+            if self.ttl(endpoint) > 0:
+                self.misses += 1
+            return None
+
+    def put(self, endpoint: str = "", response=None, generation: int = None):
+        """
+        Caches a response, if its endpoint is cacheable and it succeeded.
+
+        Args:
+            endpoint (str): The endpoint, including its query string.
+            response (requests.Response): The response, with its body already read.
+            generation (int, optional): The value of `generation` taken before the request was sent. Defaults to None.
+
+        Returns:
+            bool: Whether the response was cached.
+        """
+        ttl = self.ttl(endpoint)
+        if ttl <= 0 or response.status_code != 200:
+            return False
+        size = len(response.content)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if endpoint in self._entries:
+                self._drop(endpoint)
+            self._entries[endpoint] = (response, size, time.monotonic() + ttl)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def invalidate(self, endpoint: str = None):
+        """
+        Drops the cached responses affected by a write to an endpoint.
+
+        Args:
+            endpoint (str, optional): The endpoint written to. Defaults to None (drop everything).
+
+        Returns:
+            int: The number of responses dropped.
+        """
+        budget_id = None if endpoint is None else self._budget_id(endpoint)
+        with self._lock:
+            self._generation += 1
+            if endpoint is None:
+                stale = list(self._entries)
+            elif budget_id == "last-used":
+                stale = [k for k in self._entries if self._budget_id(k) is not None]
+            else:
+                stale = [
+                    k
+                    for k in self._entries
+                    if self._budget_id(k) in (budget_id, "last-used")
+                ]
+            for k in stale:
+                self._drop(k)
+            self.invalidations += len(stale)
+        if stale:
+            logging.debug(f"Invalidated {len(stale)} cached responses of {budget_id}")
+        return len(stale)
+
+    def clear(self):
+        """
+        Drops every cached response. The counters are kept.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, endpoint: str = ""):
+        """
+        Removes an entry. The caller must hold the lock.
+
+        Args:
+            endpoint (str): The endpoint of the entry.
+
+        Returns:
+            None
+        """
+        _, size, _ = self._entries.pop(endpoint)
+        self._size -= size
+
+    @property
+    def size(self):
+        """
+        Returns the total size of the cached bodies.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits, misses, evictions, invalidations, entries and size in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
@@ -6,8 +6,56 @@ This module contains constants used in the pynab package.
 Attributes:
     EPOCH (str): The string representation of the UTC datetime for the epoch (January 1, 1970).
     YNAB_API (str): The URL for the YNAB API.
+    POOL_CONNECTIONS (int): The default number of per-host connection pools to cache.
+    POOL_MAXSIZE (int): The default number of connections kept alive per host.
+    RATE_LIMIT (int): The number of requests YNAB allows per access token per window.
+    RATE_LIMIT_PERIOD (int): The length of YNAB's rate limit window in seconds.
+    RETRY_STATUSES (tuple): The HTTP statuses treated as transient and retried.
+    IDEMPOTENT_METHODS (tuple): The HTTP methods that are retried without an explicit opt-in.
+    STREAM_CHUNK_SIZE (int): The number of bytes read at a time from streamed responses.
+    CACHE_MAX_BYTES (int): The default maximum size of the bodies held by a `ResponseCache`.
+    CACHE_TTLS (dict): The default TTLs of a `ResponseCache` in seconds, keyed by endpoint glob pattern; the first match wins.
+    BULK_CHUNK_SIZE (int): The default maximum number of transactions sent per request by a `BulkWriter`.
+    BULK_MAX_BYTES (int): The default maximum size of the body of a `BulkWriter` request.
+    BULK_MAX_WORKERS (int): The default number of `BulkWriter` requests in flight at once.
+    INGEST_BATCH_SIZE (int): The default number of rows an `Ingestor` reads before sending them.
+    WRITE_BATCH_SIZE (int): The default number of queued mutations that makes a `WriteQueue` flush, and its maximum batch size.
+    WRITE_DELAY (float): The default number of seconds a `WriteQueue` holds a mutation before flushing it.
+    LATENCY_BUCKETS (tuple): The default upper bounds, in seconds, of the `Instrumentation` histogram buckets.
 """
 
 EPOCH = str(datetime(1970, 1, 1, tzinfo=timezone.utc))
 
 YNAB_API = "https://api.ynab.com/v1"
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+RATE_LIMIT = 200
+RATE_LIMIT_PERIOD = 3600
+
+RETRY_STATUSES = (429, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+CACHE_TTLS = {
+    "*/transactions*": 0,
+    "/user": 3600,
+    "/budgets/*/settings": 3600,
+    "/budgets/*/categories*": 300,
+    "/budgets/*/payees*": 300,
+    "/budgets/*/payee_locations*": 300,
+}
+
+BULK_CHUNK_SIZE = 500
+BULK_MAX_BYTES = 512 * 1024
+BULK_MAX_WORKERS = 4
+
+INGEST_BATCH_SIZE = 5000
+
+WRITE_BATCH_SIZE = 100
+WRITE_DELAY = 1.0
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
@@ -1,5 +1,6 @@
 import pynab.utils as utils
 from pynab import pynab
+from urllib.parse import urlencode
 
 
 class Endpoints:
@@ -17,6 +18,22 @@ class Endpoints:
         self.pynab = pynab
         self.http_utils = utils.http_utils(pynab=self.pynab)
 
+    @staticmethod
+    def _query(**params):
+        """
+        Builds a query string from the parameters that are set.
+
+        Parameters:
+        - **params: The query parameters; None, 0 and empty values are skipped.
+
+        Returns:
+        - str: The query string including the leading "?", or "" if no parameter is set.
+        """
+        params = {k: v for k, v in params.items() if v}
+        if not params:
+            return ""
+        return f"?{urlencode(params)}"
+
     # GET /user
     def request_get_user(self):
         """
@@ -49,7 +66,9 @@ class Endpoints:
 
     # GET /budgets/{budget_id}
     def request_get_budget(
-        self, budget_id: str = "last-used", last_knowledge_of_server: int = 0
+        self,
+        budget_id: str = "last-used",
+        last_knowledge_of_server: int = 0,
     ):
         """
         Retrieves the budget information from the server.
@@ -405,6 +424,7 @@ class Endpoints:
         since_date: str = None,
         type: str = None,
         last_knowledge_of_server: int = 0,
+        stream: bool = False,
     ):
         """
         Sends a GET request to retrieve transactions from the specified budget.
@@ -414,18 +434,18 @@ class Endpoints:
             since_date (str, optional): The date to retrieve transactions since. Defaults to None.
             type (str, optional): The type of transactions to retrieve. Defaults to None.
             last_knowledge_of_server (int, optional): The knowledge of the server to retrieve transactions from. Defaults to 0.
+            stream (bool, optional): Whether the body is left unread, to be parsed incrementally. Defaults to False.
 
         Returns:
             dict: The response from the server containing the retrieved transactions.
         """
         endpoint = f"/budgets/{budget_id}/transactions"
-        if since_date:
-            endpoint += f"?since_date={since_date}"
-        if type:
-            endpoint += f"?type={type}"
-        if last_knowledge_of_server:
-            endpoint += f"?last_knowledge_of_server={last_knowledge_of_server}"
-        return self.http_utils.get(endpoint=endpoint)
+        endpoint += self._query(
+            since_date=since_date,
+            type=type,
+            last_knowledge_of_server=last_knowledge_of_server,
+        )
+        return self.http_utils.get(endpoint=endpoint, stream=stream)
 
     # POST /budgets/{budget_id}/transactions
     def request_create_transactions(
@@ -541,6 +561,7 @@ class Endpoints:
         since_date: str = None,
         type: str = None,
         last_knowledge_of_server: int = 0,
+        stream: bool = False,
     ):
         """
         Retrieves the account transactions for a specific budget and account.
@@ -551,19 +572,19 @@ class Endpoints:
             since_date (str, optional): The date to retrieve transactions from. Defaults to None.
             type (str, optional): The type of transactions to retrieve. Defaults to None.
             last_knowledge_of_server (int, optional): The knowledge of the server. Defaults to 0.
+            stream (bool, optional): Whether the body is left unread, to be parsed incrementally. Defaults to False.
 
         Returns:
             The account transactions.
 
         """
         endpoint = f"/budgets/{budget_id}/accounts/{account_id}/transactions"
-        if since_date:
-            endpoint += f"?since_date={since_date}"
-        if type:
-            endpoint += f"?type={type}"
-        if last_knowledge_of_server:
-            endpoint += f"?last_knowledge_of_server={last_knowledge_of_server}"
-        return self.http_utils.get(endpoint=endpoint)
+        endpoint += self._query(
+            since_date=since_date,
+            type=type,
+            last_knowledge_of_server=last_knowledge_of_server,
+        )
+        return self.http_utils.get(endpoint=endpoint, stream=stream)
 
     # GET /budgets/{budget_id}/categories/{category_id}/transactions
     def request_get_category_transactions(
@@ -573,6 +594,7 @@ class Endpoints:
         since_date: str = None,
         type: str = None,
         last_knowledge_of_server: int = 0,
+        stream: bool = False,
     ):
         """
         Retrieves transactions for a specific category.
@@ -583,18 +605,18 @@ class Endpoints:
             since_date (str, optional): The starting date to retrieve transactions from. Defaults to None.
             type (str, optional): The type of transactions to retrieve. Defaults to None.
             last_knowledge_of_server (int, optional): The knowledge of the server to retrieve transactions from. Defaults to 0.
+            stream (bool, optional): Whether the body is left unread, to be parsed incrementally. Defaults to False.
 
         Returns:
             dict: The response containing the retrieved transactions.
         """
         endpoint = f"/budgets/{budget_id}/categories/{category_id}/transactions"
-        if since_date:
-            endpoint += f"?since_date={since_date}"
-        if type:
-            endpoint += f"?type={type}"
-        if last_knowledge_of_server:
-            endpoint += f"?last_knowledge_of_server={last_knowledge_of_server}"
-        return self.http_utils.get(endpoint=endpoint)
+        endpoint += self._query(
+            since_date=since_date,
+            type=type,
+            last_knowledge_of_server=last_knowledge_of_server,
+        )
+        return self.http_utils.get(endpoint=endpoint, stream=stream)
 
     # GET /budgets/{budget_id}/payees/{payee_id}/transactions
     def request_get_payee_transactions(
@@ -604,6 +626,7 @@ class Endpoints:
         since_date: str = None,
         type: str = None,
         last_knowledge_of_server: int = 0,
+        stream: bool = False,
     ):
         """
         Retrieves transactions for a specific payee.
@@ -614,18 +637,18 @@ class Endpoints:
             since_date (str, optional): The date to retrieve transactions since. Defaults to None.
             type (str, optional): The type of transactions to retrieve. Defaults to None.
             last_knowledge_of_server (int, optional): The knowledge of the server. Defaults to 0.
+            stream (bool, optional): Whether the body is left unread, to be parsed incrementally. Defaults to False.
 
         Returns:
             The response from the API containing the payee transactions.
         """
         endpoint = f"/budgets/{budget_id}/payees/{payee_id}/transactions"
-        if since_date:
-            endpoint += f"?since_date={since_date}"
-        if type:
-            endpoint += f"?type={type}"
-        if last_knowledge_of_server:
-            endpoint += f"?last_knowledge_of_server={last_knowledge_of_server}"
-        return self.http_utils.get(endpoint=endpoint)
+        endpoint += self._query(
+            since_date=since_date,
+            type=type,
+            last_knowledge_of_server=last_knowledge_of_server,
+        )
+        return self.http_utils.get(endpoint=endpoint, stream=stream)
 
     # GET /budgets/{budget_id}/months/{month}/transactions
     def request_get_month_transactions(
@@ -635,6 +658,7 @@ class Endpoints:
         since_date: str = None,
         type: str = None,
         last_knowledge_of_server: int = 0,
+        stream: bool = False,
     ):
         """
         Retrieves the transactions for a specific month in a budget.
@@ -645,22 +669,25 @@ class Endpoints:
             since_date (str, optional): The starting date for the transactions. Defaults to None.
             type (str, optional): The type of transactions to retrieve. Defaults to None.
             last_knowledge_of_server (int, optional): The knowledge of the server. Defaults to 0.
+            stream (bool, optional): Whether the body is left unread, to be parsed incrementally. Defaults to False.
 
         Returns:
             The response from the API containing the transactions for the specified month.
         """
         endpoint = f"/budgets/{budget_id}/months/{month}/transactions"
-        if since_date:
-            endpoint += f"?since_date={since_date}"
-        if type:
-            endpoint += f"?type={type}"
-        if last_knowledge_of_server:
-            endpoint += f"?last_knowledge_of_server={last_knowledge_of_server}"
-        return self.http_utils.get(endpoint=endpoint)
+        endpoint += self._query(
+            since_date=since_date,
+            type=type,
+            last_knowledge_of_server=last_knowledge_of_server,
+        )
+        return self.http_utils.get(endpoint=endpoint, stream=stream)
 
     # GET /budgets/{budget_id}/scheduled_transactions
     def request_get_scheduled_transactions(
-        self, budget_id: str = "last-used", last_knowledge_of_server: int = 0
+        self,
+        budget_id: str = "last-used",
+        last_knowledge_of_server: int = 0,
+        stream: bool = False,
     ):
         """
         Retrieves the scheduled transactions for a specific budget.
@@ -668,6 +695,7 @@ class Endpoints:
         Args:
             budget_id (str, optional): The ID of the budget. Defaults to "last-used".
             last_knowledge_of_server (int, optional): The knowledge of the server. Defaults to 0.
+            stream (bool, optional): Whether the body is left unread, to be parsed incrementally. Defaults to False.
 
         Returns:
             The response from the server containing the scheduled transactions.
@@ -675,7 +703,7 @@ class Endpoints:
         endpoint = f"/budgets/{budget_id}/scheduled_transactions"
         if last_knowledge_of_server:
             endpoint += f"?last_knowledge_of_server={last_knowledge_of_server}"
-        return self.http_utils.get(endpoint=endpoint)
+        return self.http_utils.get(endpoint=endpoint, stream=stream)
 
     # POST /budgets/{budget_id}/scheduled_transactions
     def request_create_scheduled_transaction(
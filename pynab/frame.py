@@ -0,0 +1,310 @@
+import pynab.constants as constants
+import pynab.schemas as schemas
+import pynab.enums as enums
+import pynab.utils as utils
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class TransactionFrame:
+    """
+    A columnar, NumPy-backed view of a list of transactions.
+
+    The frame is built straight from the transaction JSON returned by the API,
+    without creating a `schemas.Transaction` per row. Amounts are int64
+    milliunits, dates are datetime64[D], account, payee and category IDs are
+    stored as int32 codes into a list of labels, and cleared statuses and flag
+    colors as int8 codes into their enum members. A code of -1 means the value
+    was empty.
+
+    Requires NumPy (`pip install pynab[frame]`).
+
+    Attributes:
+        pynab (Pynab): The Pynab instance that fetched the transactions.
+        budget (schemas.Budget): The budget the transactions belong to.
+        id (numpy.ndarray): The IDs of the transactions.
+        amount (numpy.ndarray): The amounts in milliunits (int64).
+        date (numpy.ndarray): The dates (datetime64[D]).
+        account_id (numpy.ndarray): The account codes (int32).
+        payee_id (numpy.ndarray): The payee codes (int32).
+        category_id (numpy.ndarray): The category codes (int32).
+        cleared (numpy.ndarray): The cleared status codes (int8).
+        flag_color (numpy.ndarray): The flag color codes (int8).
+        approved (numpy.ndarray): Whether each transaction is approved (bool).
+        deleted (numpy.ndarray): Whether each transaction is deleted (bool).
+        labels (dict): The labels of each coded column, indexed by code.
+    """
+
+    # Coded columns holding IDs
+    _id_columns = ("account_id", "payee_id", "category_id")
+
+    # Coded columns holding enum members
+    _enum_columns = {
+        "cleared": enums.TransactionClearedStatus,
+        "flag_color": enums.TransactionFlagColor,
+    }
+
+    def __init__(
+        self,
+        pynab=None,
+        budget: schemas.Budget = None,
+        columns: dict = None,
+        labels: dict = None,
+        rows: list = None,
+    ):
+        """
+        Initializes a new instance of the TransactionFrame class.
+
+        Use `TransactionFrame.from_json` to build a frame from API JSON.
+
+        Args:
+            pynab (Pynab, optional): The Pynab instance that fetched the transactions. Defaults to None.
+            budget (schemas.Budget, optional): The budget the transactions belong to. Defaults to None.
+            columns (dict, optional): The column arrays, keyed by column name. Defaults to None.
+            labels (dict, optional): The labels of each coded column. Defaults to None.
+            rows (list, optional): The transaction JSON of each row. Defaults to None.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError(
+                "TransactionFrame requires numpy; install it with `pip install pynab[frame]`"
+            )
+
+        self.pynab = pynab
+        self.budget = budget
+
+        self.id = columns["id"]
+        self.amount = columns["amount"]
+        self.date = columns["date"]
+        self.account_id = columns["account_id"]
+        self.payee_id = columns["payee_id"]
+        self.category_id = columns["category_id"]
+        self.cleared = columns["cleared"]
+        self.flag_color = columns["flag_color"]
+        self.approved = columns["approved"]
+        self.deleted = columns["deleted"]
+        self.labels = labels
+
+        self._rows = rows
+
+    @classmethod
+    def from_json(
+        cls, pynab=None, budget: schemas.Budget = None, transactions: list = None
+    ):
+        """
+        Builds a frame from the transaction JSON returned by the API.
+
+        Args:
+            pynab (Pynab, optional): The Pynab instance that fetched the transactions. Defaults to None.
+            budget (schemas.Budget, optional): The budget the transactions belong to. Defaults to None.
+            transactions (list, optional): The `data.transactions` array of the response. Defaults to None.
+
+        Returns:
+            TransactionFrame: The frame.
+        """
+        if np is None:
+            raise ImportError(
+                "TransactionFrame requires numpy; install it with `pip install pynab[frame]`"
+            )
+
+        rows = list(transactions or [])
+        labels = {}
+        columns = {
+            "id": np.array([row.get("id", "") for row in rows], dtype=object),
+            "amount": np.fromiter(
+                (row.get("amount", 0) for row in rows), dtype=np.int64, count=len(rows)
+            ),
+            "date": np.array(
+                [row.get("date") or constants.EPOCH[:10] for row in rows],
+                dtype="datetime64[D]",
+            ),
+            "approved": np.fromiter(
+                (bool(row.get("approved", False)) for row in rows),
+                dtype=bool,
+                count=len(rows),
+            ),
+            "deleted": np.fromiter(
+                (bool(row.get("deleted", False)) for row in rows),
+                dtype=bool,
+                count=len(rows),
+            ),
+        }
+
+        for column in cls._id_columns:
+            values = [row.get(column) for row in rows]
+            labels[column] = list(dict.fromkeys(value for value in values if value))
+            codes = {value: code for code, value in enumerate(labels[column])}
+            codes.update({None: -1, "": -1})
+            columns[column] = np.fromiter(
+                map(codes.__getitem__, values), dtype=np.int32, count=len(rows)
+            )
+
+        for column, enum in cls._enum_columns.items():
+            values = [row.get(column) for row in rows]
+            labels[column] = list(enum)
+            codes = {member.value: code for code, member in enumerate(labels[column])}
+            for value in set(values) - codes.keys():
+                enum(value)  # raises ValueError, like the schemas do
+            columns[column] = np.fromiter(
+                map(codes.__getitem__, values), dtype=np.int8, count=len(rows)
+            )
+
+        return cls(
+            pynab=pynab, budget=budget, columns=columns, labels=labels, rows=rows
+        )
+
+    def __len__(self):
+        return len(self.id)
+
+    def __getitem__(self, selection):
+        """
+        Selects rows by boolean mask, index array or slice.
+
+        Args:
+            selection (Union[numpy.ndarray, slice]): The rows to select.
+
+        Returns:
+            TransactionFrame: A new frame holding the selected rows.
+        """
+        index = np.arange(len(self))[selection]
+        columns = {
+            column: getattr(self, column)[index]
+            for column in (
+                "id",
+                "amount",
+                "date",
+                "account_id",
+                "payee_id",
+                "category_id",
+                "cleared",
+                "flag_color",
+                "approved",
+                "deleted",
+            )
+        }
+        return TransactionFrame(
+            pynab=self.pynab,
+            budget=self.budget,
+            columns=columns,
+            labels=self.labels,
+            rows=[self._rows[i] for i in index],
+        )
+
+    def code(self, column: str = "", value: object = None):
+        """
+        Returns the code of a value in a coded column.
+
+        Args:
+            column (str): The name of the coded column, e.g. "account_id" or "cleared".
+            value (object): The ID or enum member (or its value) to look up.
+
+        Returns:
+            int: The code, -1 for an empty value, or None if the value does not occur.
+        """
+        if column in self._enum_columns:
+            value = self._enum_columns[column](getattr(value, "value", value))
+        elif not value:
+            return -1
+        try:
+            return self.labels[column].index(value)
+        except ValueError:
+            return None
+
+    def where(
+        self,
+        account_id: str = None,
+        payee_id: str = None,
+        category_id: str = None,
+        cleared: enums.TransactionClearedStatus = None,
+        flag_color: enums.TransactionFlagColor = None,
+        since_date: str = None,
+        until_date: str = None,
+        min_amount: int = None,
+        max_amount: int = None,
+    ):
+        """
+        Builds a boolean mask of the rows matching every given condition.
+
+        Args:
+            account_id (str, optional): Only rows of this account. Defaults to None.
+            payee_id (str, optional): Only rows of this payee. Defaults to None.
+            category_id (str, optional): Only rows of this category. Defaults to None.
+            cleared (enums.TransactionClearedStatus, optional): Only rows with this cleared status. Defaults to None.
+            flag_color (enums.TransactionFlagColor, optional): Only rows with this flag color. Defaults to None.
+            since_date (str, optional): Only rows on or after this date ("YYYY-MM-DD"). Defaults to None.
+            until_date (str, optional): Only rows on or before this date ("YYYY-MM-DD"). Defaults to None.
+            min_amount (int, optional): Only rows with at least this amount in milliunits. Defaults to None.
+            max_amount (int, optional): Only rows with at most this amount in milliunits. Defaults to None.
+
+        Returns:
+            numpy.ndarray: The boolean mask, usable as `frame[mask]`.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, value in (
+            ("account_id", account_id),
+            ("payee_id", payee_id),
+            ("category_id", category_id),
+            ("cleared", cleared),
+            ("flag_color", flag_color),
+        ):
+            if value is not None:
+                code = self.code(column=column, value=value)
+                if code is None:
+                    mask[:] = False
+                else:
+                    mask &= getattr(self, column) == code
+        if since_date is not None:
+            mask &= self.date >= np.datetime64(str(since_date), "D")
+        if until_date is not None:
+            mask &= self.date <= np.datetime64(str(until_date), "D")
+        if min_amount is not None:
+            mask &= self.amount >= min_amount
+        if max_amount is not None:
+            mask &= self.amount <= max_amount
+        return mask
+
+    def sum_by(self, column: str = "category_id"):
+        """
+        Sums the amounts grouped by account, payee, category or month.
+
+        Args:
+            column (str, optional): "account_id", "payee_id", "category_id" or "month". Defaults to "category_id".
+
+        Returns:
+            dict: The total amount in milliunits, keyed by ID (None for rows without one) or by the first day of the month.
+        """
+        if column == "month":
+            months, codes = np.unique(
+                self.date.astype("datetime64[M]"), return_inverse=True
+            )
+            keys = months.astype("datetime64[D]").astype(object).tolist()
+        else:
+            codes = getattr(self, column) + 1
+            keys = [None] + self.labels[column]
+
+        totals = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(totals, codes, self.amount)
+        present = np.bincount(codes, minlength=len(keys)) > 0
+        return {
+            key: int(total) for key, total, found in zip(keys, totals, present) if found
+        }
+
+    def to_transactions(self):
+        """
+        Converts the rows of the frame back into transaction objects.
+
+        Returns:
+            dict: The transactions, keyed by transaction ID.
+        """
+        transactions = utils._dict()
+        for row in self._rows:
+            transaction = schemas.Transaction(
+                pynab=self.pynab, budget=self.budget, _json=row
+            )
+            transactions[transaction.id] = transaction
+        return transactions
@@ -0,0 +1,364 @@
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from pynab import constants
+from pynab.bulk import BulkResult, BulkWriter
+import pynab.schemas as schemas
+import pynab.utils as utils
+
+import csv
+import sqlite3
+import threading
+
+
+def import_id(amount: int = 0, date: date = None, occurrence: int = 1):
+    """
+    Builds an import ID in the format YNAB uses for file imports.
+
+    Args:
+        amount (int): The amount in milliunits.
+        date (date): The date of the transaction.
+        occurrence (int, optional): The number of earlier transactions of the account with the same amount and date, plus one. Defaults to 1.
+
+    Returns:
+        str: The import ID, e.g. "YNAB:-294230:2015-12-30:1".
+    """
+    return f"YNAB:{int(amount)}:{date.isoformat()}:{occurrence}"
+
+
+class ImportIdGenerator:
+    """
+    Generates deterministic YNAB import IDs for bank rows.
+
+    The occurrence counts rows of the same account with the same amount and
+    date, in the order they are seen, so importing the same rows again in the
+    same order yields the same import IDs.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new instance of the ImportIdGenerator class.
+        """
+        # Keyed by (account_id, amount, date)
+        self._occurrences = {}
+
+    def __call__(self, account_id: str = None, amount: int = 0, date: date = None):
+        """
+        Returns the import ID of the next row.
+
+        Args:
+            account_id (str): The ID of the account of the row.
+            amount (int): The amount in milliunits.
+            date (date): The date of the row.
+
+        Returns:
+            str: The import ID.
+        """
+        key = (account_id, int(amount), date)
+        occurrence = self._occurrences.get(key, 0) + 1
+        self._occurrences[key] = occurrence
+        return import_id(amount=amount, date=date, occurrence=occurrence)
+
+
+class ImportIndex:
+    """
+    A local SQLite index of the import IDs already submitted to YNAB.
+
+    Import IDs are unique per account, so the index is keyed by budget,
+    account and import ID.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initializes a new instance of the ImportIndex class.
+
+        Args:
+            path (str, optional): The path of the SQLite database, created if missing. Defaults to ":memory:".
+        """
+        self.path = path
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS import_ids ("
+                "budget_id TEXT NOT NULL, account_id TEXT NOT NULL, "
+                "import_id TEXT NOT NULL, "
+                "PRIMARY KEY (budget_id, account_id, import_id))"
+            )
+
+    def close(self):
+        """
+        Closes the database connection.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def known(self, budget_id: str = "last-used", keys: list = None):
+        """
+        Returns which of the given import IDs were already submitted.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            keys (list): The `(account_id, import_id)` pairs to look up.
+
+        Returns:
+            set: The pairs found in the index.
+        """
+        known = set()
+        keys = list(keys or [])
+        with self._lock:
+            # Stay under SQLite's limit on bound parameters
+            for start in range(0, len(keys), 400):
+                batch = keys[start : start + 400]
+                placeholders = ", ".join("(?, ?)" for _ in batch)
+                rows = self._connection.execute(
+                    f"SELECT account_id, import_id FROM import_ids "
+                    f"WHERE budget_id = ? AND (account_id, import_id) "
+                    f"IN (VALUES {placeholders})",
+                    [budget_id] + [value for key in batch for value in key],
+                )
+                known.update(rows)
+        return known
+
+    def add(self, budget_id: str = "last-used", keys: list = None):
+        """
+        Records import IDs as submitted.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            keys (list): The `(account_id, import_id)` pairs to record.
+
+        Returns:
+            None
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO import_ids VALUES (?, ?, ?)",
+                ((budget_id, account_id, import_id) for account_id, import_id in keys),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM import_ids"
+            ).fetchone()[0]
+
+
+class IngestResult(BulkResult):
+    """
+    The outcome of an ingestion, aggregated across its batches.
+
+    Attributes:
+        rows (int): The number of rows read.
+        skipped (int): The number of rows not sent because their import ID was already in the index, or repeated.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new instance of the IngestResult class.
+        """
+        super().__init__()
+        self.rows = 0
+        self.skipped = 0
+
+    def add(self, result: BulkResult = None):
+        """
+        Adds the outcome of one bulk write.
+
+        Args:
+            result (BulkResult): The outcome of the bulk write.
+
+        Returns:
+            None
+        """
+        for failure in result.failures:
+            failure.index += self.chunks
+        self.chunks += result.chunks
+        self.transaction_ids.extend(result.transaction_ids)
+        self.duplicate_import_ids.extend(result.duplicate_import_ids)
+        self.server_knowledge = max(self.server_knowledge, result.server_knowledge)
+        self.failures.extend(result.failures)
+
+    def __repr__(self):
+        return (
+            f"IngestResult(rows={self.rows}, skipped={self.skipped}, "
+            f"created={len(self.transaction_ids)}, "
+            f"duplicates={len(self.duplicate_import_ids)}, failures={len(self.failures)})"
+        )
+
+
+class Ingestor:
+    """
+    An idempotent pipeline creating bank rows as YNAB transactions.
+
+    Rows are read in batches of `batch_size`. Every row without an
+    `import_id` gets one from the `ImportIdGenerator`; rows whose import ID is
+    already in the `ImportIndex` are skipped without being sent, and the rest
+    go through a `BulkWriter`. The import IDs the API created or reported as
+    duplicates are added to the index, so running the same import again sends
+    nothing. Rows of failed chunks are not indexed and are sent again next
+    time.
+
+    Attributes:
+        pynab (Pynab): The Pynab instance used to send the transactions.
+        budget_id (str): The ID of the budget to create the transactions in.
+        index (ImportIndex): The index of submitted import IDs.
+        generator (ImportIdGenerator): The generator of import IDs of the current `ingest` call.
+        writer (BulkWriter): The bulk writer sending the transactions.
+        batch_size (int): The number of rows read before they are sent.
+    """
+
+    def __init__(
+        self,
+        pynab=None,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        index: ImportIndex = None,
+        batch_size: int = constants.INGEST_BATCH_SIZE,
+        **writer_options,
+    ):
+        """
+        Initializes a new instance of the Ingestor class.
+
+        Args:
+            pynab (Pynab): The Pynab instance used to send the transactions.
+            budget (schemas.Budget, optional): The budget to create the transactions in. Defaults to None.
+            budget_id (str, optional): The ID of the budget, if `budget` is not given. Defaults to "last-used".
+            index (ImportIndex, optional): The index of submitted import IDs. Defaults to None (an in-memory index).
+            batch_size (int, optional): The number of rows read before they are sent. Defaults to `constants.INGEST_BATCH_SIZE`.
+            **writer_options: `chunk_size`, `max_bytes` and `max_workers`, forwarded to the `BulkWriter`.
+        """
+        self.pynab = pynab
+        self.budget_id = budget.id if budget else budget_id
+        self.index = index if index is not None else ImportIndex()
+        self.generator = ImportIdGenerator()
+        self.writer = BulkWriter(
+            pynab=pynab, budget_id=self.budget_id, **writer_options
+        )
+        self.batch_size = batch_size
+
+    def prepare(self, row: dict = None):
+        """
+        Builds the body of a row, generating its import ID if it has none.
+
+        Args:
+            row (dict): The row, with at least `account_id`, `date` and `amount` (in milliunits).
+
+        Returns:
+            dict: The transaction body.
+        """
+        body = self.pynab.api._save_transaction(row)
+        if not body["import_id"]:
+            body["import_id"] = self.generator(
+                account_id=body["account_id"],
+                amount=body["amount"],
+                date=utils.parse_date(body["date"]),
+            )
+        return body
+
+    def ingest(self, rows=None):
+        """
+        Creates the rows that were not submitted before.
+
+        Args:
+            rows (Iterable[dict]): The rows, e.g. from `read_csv`. Consumed one batch at a time.
+
+        Returns:
+            IngestResult: The counts of rows read and skipped, and the aggregated bulk results.
+        """
+        # Occurrences are counted per import, so the same rows get the same IDs
+        self.generator = ImportIdGenerator()
+        result = IngestResult()
+        rows = iter(rows or [])
+        while True:
+            batch = [self.prepare(row) for row in islice(rows, self.batch_size)]
+            if not batch:
+                return result
+            result.rows += len(batch)
+
+            keys = [(body["account_id"], body["import_id"]) for body in batch]
+            known = self.index.known(budget_id=self.budget_id, keys=keys)
+            pending = {}
+            for key, body in zip(keys, batch):
+                if key not in known and key not in pending:
+                    pending[key] = body
+            result.skipped += len(batch) - len(pending)
+            if not pending:
+                continue
+
+            written = self.writer.create(list(pending.values()))
+            failed = {
+                (body["account_id"], body["import_id"])
+                for body in written.failed_transactions
+            }
+            self.index.add(
+                budget_id=self.budget_id,
+                keys=[key for key in pending if key not in failed],
+            )
+            result.add(written)
+
+
+def milliunits(amount: str = "0"):
+    """
+    Converts a currency amount to milliunits.
+
+    Args:
+        amount (str): The amount, e.g. "-12.34" or "1,234.50".
+
+    Returns:
+        int: The amount in milliunits, e.g. -12340.
+    """
+    return int(Decimal(str(amount).replace(",", "").strip() or "0") * 1000)
+
+
+def read_csv(
+    file=None,
+    account_id: str = None,
+    date: str = "Date",
+    amount: str = "Amount",
+    payee_name: str = "Payee",
+    memo: str = "Memo",
+    date_format: str = None,
+):
+    """
+    Reads the rows of a bank CSV export, one at a time.
+
+    Args:
+        file (Iterable[str]): The open CSV file, with a header row.
+        account_id (str): The ID of the account the rows belong to.
+        date (str, optional): The column of the date. Defaults to "Date".
+        amount (str, optional): The column of the amount, in currency units. Defaults to "Amount".
+        payee_name (str, optional): The column of the payee name. Defaults to "Payee".
+        memo (str, optional): The column of the memo. Defaults to "Memo".
+        date_format (str, optional): The `strptime` format of the dates. Defaults to None (ISO 8601).
+
+    Yields:
+        dict: The row, ready for `Ingestor.ingest`.
+    """
+    for record in csv.DictReader(file):
+        value = record[date].strip()
+        if date_format is None:
+            row_date = utils.parse_date(value)
+        else:
+            row_date = datetime.strptime(value, date_format).date()
+        yield {
+            "account_id": account_id,
+            "date": row_date,
+            "amount": milliunits(record[amount]),
+            "payee_name": record.get(payee_name) or None,
+            "memo": record.get(memo) or None,
+            "cleared": "cleared",
+        }
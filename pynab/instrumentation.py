@@ -0,0 +1,461 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from pynab import constants
+import functools
+import logging
+import threading
+import time
+
+# The name of the ID following each collection in an endpoint path
+_TEMPLATE_IDS = {
+    "budgets": "{budget_id}",
+    "accounts": "{account_id}",
+    "categories": "{category_id}",
+    "payees": "{payee_id}",
+    "payee_locations": "{payee_location_id}",
+    "months": "{month}",
+    "transactions": "{transaction_id}",
+    "scheduled_transactions": "{scheduled_transaction_id}",
+}
+
+# Path segments that follow a collection without being an ID
+_TEMPLATE_LITERALS = {"import"}
+
+
+def endpoint_template(endpoint: str = None):
+    """
+    Returns the template of an endpoint, with IDs and the query string left out.
+
+    Args:
+        endpoint (str): The endpoint, e.g. "/budgets/last-used/accounts/1234/transactions?since_date=2024-01-01".
+
+    Returns:
+        str: The template, e.g. "/budgets/{budget_id}/accounts/{account_id}/transactions".
+    """
+    segments = endpoint.split("?", 1)[0].split("/")
+    for i in range(1, len(segments)):
+        name = _TEMPLATE_IDS.get(segments[i - 1])
+        if name is not None and segments[i] not in _TEMPLATE_LITERALS:
+            segments[i] = name
+    return "/".join(segments)
+
+
+class RequestEvent:
+    """
+    What is known about a request, passed to the request hooks.
+
+    The `before_request` hooks see the method and endpoint only; the
+    `after_request` hooks see the outcome as well. The DNS and connect times
+    are not exposed by the pooled `requests` session, which resolves and
+    connects inside urllib3, so they are only set by transports that measure
+    them and are None otherwise.
+
+    Attributes:
+        method (str): The HTTP method.
+        endpoint (str): The endpoint, including IDs and the query string.
+        template (str): The endpoint template, see `endpoint_template`.
+        status_code (int): The status of the final attempt, None if it raised.
+        bytes (int): The size of the response body, None for streamed responses whose size is not announced.
+        retries (int): The number of attempts after the first.
+        dns (float): The DNS resolution time in seconds, if measured.
+        connect (float): The connection setup time in seconds, if measured.
+        ttfb (float): The time from sending the final attempt to receiving its response headers, in seconds.
+        total (float): The time from the first attempt to the final response, including retry delays, in seconds.
+        error (Exception): The error raised by the request, e.g. by its final attempt failing to connect, if any.
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "template",
+        "status_code",
+        "bytes",
+        "retries",
+        "dns",
+        "connect",
+        "ttfb",
+        "total",
+        "error",
+    )
+
+    def __init__(self, method: str = "GET", endpoint: str = None):
+        """
+        Initializes a new instance of the RequestEvent class.
+
+        Args:
+            method (str, optional): The HTTP method. Defaults to "GET".
+            endpoint (str): The endpoint.
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.template = endpoint_template(endpoint)
+        self.status_code = None
+        self.bytes = None
+        self.retries = 0
+        self.dns = None
+        self.connect = None
+        self.ttfb = None
+        self.total = None
+        self.error = None
+
+    def __repr__(self):
+        return (
+            f"RequestEvent({self.method} {self.template}, "
+            f"status_code={self.status_code}, bytes={self.bytes}, "
+            f"retries={self.retries}, total={self.total})"
+        )
+
+
+class Histogram:
+    """
+    Counts observed values in fixed, cumulative buckets.
+
+    Attributes:
+        buckets (tuple): The upper bounds of the buckets, ascending.
+        counts (list): The number of values per bucket, the last one counting values above every bound.
+        count (int): The number of values observed.
+        sum (float): The sum of the values observed.
+        max (float): The largest value observed.
+    """
+
+    def __init__(self, buckets: tuple = constants.LATENCY_BUCKETS):
+        """
+        Initializes a new instance of the Histogram class.
+
+        Args:
+            buckets (tuple, optional): The upper bounds of the buckets. Defaults to `constants.LATENCY_BUCKETS`.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float = 0.0):
+        """
+        Records a value.
+
+        Args:
+            value (float): The value.
+
+        Returns:
+            None
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float = 0.5):
+        """
+        Estimates a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float, optional): The quantile, between 0 and 1. Defaults to 0.5.
+
+        Returns:
+            float: The estimate, capped at the largest value observed; 0.0 if nothing was observed.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        """
+        Returns the state of the histogram.
+
+        Returns:
+            dict: The count, sum, mean, median, 95th percentile and maximum, and the cumulative count per bucket bound.
+        """
+        cumulative = []
+        seen = 0
+        for count in self.counts:
+            seen += count
+            cumulative.append(seen)
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": dict(zip(self.buckets + (float("inf"),), cumulative)),
+        }
+
+
+class EndpointStats:
+    """
+    The counters and histograms of one endpoint template and method.
+
+    Attributes:
+        requests (int): The number of requests sent.
+        errors (int): The number of requests that failed to connect or returned a status of 400 or above.
+        retries (int): The number of retried attempts.
+        bytes (int): The total size of the response bodies.
+        statuses (dict): The number of responses per status code.
+        latency (Histogram): The total request durations, including retries, in seconds.
+        ttfb (Histogram): The times to the response headers, in seconds.
+        decode (Histogram): The JSON decode durations, in seconds.
+    """
+
+    def __init__(self, buckets: tuple = constants.LATENCY_BUCKETS):
+        """
+        Initializes a new instance of the EndpointStats class.
+
+        Args:
+            buckets (tuple, optional): The upper bounds of the histogram buckets. Defaults to `constants.LATENCY_BUCKETS`.
+        """
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.statuses = {}
+        self.latency = Histogram(buckets=buckets)
+        self.ttfb = Histogram(buckets=buckets)
+        self.decode = Histogram(buckets=buckets)
+
+    def snapshot(self):
+        """
+        Returns the state of the counters and histograms.
+
+        Returns:
+            dict: The counters, and a snapshot of each histogram.
+        """
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.snapshot(),
+            "ttfb": self.ttfb.snapshot(),
+            "decode": self.decode.snapshot(),
+        }
+
+
+class _Call:
+    """
+    The time an `Api` method in progress spent waiting on requests and decoding JSON.
+    """
+
+    __slots__ = ("io", "decode")
+
+    def __init__(self):
+        self.io = 0.0
+        self.decode = 0.0
+
+
+class Instrumentation:
+    """
+    Collects per-request events, latency histograms and counters.
+
+    Requests are counted per method and endpoint template. Besides the
+    request latency, the time spent decoding response JSON is recorded per
+    endpoint, and the time each `Api` method spends building schema objects
+    (its duration minus the time spent in requests and JSON decoding) is
+    recorded per method. Streamed responses are decoded while their objects
+    are built, so the streaming `iter_*` methods are not timed.
+
+    Hooks are callables taking a `RequestEvent`; exceptions they raise are
+    logged and otherwise ignored.
+
+    Attributes:
+        before_request (list): Hooks called before a request is sent.
+        after_request (list): Hooks called once a request has a final response or error.
+        buckets (tuple): The upper bounds of the histogram buckets, in seconds.
+        endpoints (dict): The `EndpointStats`, keyed by `(method, template)`.
+        builds (dict): The schema construction durations as `Histogram`s, keyed by `Api` method name.
+    """
+
+    def __init__(self, buckets: tuple = constants.LATENCY_BUCKETS):
+        """
+        Initializes a new instance of the Instrumentation class.
+
+        Args:
+            buckets (tuple, optional): The upper bounds of the histogram buckets, in seconds. Defaults to `constants.LATENCY_BUCKETS`.
+        """
+        self.before_request = []
+        self.after_request = []
+        self.buckets = tuple(buckets)
+        self.endpoints = {}
+        self.builds = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stats(self, method: str = "GET", template: str = None):
+        stats = self.endpoints.get((method, template))
+        if stats is None:
+            stats = self.endpoints[(method, template)] = EndpointStats(
+                buckets=self.buckets
+            )
+        return stats
+
+    def _calls(self):
+        calls = getattr(self._local, "calls", None)
+        if calls is None:
+            calls = self._local.calls = []
+        return calls
+
+    @staticmethod
+    def _run(hooks: list = None, event: RequestEvent = None):
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logging.exception(f"Request hook {hook!r} failed")
+
+    def started(self, event: RequestEvent = None):
+        """
+        Runs the `before_request` hooks of a request.
+
+        Args:
+            event (RequestEvent): The request.
+
+        Returns:
+            None
+        """
+        self._run(self.before_request, event)
+
+    def finished(self, event: RequestEvent = None):
+        """
+        Records the outcome of a request and runs the `after_request` hooks.
+
+        Args:
+            event (RequestEvent): The completed request.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            stats = self._stats(event.method, event.template)
+            stats.requests += 1
+            stats.retries += event.retries
+            stats.statuses[event.status_code] = (
+                stats.statuses.get(event.status_code, 0) + 1
+            )
+            if event.error is not None or (event.status_code or 0) >= 400:
+                stats.errors += 1
+            if event.bytes:
+                stats.bytes += event.bytes
+            stats.latency.observe(event.total)
+            if event.ttfb is not None:
+                stats.ttfb.observe(event.ttfb)
+        self._run(self.after_request, event)
+
+    def decoded(self, method: str = "GET", template: str = None, elapsed: float = 0.0):
+        """
+        Records the time spent decoding the JSON of a response.
+
+        Args:
+            method (str, optional): The HTTP method of the request. Defaults to "GET".
+            template (str): The endpoint template of the request.
+            elapsed (float): The decode time in seconds.
+
+        Returns:
+            None
+        """
+        for call in self._calls():
+            call.decode += elapsed
+        with self._lock:
+            self._stats(method, template).decode.observe(elapsed)
+
+    @contextmanager
+    def waiting(self):
+        """
+        Attributes the time spent in the block to requests, for the `Api` methods in progress.
+
+        Yields:
+            None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            for call in self._calls():
+                call.io += elapsed
+
+    @contextmanager
+    def api_call(self, name: str = None):
+        """
+        Times the schema construction of an `Api` method.
+
+        Args:
+            name (str): The name of the method.
+
+        Yields:
+            None
+        """
+        calls = self._calls()
+        call = _Call()
+        calls.append(call)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            calls.pop()
+            build = max(0.0, elapsed - call.io - call.decode)
+            with self._lock:
+                histogram = self.builds.get(name)
+                if histogram is None:
+                    histogram = self.builds[name] = Histogram(buckets=self.buckets)
+                histogram.observe(build)
+
+    def snapshot(self):
+        """
+        Returns the state of every counter and histogram.
+
+        Returns:
+            dict: The endpoint stats under "endpoints", keyed by "METHOD template", and the schema construction histograms under "builds", keyed by `Api` method name.
+        """
+        with self._lock:
+            return {
+                "endpoints": {
+                    f"{method} {template}": stats.snapshot()
+                    for (method, template), stats in self.endpoints.items()
+                },
+                "builds": {
+                    name: histogram.snapshot()
+                    for name, histogram in self.builds.items()
+                },
+            }
+
+    def reset(self):
+        """
+        Clears every counter and histogram; the hooks are kept.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.endpoints = {}
+            self.builds = {}
+
+
+def timed(method=None):
+    """
+    Wraps an `Api` method so its schema construction is timed by `Pynab.instrumentation`.
+
+    Args:
+        method (callable): The `Api` method.
+
+    Returns:
+        callable: The wrapped method, calling `method` directly when instrumentation is disabled.
+    """
+
+    @functools.wraps(method)
+    def wrapper(api, *args, **kwargs):
+        instrumentation = getattr(api.pynab, "instrumentation", None)
+        if instrumentation is None:
+            return method(api, *args, **kwargs)
+        with instrumentation.api_call(method.__name__):
+            return method(api, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,429 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pynab.instrumentation import Instrumentation
+import math
+import threading
+import time
+
+# The content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricFamily:
+    """
+    A metric and its samples, as exposed to Prometheus.
+
+    Attributes:
+        name (str): The name of the metric, e.g. "pynab_requests_total".
+        type (str): "counter", "gauge" or "histogram".
+        help (str): The description of the metric.
+        samples (list): The `(name, labels, value)` of every sample; histogram samples carry the `_bucket`, `_sum` and `_count` suffixes.
+    """
+
+    def __init__(self, name: str = None, type: str = "gauge", help: str = ""):
+        """
+        Initializes a new instance of the MetricFamily class.
+
+        Args:
+            name (str): The name of the metric.
+            type (str, optional): "counter", "gauge" or "histogram". Defaults to "gauge".
+            help (str, optional): The description of the metric. Defaults to "".
+        """
+        self.name = name
+        self.type = type
+        self.help = help
+        self.samples = []
+
+    def add(self, labels: dict = None, value: float = 0, suffix: str = ""):
+        """
+        Adds a sample.
+
+        Args:
+            labels (dict, optional): The labels of the sample. Defaults to None.
+            value (float, optional): The value of the sample. Defaults to 0.
+            suffix (str, optional): The suffix of the sample name, e.g. "_bucket". Defaults to "".
+
+        Returns:
+            None
+        """
+        self.samples.append((self.name + suffix, labels or {}, value))
+
+    def add_histogram(self, labels: dict = None, snapshot: dict = None):
+        """
+        Adds the samples of a histogram.
+
+        Args:
+            labels (dict, optional): The labels of the histogram. Defaults to None.
+            snapshot (dict): The `Histogram.snapshot()` of the histogram.
+
+        Returns:
+            None
+        """
+        labels = labels or {}
+        for bound, count in snapshot["buckets"].items():
+            self.add(dict(labels, le=_format_value(bound)), count, "_bucket")
+        self.add(labels, snapshot["sum"], "_sum")
+        self.add(labels, snapshot["count"], "_count")
+
+
+def _format_value(value: float = 0):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+        return repr(value)
+    return str(value)
+
+
+def _escape(value: str = ""):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def exposition(families: list = None):
+    """
+    Formats metric families in the Prometheus text exposition format.
+
+    Args:
+        families (list): The `MetricFamily` objects.
+
+    Returns:
+        str: The exposition, ending with a newline.
+    """
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape(family.help)}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for name, labels, value in family.samples:
+            if labels:
+                pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                name = f"{name}{{{pairs}}}"
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class Metrics:
+    """
+    A registry of client-side metrics for one or more Pynab instances.
+
+    Metrics are collected when they are scraped, from the instrumentation,
+    cache and rate limit state of every registered instance, each labelled
+    with the `client` name it was registered under:
+
+    - `pynab_requests_total`, `pynab_request_errors_total`, `pynab_request_retries_total` and `pynab_response_bytes_total` per method, endpoint template and status,
+    - `pynab_request_duration_seconds` and `pynab_json_decode_seconds` histograms per method and endpoint template,
+    - `pynab_schema_build_seconds` histograms per `Api` method,
+    - `pynab_api_errors_total` per `schemas.Error` ID,
+    - `pynab_rate_limit_remaining`, the requests left in the rate limit window, as tracked by the instance's rate limiter, or by the last rate limit header without one,
+    - `pynab_cache_*` counters and the hit ratio, if the instance has a cache,
+    - `pynab_sync_lag_seconds` per budget, the time since its last delta sync or mirror sync.
+
+    Use `exposition` to scrape the metrics from your own handler, or `serve`
+    to expose them over HTTP.
+
+    Attributes:
+        clients (dict): The registered Pynab instances, keyed by client name.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new instance of the Metrics class.
+        """
+        self.clients = {}
+        self._lock = threading.Lock()
+        # Keyed by (client, error_id)
+        self._errors = {}
+
+    def register(self, pynab=None, client: str = "default"):
+        """
+        Starts collecting the metrics of a Pynab instance.
+
+        An `Instrumentation` is attached to the instance if it has none.
+
+        Args:
+            pynab (Pynab): The instance.
+            client (str, optional): The value of the `client` label of its metrics. Defaults to "default".
+
+        Returns:
+            Pynab: The instance.
+
+        Raises:
+            ValueError: If another instance is registered under the same name.
+        """
+        with self._lock:
+            if self.clients.get(client, pynab) is not pynab:
+                raise ValueError(f"A client named {client!r} is already registered")
+            self.clients[client] = pynab
+        if pynab.instrumentation is None:
+            pynab.instrumentation = Instrumentation()
+        pynab.metrics = self
+        return pynab
+
+    def unregister(self, client: str = "default"):
+        """
+        Stops collecting the metrics of a Pynab instance.
+
+        Args:
+            client (str, optional): The name the instance was registered under. Defaults to "default".
+
+        Returns:
+            None
+        """
+        with self._lock:
+            pynab = self.clients.pop(client, None)
+            for key in [key for key in self._errors if key[0] == client]:
+                del self._errors[key]
+        if pynab is not None and pynab.metrics is self:
+            pynab.metrics = None
+
+    def count_error(self, pynab=None, error_id: str = ""):
+        """
+        Counts an API error returned to a registered instance.
+
+        Args:
+            pynab (Pynab): The instance that received the error.
+            error_id (str): The `schemas.Error` ID, e.g. "404.2".
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for client, registered in self.clients.items():
+                if registered is pynab:
+                    key = (client, error_id)
+                    self._errors[key] = self._errors.get(key, 0) + 1
+
+    def collect(self):
+        """
+        Collects the current value of every metric.
+
+        Returns:
+            list: The `MetricFamily` objects.
+        """
+        families = {
+            name: MetricFamily(name=name, type=type, help=help)
+            for name, type, help in (
+                ("pynab_requests_total", "counter", "Requests sent, by final status."),
+                (
+                    "pynab_request_errors_total",
+                    "counter",
+                    "Requests that failed to connect or returned a status of 400 or above.",
+                ),
+                ("pynab_request_retries_total", "counter", "Retried request attempts."),
+                ("pynab_response_bytes_total", "counter", "Bytes of response bodies."),
+                (
+                    "pynab_request_duration_seconds",
+                    "histogram",
+                    "Request duration, including retries.",
+                ),
+                (
+                    "pynab_json_decode_seconds",
+                    "histogram",
+                    "Response JSON decode time.",
+                ),
+                (
+                    "pynab_schema_build_seconds",
+                    "histogram",
+                    "Time Api methods spend building schema objects.",
+                ),
+                ("pynab_api_errors_total", "counter", "API errors, by error ID."),
+                (
+                    "pynab_rate_limit_remaining",
+                    "gauge",
+                    "Requests left in the rate limit window.",
+                ),
+                (
+                    "pynab_cache_hits_total",
+                    "counter",
+                    "Requests answered from the cache.",
+                ),
+                ("pynab_cache_misses_total", "counter", "Cacheable requests sent."),
+                ("pynab_cache_evictions_total", "counter", "Responses evicted."),
+                (
+                    "pynab_cache_invalidations_total",
+                    "counter",
+                    "Responses dropped by writes.",
+                ),
+                ("pynab_cache_hit_ratio", "gauge", "Cache hits per cacheable request."),
+                ("pynab_cache_entries", "gauge", "Responses held by the cache."),
+                ("pynab_cache_bytes", "gauge", "Size of the cached bodies."),
+                (
+                    "pynab_sync_lag_seconds",
+                    "gauge",
+                    "Seconds since the last sync of a budget.",
+                ),
+            )
+        }
+        now = time.time()
+        with self._lock:
+            clients = dict(self.clients)
+            errors = dict(self._errors)
+
+        for client, pynab in clients.items():
+            if pynab.instrumentation is not None:
+                snapshot = pynab.instrumentation.snapshot()
+                for key, stats in snapshot["endpoints"].items():
+                    method, template = key.split(" ", 1)
+                    labels = {"client": client, "method": method, "endpoint": template}
+                    for status, count in stats["statuses"].items():
+                        families["pynab_requests_total"].add(
+                            dict(labels, status=str(status or "error")), count
+                        )
+                    families["pynab_request_errors_total"].add(labels, stats["errors"])
+                    families["pynab_request_retries_total"].add(
+                        labels, stats["retries"]
+                    )
+                    families["pynab_response_bytes_total"].add(labels, stats["bytes"])
+                    families["pynab_request_duration_seconds"].add_histogram(
+                        labels, stats["latency"]
+                    )
+                    families["pynab_json_decode_seconds"].add_histogram(
+                        labels, stats["decode"]
+                    )
+                for name, build in snapshot["builds"].items():
+                    families["pynab_schema_build_seconds"].add_histogram(
+                        {"client": client, "api_method": name}, build
+                    )
+
+            if pynab.rate_limiter is not None:
+                remaining = max(0, int(pynab.rate_limiter.tokens))
+            else:
+                remaining = pynab._requests_remaining
+            if remaining is not None:
+                families["pynab_rate_limit_remaining"].add(
+                    {"client": client}, remaining
+                )
+
+            if pynab.cache is not None:
+                cache = pynab.cache.stats()
+                labels = {"client": client}
+                families["pynab_cache_hits_total"].add(labels, cache["hits"])
+                families["pynab_cache_misses_total"].add(labels, cache["misses"])
+                families["pynab_cache_evictions_total"].add(labels, cache["evictions"])
+                families["pynab_cache_invalidations_total"].add(
+                    labels, cache["invalidations"]
+                )
+                lookups = cache["hits"] + cache["misses"]
+                families["pynab_cache_hit_ratio"].add(
+                    labels, cache["hits"] / lookups if lookups else 0.0
+                )
+                families["pynab_cache_entries"].add(labels, cache["entries"])
+                families["pynab_cache_bytes"].add(labels, cache["bytes"])
+
+            for budget_id, synced_on in dict(pynab._synced_on).items():
+                families["pynab_sync_lag_seconds"].add(
+                    {"client": client, "budget_id": budget_id}, now - synced_on
+                )
+
+        for (client, error_id), count in errors.items():
+            families["pynab_api_errors_total"].add(
+                {"client": client, "error_id": error_id}, count
+            )
+        return list(families.values())
+
+    def exposition(self):
+        """
+        Returns the current metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, served with the `CONTENT_TYPE` content type.
+        """
+        return exposition(self.collect())
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Serves the metrics over HTTP at `/metrics` from a background thread.
+
+        Args:
+            host (str, optional): The interface to bind to. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind to, 0 picks a free port. Defaults to 9464.
+
+        Returns:
+            MetricsServer: The running server.
+        """
+        return MetricsServer(metrics=self, host=host, port=port).start()
+
+
+class MetricsServer:
+    """
+    A minimal HTTP server answering `GET /metrics` with a `Metrics` exposition.
+
+    Attributes:
+        metrics (Metrics): The registry being served.
+    """
+
+    def __init__(
+        self, metrics: Metrics = None, host: str = "127.0.0.1", port: int = 9464
+    ):
+        """
+        Initializes a new instance of the MetricsServer class.
+
+        Args:
+            metrics (Metrics): The registry to serve.
+            host (str, optional): The interface to bind to. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind to, 0 picks a free port. Defaults to 9464.
+        """
+        self.metrics = metrics
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Returns the URL of the metrics.
+
+        Returns:
+            str: The URL, e.g. "http://127.0.0.1:9464/metrics".
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        """
+        Starts serving on a background thread.
+
+        Returns:
+            MetricsServer: The running server.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """
+        Stops the server, if it was started, and releases the listening socket.
+
+        Returns:
+            None
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                payload = server.metrics.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
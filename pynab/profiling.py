@@ -0,0 +1,338 @@
+from pynab import schemas
+import pynab.utils as utils
+
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+# Frames from files in this directory belong to pynab, not to the access site
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+class PropertyStats:
+    """
+    What the accesses of one property from one access site cost.
+
+    Times are inclusive: an access that reads other properties, e.g.
+    `Transaction.payee` reading `Budget.payees`, includes their time, and
+    those are recorded under the same access site as well.
+
+    Attributes:
+        site (str): The access site, as "file:line in function" of the first frame outside pynab.
+        name (str): The property, e.g. "Transaction.payee".
+        count (int): The number of accesses.
+        total (float): The total time spent in the accesses, in seconds.
+        fetches (int): The number of accesses that sent at least one request.
+        requests (int): The number of requests sent during the accesses.
+        scans (int): The number of accesses that scanned a whole collection to build a `_dict.by` index.
+        scanned (int): The number of items scanned.
+    """
+
+    __slots__ = (
+        "site",
+        "name",
+        "count",
+        "total",
+        "fetches",
+        "requests",
+        "scans",
+        "scanned",
+    )
+
+    def __init__(self, site: str = None, name: str = None):
+        """
+        Initializes a new instance of the PropertyStats class.
+
+        Args:
+            site (str): The access site.
+            name (str): The property.
+        """
+        self.site = site
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.fetches = 0
+        self.requests = 0
+        self.scans = 0
+        self.scanned = 0
+
+    def to_dict(self):
+        """
+        Converts the stats to a dictionary.
+
+        Returns:
+            dict: The stats, keyed by attribute name.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f"PropertyStats({self.name} at {self.site}, count={self.count}, "
+            f"total={self.total:.6f}, fetches={self.fetches}, scans={self.scans})"
+        )
+
+
+class _Counters(threading.local):
+    def __init__(self):
+        self.requests = 0
+        self.scans = 0
+        self.scanned = 0
+
+
+class PropertyProfiler:
+    """
+    Attributes the time spent in schema properties to the code that reads them.
+
+    While the profiler runs, every property of the classes in `pynab.schemas`
+    is timed, and the requests sent and the `_dict.by` indexes built (each a
+    full scan of a collection) during each access are counted. Accesses are
+    grouped by property and by access site, the first caller outside pynab,
+    so a property read in a loop shows up as one row with a high count; a
+    count close to its fetches or scans is an N+1 pattern.
+
+    The profiler patches the schema classes, so it affects every Pynab
+    instance in the process, and only one can run at a time. It adds
+    overhead to every property access and is meant for development only.
+
+    Usage:
+        with PropertyProfiler() as profiler:
+            for transaction in budget.transactions.values():
+                transaction.payee
+        print(profiler.report())
+
+    Attributes:
+        stats (dict): The `PropertyStats`, keyed by `(site, name)`.
+    """
+
+    _active = None
+    _active_lock = threading.Lock()
+
+    def __init__(self):
+        """
+        Initializes a new instance of the PropertyProfiler class.
+        """
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._counters = _Counters()
+        self._originals = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Starts profiling.
+
+        Returns:
+            PropertyProfiler: The profiler itself.
+
+        Raises:
+            RuntimeError: If a profiler is already running.
+        """
+        with PropertyProfiler._active_lock:
+            if PropertyProfiler._active is not None:
+                raise RuntimeError("A PropertyProfiler is already running")
+            PropertyProfiler._active = self
+
+        for cls in self._schema_classes():
+            for attribute, value in list(vars(cls).items()):
+                if isinstance(value, property) and value.fget is not None:
+                    self._patch(
+                        cls,
+                        attribute,
+                        property(
+                            self._timed(f"{cls.__name__}.{attribute}", value.fget),
+                            value.fset,
+                            value.fdel,
+                            value.__doc__,
+                        ),
+                    )
+        self._patch(utils.http_utils, "request", self._counted_request())
+        self._patch(utils._dict, "_index", self._counted_index())
+        return self
+
+    def stop(self):
+        """
+        Stops profiling and restores the patched classes.
+
+        Returns:
+            None
+        """
+        while self._originals:
+            cls, attribute, value = self._originals.pop()
+            setattr(cls, attribute, value)
+        with PropertyProfiler._active_lock:
+            if PropertyProfiler._active is self:
+                PropertyProfiler._active = None
+
+    @staticmethod
+    def _schema_classes():
+        return [
+            cls
+            for _, cls in inspect.getmembers(schemas, inspect.isclass)
+            if cls.__module__ == schemas.__name__
+        ]
+
+    def _patch(self, cls: type = None, attribute: str = None, value=None):
+        self._originals.append((cls, attribute, vars(cls)[attribute]))
+        setattr(cls, attribute, value)
+
+    def _counted_request(self):
+        """
+        Wraps `http_utils.request` to count the requests sent by each thread.
+
+        Returns:
+            callable: The wrapped method.
+        """
+        request = utils.http_utils.request
+        counters = self._counters
+
+        def counted(http_utils, *args, **kwargs):
+            counters.requests += 1
+            return request(http_utils, *args, **kwargs)
+
+        return counted
+
+    def _counted_index(self):
+        """
+        Wraps `_dict._index` to count the indexes built, each a full scan, by each thread.
+
+        Returns:
+            callable: The wrapped method.
+        """
+        index = utils._dict._index
+        counters = self._counters
+
+        def counted(collection, field=""):
+            if collection._fresh_index(field) is None:
+                counters.scans += 1
+                counters.scanned += len(collection)
+            return index(collection, field)
+
+        return counted
+
+    @staticmethod
+    def _site():
+        """
+        Returns the access site: the first frame outside pynab.
+
+        Returns:
+            str: The site, as "file:line in function".
+        """
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+            frame = frame.f_back
+        if frame is None:
+            return "<pynab>"
+        code = frame.f_code
+        return f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+
+    def _timed(self, name: str = None, getter=None):
+        """
+        Wraps a property getter so its accesses are recorded.
+
+        Args:
+            name (str): The property, e.g. "Transaction.payee".
+            getter (callable): The original getter.
+
+        Returns:
+            callable: The wrapped getter.
+        """
+        counters = self._counters
+
+        def timed(obj):
+            site = self._site()
+            requests, scans, scanned = (
+                counters.requests,
+                counters.scans,
+                counters.scanned,
+            )
+            start = time.perf_counter()
+            try:
+                return getter(obj)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._record(
+                    site,
+                    name,
+                    elapsed,
+                    counters.requests - requests,
+                    counters.scans - scans,
+                    counters.scanned - scanned,
+                )
+
+        return timed
+
+    def _record(
+        self,
+        site: str = None,
+        name: str = None,
+        elapsed: float = 0.0,
+        requests: int = 0,
+        scans: int = 0,
+        scanned: int = 0,
+    ):
+        with self._lock:
+            stats = self.stats.get((site, name))
+            if stats is None:
+                stats = self.stats[(site, name)] = PropertyStats(site=site, name=name)
+            stats.count += 1
+            stats.total += elapsed
+            stats.fetches += 1 if requests else 0
+            stats.requests += requests
+            stats.scans += 1 if scans else 0
+            stats.scanned += scanned
+
+    def sorted_stats(self):
+        """
+        Returns the stats, most expensive first.
+
+        Returns:
+            list: The `PropertyStats`, sorted by total time.
+        """
+        with self._lock:
+            return sorted(self.stats.values(), key=lambda s: s.total, reverse=True)
+
+    def report(self, limit: int = 20):
+        """
+        Formats the most expensive property accesses as a table.
+
+        Args:
+            limit (int, optional): The number of rows. Defaults to 20.
+
+        Returns:
+            str: The report.
+        """
+        lines = [
+            f"{'total ms':>10} {'count':>8} {'us/call':>9} {'fetches':>8} "
+            f"{'requests':>8} {'scans':>6} {'scanned':>9}  property / site"
+        ]
+        for stats in self.sorted_stats()[:limit]:
+            lines.append(
+                f"{stats.total * 1000:>10.2f} {stats.count:>8} "
+                f"{stats.total / stats.count * 1e6:>9.1f} {stats.fetches:>8} "
+                f"{stats.requests:>8} {stats.scans:>6} {stats.scanned:>9}  "
+                f"{stats.name} at {stats.site}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str = None):
+        """
+        Writes every stat to a JSON file, most expensive first.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            None
+        """
+        with open(path, "w") as file:
+            json.dump(
+                [stats.to_dict() for stats in self.sorted_stats()], file, indent=2
+            )
@@ -1,57 +1,201 @@
 from pynab.api import Api
+from pynab.cache import ResponseCache
+from pynab.instrumentation import Instrumentation
+from pynab.rate_limit import RateLimiter
+from pynab.retry import RetryPolicy
+from pynab.transport import SessionTransport, Transport
+from pynab.write_queue import WriteQueue
 from pynab import constants
+import pynab.utils as utils
+
+import threading
 
 
 class Pynab:
-    def __init__(self, bearer: str = None):
+    def __init__(
+        self,
+        bearer: str = None,
+        api_url: str = constants.YNAB_API,
+        pool_connections: int = constants.POOL_CONNECTIONS,
+        pool_maxsize: int = constants.POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: float = None,
+        rate_limit: bool = True,
+        rate_limiter: RateLimiter = None,
+        retry: bool = True,
+        retry_policy: RetryPolicy = None,
+        track_server_knowledge: bool = False,
+        keep_json: bool = True,
+        lazy: bool = False,
+        coalesce_requests: bool = True,
+        cache: ResponseCache = None,
+        transport: Transport = None,
+        instrumentation: Instrumentation = None,
+    ):
         """
         Initializes a new instance of the `pynab` class.
 
         Args:
             bearer (str, optional): The bearer token for authentication. Defaults to None.
+            api_url (str, optional): The base URL of the YNAB API. Defaults to `constants.YNAB_API`.
+            pool_connections (int, optional): The number of per-host connection pools to cache. Defaults to `constants.POOL_CONNECTIONS`.
+            pool_maxsize (int, optional): The maximum number of connections kept alive per host. Defaults to `constants.POOL_MAXSIZE`.
+            pool_block (bool, optional): Whether to block when no pooled connection is free instead of opening a throwaway one. Defaults to False.
+            keep_alive (bool, optional): Whether connections are kept alive and reused between requests. Defaults to True.
+            timeout (float or tuple, optional): The request timeout in seconds, or a `(connect, read)` tuple. Defaults to None (no timeout).
+            rate_limit (bool, optional): Whether outgoing requests are paced to stay within the API rate limit. Defaults to True.
+            rate_limiter (RateLimiter, optional): A custom rate limiter, e.g. one shared between instances using the same token. Defaults to None.
+            retry (bool, optional): Whether transient failures (429, 502, 503, 504 and connection errors) are retried. Defaults to True.
+            retry_policy (RetryPolicy, optional): A custom retry policy. Defaults to None.
+            track_server_knowledge (bool, optional): Whether repeated requests only fetch deltas that are merged into the previously returned collections. Defaults to False.
+            keep_json (bool, optional): Whether accounts, payees, categories, transactions and subtransactions keep the raw JSON they were parsed from. Set to False to roughly halve their memory footprint. Defaults to True.
+            lazy (bool, optional): Whether transaction dates, statuses, flags and subtransactions, and category goal types and months, are decoded on first access instead of when the object is created. Lazily decoded objects always keep their raw JSON. Defaults to False.
+            coalesce_requests (bool, optional): Whether concurrent identical GET requests share a single request in flight and its parsed JSON. Defaults to True.
+            cache (ResponseCache, optional): A cache serving repeated GET requests of rarely changing endpoints without contacting the API. Defaults to None (no caching).
+            transport (Transport, optional): Sends the HTTP requests, e.g. a `pynab.transport.ReplayTransport` answering from a recorded cassette. The pool options are ignored when given. Defaults to None (a `SessionTransport` over a pooled session).
+            instrumentation (Instrumentation, optional): Collects request hooks, per-endpoint latency histograms and counters, and JSON decode and schema construction timings. Defaults to None (no instrumentation).
         """
-        self.api_url = constants.YNAB_API
+        self.api_url = api_url
 
         self._bearer = bearer
         self._fetch = True
-        self._track_server_knowledge = False
+        self._track_server_knowledge = track_server_knowledge
+        self._keep_json = keep_json
+        self._lazy = lazy
+
+        self.cache = cache
+        self.instrumentation = instrumentation
+        # Set by `Metrics.register`
+        self.metrics = None
+        self.coalesce_requests = coalesce_requests
+        # In-flight GETs, keyed by URL, as futures of their responses
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
 
-        self._requests_remaining = 0
+        # Guards the rate limit count, server knowledge, tracked collections
+        # and sync times, which the worker threads of AsyncPynab share
+        self._state_lock = threading.RLock()
+        # The requests left according to the last rate limit header, None
+        # until one is seen
+        self._requests_remaining = None
+        self.rate_limiter = rate_limiter
+        if self.rate_limiter is None and rate_limit:
+            self.rate_limiter = RateLimiter()
+        self.retry_policy = retry_policy
+        if self.retry_policy is None and retry:
+            self.retry_policy = RetryPolicy()
         self._headers = {
             "Authorization": f"Bearer {self._bearer}",
             "accept": "application/json",
         }
+        if not keep_alive:
+            self._headers["Connection"] = "close"
 
-        self._server_knowledges = {
-            "get_budget": 0,
-            "get_accounts": 0,
-            "get_categories": 0,
-            "get_months": 0,
-            "get_transactions": 0,
-            "get_account_transactions": 0,
-            "get_category_transactions": 0,
-            "get_payee_transactions": 0,
-            "get_month_transactions": 0,
-            "get_scheduled_transactions": 0,
-        }
+        self._timeout = timeout
+        self.transport = transport
+        if self.transport is None:
+            self.transport = SessionTransport(
+                session=utils.http_utils.create_session(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=pool_block,
+                )
+            )
+
+        # Keyed by (budget_id, endpoint, resource_id), e.g.
+        # ("last-used", "get_account_transactions", account_id)
+        self._server_knowledges = {}
+        self._server_collections = {}
+        # Wall-clock time of the last delta or mirror sync, keyed by budget ID
+        self._synced_on = {}
 
         self.api = Api(pynab=self)
+        self.write_queue = None
+
+    def write_behind(
+        self,
+        max_batch: int = constants.WRITE_BATCH_SIZE,
+        max_delay: float = constants.WRITE_DELAY,
+    ):
+        """
+        Starts a write-behind queue that batches transaction mutations.
+
+        Mutations queued on the returned `WriteQueue` are sent in batches once
+        `max_batch` are pending or the oldest has waited `max_delay` seconds.
+        The queue is flushed when this instance is closed.
+
+        Args:
+            max_batch (int, optional): The number of pending mutations that triggers a flush. Defaults to `constants.WRITE_BATCH_SIZE`.
+            max_delay (float, optional): The maximum number of seconds a mutation waits. Defaults to `constants.WRITE_DELAY`.
+
+        Returns:
+            WriteQueue: The queue, also available as `write_queue`.
+        """
+        if self.write_queue is None:
+            self.write_queue = WriteQueue(
+                pynab=self, max_batch=max_batch, max_delay=max_delay
+            )
+        return self.write_queue
+
+    def close(self):
+        """
+        Flushes the write-behind queue, if any, and closes the transport and the pooled HTTP connections it holds.
 
-    def server_knowledges(self, endpoint: str = None):
+        Returns:
+            None
         """
-        Retrieves the server knowledge for a specific endpoint.
+        if self.write_queue is not None:
+            self.write_queue.close()
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def server_knowledges(
+        self,
+        endpoint: str = None,
+        budget_id: str = "last-used",
+        resource_id: str = None,
+    ):
+        """
+        Retrieves the server knowledge for a specific endpoint of a budget.
 
         Parameters:
-            endpoint (str): The endpoint for which to retrieve the server knowledge. If not provided, the default value is None.
+            endpoint (str): The endpoint for which to retrieve the server knowledge, e.g. "get_transactions". If not provided, the default value is None.
+            budget_id (str): The ID of the budget the endpoint was queried for. Defaults to "last-used".
+            resource_id (str): The ID of the account, category, payee or month the endpoint is scoped to. Defaults to None.
 
         Returns:
-            int: The server knowledge for the specified endpoint. If server knowledge tracking is disabled, returns 0.
+            int: The server knowledge for the specified endpoint. If server knowledge tracking is disabled or the endpoint has not been queried yet, returns 0.
         """
         if self._track_server_knowledge:
-            return self._server_knowledges[endpoint]
+            with self._state_lock:
+                return self._server_knowledges.get(
+                    (budget_id, endpoint, resource_id), 0
+                )
         else:
             return 0
 
+    def reset_server_knowledges(self, budget_id: str = None):
+        """
+        Forgets tracked server knowledge so the next requests fetch full collections.
+
+        Parameters:
+            budget_id (str): The ID of the budget to reset. If not provided, all budgets are reset.
+
+        Returns:
+            None
+        """
+        with self._state_lock:
+            for key in list(self._server_knowledges):
+                if budget_id is None or key[0] == budget_id:
+                    del self._server_knowledges[key]
+                    self._server_collections.pop(key, None)
+
     @property
     def user(self):
         """
@@ -0,0 +1,166 @@
+from pynab import constants
+import logging
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    A token bucket that paces requests to stay inside YNAB's rate limit.
+
+    The bucket holds up to `limit` tokens and refills continuously at
+    `limit / period` tokens per second. Every request takes one token; when
+    the bucket is empty (or down to `reserve`) callers are queued and sleep
+    until their token matures, instead of being sent and rejected with a 429.
+    The bucket is re-synchronised from each response's `x-rate-limit` header,
+    so it tracks the server's own count of requests used in the window.
+
+    Attributes:
+        limit (int): The number of requests allowed per period.
+        period (float): The length of the rate limit window in seconds.
+        reserve (int): The number of tokens kept back before callers start queueing.
+    """
+
+    def __init__(
+        self,
+        limit: int = constants.RATE_LIMIT,
+        period: float = constants.RATE_LIMIT_PERIOD,
+        reserve: int = 0,
+    ):
+        """
+        Initializes a new instance of the RateLimiter class.
+
+        Args:
+            limit (int, optional): The number of requests allowed per period. Defaults to `constants.RATE_LIMIT`.
+            period (float, optional): The length of the window in seconds. Defaults to `constants.RATE_LIMIT_PERIOD`.
+            reserve (int, optional): The number of tokens kept back before callers start queueing. Defaults to 0.
+        """
+        self.limit = limit
+        self.period = period
+        self.reserve = reserve
+
+        self._tokens = float(limit)
+        self._waiting = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """
+        Returns the refill rate of the bucket.
+
+        Returns:
+            float: The number of tokens added per second.
+        """
+        return self.limit / self.period
+
+    @property
+    def tokens(self):
+        """
+        Returns the number of requests that can be sent right now without waiting.
+
+        Returns:
+            float: The available tokens, negative while callers are queued.
+        """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    @property
+    def waiting(self):
+        """
+        Returns the number of callers currently queued for a token.
+
+        Returns:
+            int: The number of queued callers.
+        """
+        return self._waiting
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.limit), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _wait_for(self, tokens: float):
+        if tokens >= self.reserve:
+            return 0.0
+        return (self.reserve - tokens) / self.rate
+
+    def wait_time(self):
+        """
+        Projects how long a request issued now would be queued.
+
+        Returns:
+            float: The projected wait in seconds, 0 if a token is available.
+        """
+        with self._lock:
+            self._refill()
+            return self._wait_for(self._tokens - 1)
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until one is available.
+
+        Returns:
+            float: The number of seconds the caller was queued.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = self._wait_for(self._tokens)
+            if wait:
+                self._waiting += 1
+
+        if wait:
+            logging.info(f"rate limit: queueing request for {wait:.1f}s")
+            time.sleep(wait)
+            with self._lock:
+                self._waiting -= 1
+        return wait
+
+    def update(self, used: int = 0, limit: int = None):
+        """
+        Re-synchronises the bucket with the server's view of the rate limit.
+
+        Args:
+            used (int, optional): The number of requests used in the current window. Defaults to 0.
+            limit (int, optional): The number of requests allowed per window. Defaults to the current limit.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._refill()
+            if limit:
+                self.limit = limit
+            remaining = float(self.limit - used)
+            if self._waiting:
+                self._tokens = min(self._tokens, remaining)
+            else:
+                self._tokens = remaining
+
+    def update_from_header(self, header: str = None):
+        """
+        Re-synchronises the bucket from an `x-rate-limit` header such as "36/200".
+
+        Args:
+            header (str, optional): The header value. Defaults to None.
+
+        Returns:
+            None
+        """
+        used, limit = header.split("/")
+        self.update(used=int(used), limit=int(limit))
+
+    def exhaust(self):
+        """
+        Empties the bucket, e.g. after the server answered 429 Too Many Requests.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
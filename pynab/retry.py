@@ -0,0 +1,173 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from pynab import constants
+import random
+
+
+class Attempt:
+    def __init__(self, number: int = 1, status_code: int = None, elapsed: float = 0.0):
+        """
+        Initializes a new instance of the Attempt class.
+
+        Args:
+            number (int, optional): The 1-based attempt number. Defaults to 1.
+            status_code (int, optional): The HTTP status of the attempt, None if it raised. Defaults to None.
+            elapsed (float, optional): The wall-clock duration of the attempt in seconds. Defaults to 0.0.
+
+        Attributes:
+            number (int): The 1-based attempt number.
+            status_code (int): The HTTP status of the attempt, None if it raised.
+            elapsed (float): The wall-clock duration of the attempt in seconds.
+            error (Exception): The connection error raised by the attempt, if any.
+            delay (float): The time slept before the next attempt, 0 for the final one.
+        """
+        self.number = number
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.error = None
+        self.delay = 0.0
+
+    def __repr__(self):
+        outcome = self.status_code if self.error is None else type(self.error).__name__
+        return (
+            f"Attempt(number={self.number}, outcome={outcome}, "
+            f"elapsed={self.elapsed:.3f}, delay={self.delay:.3f})"
+        )
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried.
+
+    Transient statuses (429 and gateway errors by default) and connection
+    errors are retried with capped exponential backoff and full jitter. A
+    `Retry-After` header on the response takes precedence over the computed
+    backoff, up to `max_backoff`. Only idempotent methods are retried unless `retry_non_idempotent`
+    is set on the policy or the caller opts in for a single request.
+
+    Attributes:
+        max_attempts (int): The total number of attempts, including the first.
+        backoff_factor (float): The base delay in seconds, doubled on every retry.
+        max_backoff (float): The upper bound for any single delay in seconds.
+        jitter (bool): Whether delays are drawn uniformly from [0, backoff].
+        retry_statuses (tuple): The HTTP statuses treated as transient.
+        idempotent_methods (tuple): The HTTP methods that are safe to repeat.
+        retry_non_idempotent (bool): Whether non-idempotent methods are retried too.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: tuple = constants.RETRY_STATUSES,
+        idempotent_methods: tuple = constants.IDEMPOTENT_METHODS,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        Initializes a new instance of the RetryPolicy class.
+
+        Args:
+            max_attempts (int, optional): The total number of attempts, including the first. Defaults to 4.
+            backoff_factor (float, optional): The base delay in seconds. Defaults to 0.5.
+            max_backoff (float, optional): The upper bound for any single delay in seconds. Defaults to 30.0.
+            jitter (bool, optional): Whether delays are randomised. Defaults to True.
+            retry_statuses (tuple, optional): The HTTP statuses treated as transient. Defaults to `constants.RETRY_STATUSES`.
+            idempotent_methods (tuple, optional): The HTTP methods that are safe to repeat. Defaults to `constants.IDEMPOTENT_METHODS`.
+            retry_non_idempotent (bool, optional): Whether non-idempotent methods are retried too. Defaults to False.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.idempotent_methods = idempotent_methods
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def should_retry(
+        self,
+        method: str = "GET",
+        status_code: int = None,
+        attempt: int = 1,
+        retry: bool = None,
+    ):
+        """
+        Decides whether a request should be attempted again.
+
+        Args:
+            method (str, optional): The HTTP method of the request. Defaults to "GET".
+            status_code (int, optional): The status of the failed attempt, None for a connection error. Defaults to None.
+            attempt (int, optional): The number of the attempt that just finished. Defaults to 1.
+            retry (bool, optional): The caller's opt-in (True) or opt-out (False) for this request. Defaults to None.
+
+        Returns:
+            bool: True if the request should be retried.
+        """
+        if retry is False or attempt >= self.max_attempts:
+            return False
+        if status_code is not None and status_code not in self.retry_statuses:
+            return False
+        return (
+            retry is True
+            or self.retry_non_idempotent
+            or method.upper() in self.idempotent_methods
+        )
+
+    def backoff(self, attempt: int = 1):
+        """
+        Computes the capped exponential backoff before the next attempt.
+
+        Args:
+            attempt (int, optional): The number of the attempt that just finished. Defaults to 1.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def retry_after(self, response=None):
+        """
+        Parses the `Retry-After` header of a response.
+
+        Args:
+            response (Response, optional): The response of the failed attempt. Defaults to None.
+
+        Returns:
+            float: The requested delay in seconds, or None if the header is absent or invalid.
+        """
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def delay(self, attempt: int = 1, response=None):
+        """
+        Computes how long to wait before the next attempt.
+
+        Args:
+            attempt (int, optional): The number of the attempt that just finished. Defaults to 1.
+            response (Response, optional): The response of the failed attempt. Defaults to None.
+
+        Returns:
+            float: The delay in seconds, honouring `Retry-After` when present, capped at `max_backoff`.
+        """
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return self.backoff(attempt)
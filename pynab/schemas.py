@@ -4,9 +4,60 @@ import pynab.constants as constants
 import pynab.utils as utils
 import logging
 
-from dateutil.parser import isoparse
-
 import json
+import operator
+
+# Marks a lazily decoded field that has not been decoded yet
+_UNSET = object()
+
+
+def _indexed(field: str = ""):
+    """
+    Returns a property for a field that the relationship properties look up with `_dict.by`.
+
+    The value is stored in the `_{field}` slot. Assigning it reports the
+    change through `utils._dict.edited`, so indexes of the field built before
+    the change do not miss the item under its new value.
+
+    Args:
+        field (str): The name of the field, e.g. "category_id".
+
+    Returns:
+        property: The property.
+    """
+    slot = f"_{field}"
+
+    def fset(self, value):
+        setattr(self, slot, value)
+        utils._dict.edited(field)
+
+    return property(operator.attrgetter(slot), fset, doc=f"The {field} field.")
+
+
+def _tracked(field: str = "", indexed: bool = False):
+    """
+    Returns a property for a writable field whose assignments are recorded as edits.
+
+    The value is stored in the `_{field}` slot. Assigning it adds the field
+    to the object's edited fields, which `changes` reports when the JSON to
+    compare against was not kept.
+
+    Args:
+        field (str): The name of the field, e.g. "amount".
+        indexed (bool, optional): Whether the field is also looked up with `_dict.by`, see `_indexed`. Defaults to False.
+
+    Returns:
+        property: The property.
+    """
+    slot = f"_{field}"
+
+    def fset(self, value):
+        setattr(self, slot, value)
+        self._edited(field)
+        if indexed:
+            utils._dict.edited(field)
+
+    return property(operator.attrgetter(slot), fset, doc=f"The {field} field.")
 
 
 class User:
@@ -78,6 +129,10 @@ class Error:
 
         logging.error(f"api error: {self.id} - {self.name} - {self.detail}")
 
+        metrics = getattr(pynab, "metrics", None)
+        if metrics is not None:
+            metrics.count_error(pynab=pynab, error_id=self.id)
+
     def __str__(self):
         """
         Returns a string representation of the object.
@@ -89,6 +144,20 @@ class Error:
 
 
 class Budget:
+    # Collections held by a budget, as named in the budget JSON
+    _collections = (
+        "accounts",
+        "payees",
+        "payee_locations",
+        "category_groups",
+        "categories",
+        "months",
+        "transactions",
+        "subtransactions",
+        "scheduled_transactions",
+        "scheduled_subtransactions",
+    )
+
     def __init__(self, pynab=None, _json: str = None):
         """
         Initialize a new instance of the `schemas` class.
@@ -120,18 +189,23 @@ class Budget:
         self._json: str = _json
 
         self._settings = None
+        # Whether every collection was loaded from a full budget, so the
+        # lazy getters must not fetch them one by one
+        self._hydrated = all(
+            collection in self._json for collection in self._collections
+        )
 
         self.id: str = self._json.get("id", "")
         self.name: str = self._json.get("name", "")
-        self.last_modified_on: datetime = isoparse(
+        self.last_modified_on: datetime = utils.parse_datetime(
             self._json.get("last_modified_on", constants.EPOCH)
         )
-        self.first_month: date = isoparse(
+        self.first_month: date = utils.parse_date(
             self._json.get("first_month", constants.EPOCH)
-        ).date()
-        self.last_month: date = isoparse(
+        )
+        self.last_month: date = utils.parse_date(
             self._json.get("last_month", constants.EPOCH)
-        ).date()
+        )
         self.date_format: DateFormat = DateFormat(
             pynab=self.pynab, _json=self._json.get("date_format", {})
         )
@@ -203,7 +277,7 @@ class Budget:
             None
         """
         for account in _json:
-            account_obj = Account(pynab=self.pynab, _json=account)
+            account_obj = Account(pynab=self.pynab, budget=self, _json=account)
             self._accounts[account_obj.id] = account_obj
 
     @accounts.getter
@@ -214,7 +288,7 @@ class Budget:
         Returns:
             dict: A dictionary containing the accounts associated with the budget.
         """
-        if len(self._accounts) == 0:
+        if not self._hydrated and len(self._accounts) == 0:
             self._accounts = self.pynab.api.get_accounts(budget=self)
         return self._accounts
 
@@ -240,7 +314,7 @@ class Budget:
             None
         """
         for payee in _json:
-            payee_obj = Payee(pynab=self.pynab, _json=payee)
+            payee_obj = Payee(pynab=self.pynab, budget=self, _json=payee)
             self._payees[payee_obj.id] = payee_obj
 
     @payees.getter
@@ -255,7 +329,7 @@ class Budget:
             dict: A dictionary containing the payees associated with the budget.
 
         """
-        if len(self._payees) == 0:
+        if not self._hydrated and len(self._payees) == 0:
             self._payees = self.pynab.api.get_payees(budget=self)
         return self._payees
 
@@ -282,7 +356,9 @@ class Budget:
         None
         """
         for payee_location in _json:
-            payee_location_obj = PayeeLocation(pynab=self.pynab, _json=payee_location)
+            payee_location_obj = PayeeLocation(
+                pynab=self.pynab, budget=self, _json=payee_location
+            )
             self._payee_locations[payee_location_obj.id] = payee_location_obj
 
     @payee_locations.getter
@@ -298,7 +374,7 @@ class Budget:
             dict: A dictionary containing the payee locations associated with the budget.
 
         """
-        if len(self._payee_locations) == 0:
+        if not self._hydrated and len(self._payee_locations) == 0:
             self._payee_locations = self.pynab.api.get_payee_locations(budget=self)
         return self._payee_locations
 
@@ -323,7 +399,9 @@ class Budget:
             None
         """
         for category_group in _json:
-            category_group_obj = CategoryGroup(pynab=self.pynab, _json=category_group)
+            category_group_obj = CategoryGroup(
+                pynab=self.pynab, budget=self, _json=category_group
+            )
             self._category_groups[category_group_obj.id] = category_group_obj
 
     @category_groups.getter
@@ -337,7 +415,7 @@ class Budget:
         Returns:
             dict: A dictionary containing the category groups for the budget.
         """
-        if len(self._category_groups) == 0:
+        if not self._hydrated and len(self._category_groups) == 0:
             self._category_groups = self.pynab.api.get_categories(budget=self)
         return self._category_groups
 
@@ -363,7 +441,7 @@ class Budget:
             None
         """
         for category in _json:
-            category_obj = Category(pynab=self.pynab, _json=category)
+            category_obj = Category(pynab=self.pynab, budget=self, _json=category)
             self._categories[category_obj.id] = category_obj
 
     @categories.getter
@@ -378,7 +456,7 @@ class Budget:
         Returns:
             dict: A dictionary containing the budget's categories.
         """
-        if len(self._categories) == 0:
+        if not self._hydrated and len(self._categories) == 0:
             self._categories = self.pynab.api.get_budget(budget=self).categories
         return self._categories
 
@@ -403,7 +481,7 @@ class Budget:
             None
         """
         for month in _json:
-            month_obj = Month(pynab=self.pynab, _json=month)
+            month_obj = Month(pynab=self.pynab, budget=self, _json=month)
             self._months[month_obj.month] = month_obj
 
     @months.getter
@@ -416,7 +494,7 @@ class Budget:
         Returns:
             dict: A dictionary containing the months associated with the budget.
         """
-        if len(self._months) == 0:
+        if not self._hydrated and len(self._months) == 0:
             self._months = self.pynab.api.get_months(budget=self)
         return self._months
 
@@ -442,7 +520,9 @@ class Budget:
 
         """
         for transaction in _json:
-            transaction_obj = Transaction(pynab=self.pynab, _json=transaction)
+            transaction_obj = Transaction(
+                pynab=self.pynab, budget=self, _json=transaction
+            )
             self._transactions[transaction_obj.id] = transaction_obj
 
     @transactions.getter
@@ -458,7 +538,7 @@ class Budget:
             dict: A dictionary containing the fetched transactions.
 
         """
-        if len(self._transactions) == 0:
+        if not self._hydrated and len(self._transactions) == 0:
             self._transactions = self.pynab.api.get_transactions(budget=self)
         return self._transactions
 
@@ -483,7 +563,9 @@ class Budget:
             None
         """
         for subtransaction in _json:
-            subtransaction_obj = SubTransaction(pynab=self.pynab, _json=subtransaction)
+            subtransaction_obj = SubTransaction(
+                pynab=self.pynab, budget=self, _json=subtransaction
+            )
             self._subtransactions[subtransaction_obj.id] = subtransaction_obj
 
     @subtransactions.getter
@@ -496,7 +578,7 @@ class Budget:
         Returns:
             dict: A dictionary containing the subtransactions associated with the budget.
         """
-        if len(self._subtransactions) == 0:
+        if not self._hydrated and len(self._subtransactions) == 0:
             budget = self.pynab.api.get_budget(budget=self)
             self._subtransactions = budget.subtransactions
         return self._subtransactions
@@ -523,7 +605,7 @@ class Budget:
         """
         for scheduled_transaction in _json:
             scheduled_transaction_obj = ScheduledTransaction(
-                pynab=self.pynab, _json=scheduled_transaction
+                pynab=self.pynab, budget=self, _json=scheduled_transaction
             )
             self._scheduled_transactions[scheduled_transaction_obj.id] = (
                 scheduled_transaction_obj
@@ -540,7 +622,7 @@ class Budget:
         Returns:
             dict: A dictionary containing the scheduled transactions for the budget.
         """
-        if len(self._scheduled_transactions) == 0:
+        if not self._hydrated and len(self._scheduled_transactions) == 0:
             self._scheduled_transactions = self.pynab.api.get_scheduled_transactions(
                 budget=self
             )
@@ -568,7 +650,7 @@ class Budget:
         """
         for scheduled_subtransaction in _json:
             scheduled_subtransaction_obj = ScheduledSubTransaction(
-                pynab=self.pynab, _json=scheduled_subtransaction
+                pynab=self.pynab, budget=self, _json=scheduled_subtransaction
             )
             self._scheduled_subtransactions[scheduled_subtransaction_obj.id] = (
                 scheduled_subtransaction_obj
@@ -585,11 +667,94 @@ class Budget:
         Returns:
             dict: A dictionary containing the scheduled subtransactions.
         """
-        if len(self._scheduled_subtransactions) == 0:
+        if not self._hydrated and len(self._scheduled_subtransactions) == 0:
             budget = self.pynab.api.get_budget(budget=self)
-            self._scheduled_subtransactions = budget.subtransactions
+            self._scheduled_subtransactions = budget.scheduled_subtransactions
         return self._scheduled_subtransactions
 
+    def merge(self, budget: "Budget" = None, full: bool = False):
+        """
+        Merges a delta of this budget into it in place.
+
+        The budget's own fields are taken from the delta, and every collection
+        loaded on this budget is upserted with the delta's changed entities and
+        stripped of the ones the delta marks as deleted. A full budget lists
+        every entity, so the ones it leaves out are stripped as well.
+
+        Args:
+            budget (Budget): The budget parsed from a delta response.
+            full (bool, optional): Whether `budget` holds the full state rather than a delta. Defaults to False.
+
+        Returns:
+            Budget: The budget itself.
+        """
+        self.name = budget.name
+        self.last_modified_on = budget.last_modified_on
+        self.first_month = budget.first_month
+        self.last_month = budget.last_month
+        self.date_format = budget.date_format
+        self.currency_format = budget.currency_format
+
+        for collection in self._collections:
+            getattr(self, f"_{collection}").merge(
+                getattr(budget, f"_{collection}"), full=full
+            )
+        self._link()
+        return self
+
+    def _link(self):
+        """
+        Points every object held by the budget, including nested ones, back at the budget.
+
+        Returns:
+            None
+        """
+        for collection in self._collections:
+            for item in getattr(self, f"_{collection}").values():
+                item.budget = self
+                if isinstance(item, (CategoryGroup, Month)):
+                    children = item.categories
+                elif isinstance(item, ScheduledTransaction):
+                    children = item.scheduled_subtransactions
+                elif (
+                    isinstance(item, Transaction)
+                    and item._subtransactions is not _UNSET
+                ):
+                    children = item._subtransactions
+                else:
+                    continue
+                for child in children.values():
+                    child.budget = self
+
+    def hydrate(self):
+        """
+        Loads every collection of the budget from a single request.
+
+        The full budget is fetched once (`GET /budgets/{budget_id}`) and all of
+        its collections and settings are filled in, with every object linked
+        back to this budget. Entities loaded before that the full budget no
+        longer lists are removed. Afterwards the lazy collection getters never
+        issue requests of their own for this budget.
+
+        Returns:
+            Budget: The budget itself.
+        """
+        budget = self.pynab.api.get_budget(budget=self)
+        if budget is not self:
+            # Either a full response or the tracked budget with every delta
+            # applied, so whatever it lacks no longer exists
+            self.merge(budget, full=True)
+        self._settings = BudgetSettings(
+            pynab=self.pynab,
+            budget=self,
+            _json={
+                "date_format": budget._json.get("date_format", {}),
+                "currency_format": budget._json.get("currency_format", {}),
+            },
+        )
+        self._hydrated = True
+        return self
+
     @property
     def detail(self):
         """
@@ -598,8 +763,7 @@ class Budget:
         Returns:
             The budget object with additional details.
         """
-        self = self.pynab.api.get_budget(budget=self)
-        return self
+        return self.hydrate()
 
     @property
     def settings(self):
@@ -702,6 +866,30 @@ class CurrencyFormat:
 
 
 class Account:
+    __slots__ = (
+        "pynab",
+        "_json",
+        "budget",
+        "id",
+        "name",
+        "type",
+        "on_budget",
+        "closed",
+        "note",
+        "balance",
+        "cleared_balance",
+        "uncleared_balance",
+        "transfer_payee_id",
+        "direct_import_linked",
+        "direct_import_in_error",
+        "last_reconciled_at",
+        "debt_original_balance",
+        "debt_interest_rates",
+        "debt_minimum_payments",
+        "debt_escrow_amounts",
+        "deleted",
+    )
+
     def __init__(self, pynab=None, budget: Budget = None, _json: str = None):
         """
         Initializes a new instance of the `schemas` class.
@@ -747,8 +935,8 @@ class Account:
         self.transfer_payee_id: str = self._json.get("transfer_payee_id", "")
         self.direct_import_linked: bool = self._json.get("direct_import_linked", False)
         self.direct_import_in_error: str = self._json.get("direct_import_in_error", "")
-        self.last_reconciled_at: datetime = datetime.fromisoformat(
-            self._json.get("last_reconciled_at", constants.EPOCH) or constants.EPOCH
+        self.last_reconciled_at: datetime = utils.parse_datetime(
+            self._json.get("last_reconciled_at", constants.EPOCH)
         )
         self.debt_original_balance: int = self._json.get("debt_original_balance", 0)
         self.debt_interest_rates: DebtInterestRates = DebtInterestRates(
@@ -771,6 +959,9 @@ class Account:
         )
         self.deleted: bool = self._json.get("deleted", False)
 
+        if self.pynab is not None and not self.pynab._keep_json:
+            self._json = None
+
     @property
     def transfer_payees(self):
         """
@@ -924,6 +1115,16 @@ class DebtEscrowAmounts:
 
 
 class Payee:
+    __slots__ = (
+        "pynab",
+        "_json",
+        "budget",
+        "id",
+        "name",
+        "transfer_account_id",
+        "deleted",
+    )
+
     def __init__(
         self,
         pynab=None,
@@ -953,6 +1154,9 @@ class Payee:
         self.transfer_account_id: str = self._json.get("transfer_account_id", "")
         self.deleted: bool = self._json.get("deleted", False)
 
+        if self.pynab is not None and not self.pynab._keep_json:
+            self._json = None
+
     @property
     def transfer_account(self):
         """
@@ -1087,11 +1291,65 @@ class CategoryGroup:
         self.deleted: bool = self._json.get("deleted", False)
         self.categories = utils._dict()
         for category_json in _json.get("categories", []):
-            category = Category(pynab=self.pynab, _json=category_json)
+            category = Category(
+                pynab=self.pynab, budget=self.budget, _json=category_json
+            )
             self.categories[category.id] = category
 
+    def merge(self, category_group: "CategoryGroup" = None, full: bool = False):
+        """
+        Merges a delta of this category group into it in place.
+
+        The group's own fields are taken from the delta, and its categories
+        are upserted with the delta's changed categories and stripped of the
+        ones the delta marks as deleted; categories the delta leaves out are
+        kept, unless it is a full response.
+
+        Args:
+            category_group (CategoryGroup): The category group parsed from a delta response.
+            full (bool, optional): Whether the category group comes from a full response. Defaults to False.
+
+        Returns:
+            CategoryGroup: The category group itself.
+        """
+        self.name = category_group.name
+        self.hidden = category_group.hidden
+        self.deleted = category_group.deleted
+        self.categories.merge(category_group.categories, full=full)
+        return self
+
 
 class Category:
+    __slots__ = (
+        "pynab",
+        "_json",
+        "budget",
+        "id",
+        "category_group_id",
+        "category_group_name",
+        "name",
+        "hidden",
+        "original_category_group_id",
+        "note",
+        "budgeted",
+        "activity",
+        "balance",
+        "_goal_type",
+        "goal_needs_whole_amount",
+        "goal_day",
+        "goal_cadence",
+        "goal_cadence_frequency",
+        "_goal_creation_month",
+        "goal_target",
+        "_goal_target_month",
+        "goal_percentage_complete",
+        "goal_months_to_budget",
+        "goal_under_funded",
+        "goal_overall_funded",
+        "goal_overall_left",
+        "deleted",
+    )
+
     def __init__(self, pynab=None, budget: Budget = None, _json: str = None):
         """
         Initializes a new instance of the Schema class.
@@ -1143,22 +1401,16 @@ class Category:
         self.budgeted: int = self._json.get("budgeted", 0)
         self.activity: int = self._json.get("activity", 0)
         self.balance: int = self._json.get("balance", 0)
-        self.goal_type: enums.GoalType = enums.GoalType(
-            self._json.get("goal_type", None)
-        )
+        self._goal_type = _UNSET
         self.goal_needs_whole_amount: bool = self._json.get(
             "goal_needs_whole_amount", False
         )
         self.goal_day: int = self._json.get("goal_day", 0)
         self.goal_cadence: int = self._json.get("goal_cadence", 0)
         self.goal_cadence_frequency: int = self._json.get("goal_cadence_frequency", 0)
-        self.goal_creation_month: date = isoparse(
-            self._json.get("goal_creation_month", constants.EPOCH) or constants.EPOCH
-        ).date()
+        self._goal_creation_month = _UNSET
         self.goal_target: int = self._json.get("goal_target", 0)
-        self.goal_target_month: date = isoparse(
-            self._json.get("goal_target_month", constants.EPOCH) or constants.EPOCH
-        ).date()
+        self._goal_target_month = _UNSET
         self.goal_percentage_complete: int = self._json.get(
             "goal_percentage_complete", 0
         )
@@ -1168,6 +1420,74 @@ class Category:
         self.goal_overall_left: int = self._json.get("goal_overall_left", 0)
         self.deleted: bool = self._json.get("deleted", False)
 
+        if self.pynab is None or not self.pynab._lazy:
+            self.decode()
+            if self.pynab is not None and not self.pynab._keep_json:
+                self._json = None
+
+    def decode(self):
+        """
+        Decodes every lazily decoded field that has not been accessed yet.
+
+        Returns:
+            Category: The category itself.
+        """
+        for field in ("goal_type", "goal_creation_month", "goal_target_month"):
+            getattr(self, field)
+        return self
+
+    @property
+    def goal_type(self):
+        """
+        Returns the type of goal of the category, decoding it on first access.
+
+        Returns:
+            enums.GoalType: The type of goal.
+        """
+        if self._goal_type is _UNSET:
+            self._goal_type = enums.GoalType(self._json.get("goal_type", None))
+        return self._goal_type
+
+    @goal_type.setter
+    def goal_type(self, value: enums.GoalType = None):
+        self._goal_type = value
+
+    @property
+    def goal_creation_month(self):
+        """
+        Returns the creation month of the goal, decoding it on first access.
+
+        Returns:
+            date: The creation month of the goal.
+        """
+        if self._goal_creation_month is _UNSET:
+            self._goal_creation_month = utils.parse_date(
+                self._json.get("goal_creation_month", constants.EPOCH)
+            )
+        return self._goal_creation_month
+
+    @goal_creation_month.setter
+    def goal_creation_month(self, value: date = None):
+        self._goal_creation_month = value
+
+    @property
+    def goal_target_month(self):
+        """
+        Returns the target month of the goal, decoding it on first access.
+
+        Returns:
+            date: The target month of the goal.
+        """
+        if self._goal_target_month is _UNSET:
+            self._goal_target_month = utils.parse_date(
+                self._json.get("goal_target_month", constants.EPOCH)
+            )
+        return self._goal_target_month
+
+    @goal_target_month.setter
+    def goal_target_month(self, value: date = None):
+        self._goal_target_month = value
+
     @property
     def category_group(self):
         """
@@ -1262,9 +1582,7 @@ class Month:
 
         self.budget = budget
 
-        self.month: date = isoparse(
-            self._json.get("month", constants.EPOCH) or constants.EPOCH
-        ).date()
+        self.month: date = utils.parse_date(self._json.get("month", constants.EPOCH))
         self.note: str = self._json.get("note", "")
         self.income: int = self._json.get("income", 0)
         self.budgeted: int = self._json.get("budgeted", 0)
@@ -1274,11 +1592,66 @@ class Month:
         self.deleted: bool = self._json.get("deleted", False)
         self.categories = utils._dict()
         for category_json in _json.get("categories", []):
-            category = Category(pynab=self.pynab, _json=category_json)
+            category = Category(
+                pynab=self.pynab, budget=self.budget, _json=category_json
+            )
             self.categories[category.id] = category
 
 
 class Transaction:
+    __slots__ = (
+        "pynab",
+        "_json",
+        "budget",
+        "id",
+        "_date",
+        "_amount",
+        "_memo",
+        "_cleared",
+        "_approved",
+        "_flag_color",
+        "flag_name",
+        "_account_id",
+        "_payee_id",
+        "_category_id",
+        "transfer_account_id",
+        "transfer_transaction_id",
+        "matched_transaction_id",
+        "import_id",
+        "import_payee_name",
+        "import_payee_name_original",
+        "debt_transaction_type",
+        "deleted",
+        "account_name",
+        "_payee_name",
+        "category_name",
+        "_subtransactions",
+        "_dirty",
+    )
+
+    # The fields an update can change, with the value the API omits them as
+    _writable = {
+        "account_id": "",
+        "date": None,
+        "amount": 0,
+        "payee_id": "",
+        "payee_name": "",
+        "category_id": "",
+        "memo": "",
+        "cleared": None,
+        "approved": False,
+        "flag_color": None,
+        "subtransactions": [],
+    }
+
+    account_id = _tracked("account_id", indexed=True)
+    payee_id = _tracked("payee_id", indexed=True)
+    category_id = _tracked("category_id", indexed=True)
+    amount = _tracked("amount")
+    memo = _tracked("memo")
+    approved = _tracked("approved")
+    payee_name = _tracked("payee_name")
+
     def __init__(self, pynab=None, budget: Budget = None, _json: dict = None):
         """
         Initializes a new instance of the Transaction class.
@@ -1318,23 +1691,21 @@ class Transaction:
 
         self.budget = budget
 
+        # The writable fields assigned since the transaction was loaded or
+        # saved, created on the first assignment
+        self._dirty = None
+
         self.id: str = self._json.get("id", "")
-        self.date: date = isoparse(
-            self._json.get("date", constants.EPOCH) or constants.EPOCH
-        ).date()
-        self.amount: int = self._json.get("amount", 0)
-        self.memo: str = self._json.get("memo", "")
-        self.cleared: enums.TransactionClearedStatus = enums.TransactionClearedStatus(
-            self._json.get("cleared", "")
-        )
-        self.approved: bool = self._json.get("approved", False)
-        self.flag_color: enums.TransactionFlagColor = enums.TransactionFlagColor(
-            self._json.get("flag_color", "")
-        )
+        self._date = _UNSET
+        self._amount: int = self._json.get("amount", 0)
+        self._memo: str = self._json.get("memo", "")
+        self._cleared = _UNSET
+        self._approved: bool = self._json.get("approved", False)
+        self._flag_color = _UNSET
         self.flag_name: str = self._json.get("flag_name", "")
-        self.account_id: str = self._json.get("account_id", "")
-        self.payee_id: str = self._json
-        self.category_id: str = self._json.get("category_id", "")
+        self._account_id: str = self._json.get("account_id", "")
+        self._payee_id: str = self._json.get("payee_id", "")
+        self._category_id: str = self._json.get("category_id", "")
         self.transfer_account_id: str = self._json.get("transfer_account_id", "")
         self.transfer_transaction_id: str = self._json.get(
             "transfer_transaction_id", ""
@@ -1348,13 +1719,115 @@ class Transaction:
         self.debt_transaction_type: str = self._json.get("debt_transaction_type", "")
         self.deleted: bool = self._json.get("deleted", False)
         self.account_name: str = self._json.get("account_name", "")
-        self.payee_name: str = self._json.get("payee_name", "")
+        self._payee_name: str = self._json.get("payee_name", "")
         self.category_name: str = self._json.get("category_name", "")
-        self.subtransactions = utils._dict()
-        for subtransaction in self._json.get("subtransactions", []):
-            self.subtransactions[subtransaction["id"]] = SubTransaction(
-                pynab=self.pynab, _json=subtransaction
+        self._subtransactions = _UNSET
+
+        if self.pynab is None or not self.pynab._lazy:
+            self.decode()
+            if self.pynab is not None and not self.pynab._keep_json:
+                self._json = None
+
+    def decode(self):
+        """
+        Decodes every lazily decoded field that has not been accessed yet.
+
+        Returns:
+            Transaction: The transaction itself.
+        """
+        for field in ("date", "cleared", "flag_color", "subtransactions"):
+            getattr(self, field)
+        return self
+
+    @property
+    def date(self):
+        """
+        Returns the date of the transaction, decoding it on first access.
+
+        Returns:
+            date: The date of the transaction.
+        """
+        if self._date is _UNSET:
+            self._date = utils.parse_date(self._json.get("date", constants.EPOCH))
+        return self._date
+
+    @date.setter
+    def date(self, value: date = None):
+        self._date = value
+        self._edited("date")
+
+    @property
+    def cleared(self):
+        """
+        Returns the cleared status of the transaction, decoding it on first access.
+
+        Returns:
+            enums.TransactionClearedStatus: The cleared status of the transaction.
+        """
+        if self._cleared is _UNSET:
+            self._cleared = enums.TransactionClearedStatus(
+                self._json.get("cleared", "")
+            )
+        return self._cleared
+
+    @cleared.setter
+    def cleared(self, value: enums.TransactionClearedStatus = None):
+        self._cleared = value
+        self._edited("cleared")
+
+    @property
+    def flag_color(self):
+        """
+        Returns the flag color of the transaction, decoding it on first access.
+
+        Returns:
+            enums.TransactionFlagColor: The flag color of the transaction.
+        """
+        if self._flag_color is _UNSET:
+            self._flag_color = enums.TransactionFlagColor(
+                self._json.get("flag_color", "")
             )
+        return self._flag_color
+
+    @flag_color.setter
+    def flag_color(self, value: enums.TransactionFlagColor = None):
+        self._flag_color = value
+        self._edited("flag_color")
+
+    @property
+    def subtransactions(self):
+        """
+        Returns the subtransactions of the transaction, building them on first access.
+
+        Returns:
+            dict: The subtransactions, keyed by subtransaction ID.
+        """
+        if self._subtransactions is _UNSET:
+            self._subtransactions = utils._dict()
+            for subtransaction in self._json.get("subtransactions", []):
+                self._subtransactions[subtransaction["id"]] = SubTransaction(
+                    pynab=self.pynab, budget=self.budget, _json=subtransaction
+                )
+        return self._subtransactions
+
+    @subtransactions.setter
+    def subtransactions(self, value: dict = None):
+        self._subtransactions = value
+        self._edited("subtransactions")
+
+    def _edited(self, field: str = ""):
+        """
+        Records that a writable field was assigned.
+
+        Args:
+            field (str): The name of the field.
+
+        Returns:
+            None
+        """
+        if self._dirty is None:
+            self._dirty = set()
+        self._dirty.add(field)
 
     def to_dict(self):
         """
@@ -1387,10 +1860,84 @@ class Transaction:
             "payee_name": self.payee_name,
             "category_name": self.category_name,
             "subtransactions": [
-                subtransaction.to_dict() for subtransaction in self.subtransactions
+                subtransaction.to_dict()
+                for subtransaction in self.subtransactions.values()
             ],
         }
 
+    def _save_value(self, field: str = ""):
+        """
+        Returns the value of a writable field as the API expects it.
+
+        Args:
+            field (str): The name of the field.
+
+        Returns:
+            object: The JSON value of the field.
+        """
+        value = getattr(self, field)
+        if field == "date":
+            return value.isoformat()
+        if field in ("cleared", "flag_color"):
+            return value.value
+        if field == "subtransactions":
+            return [
+                SubTransaction._save(subtransaction.to_dict())
+                for subtransaction in value.values()
+            ]
+        return value
+
+    def changes(self):
+        """
+        Returns the writable fields changed since the transaction was loaded.
+
+        Fields are compared with the JSON the transaction was parsed from, so
+        lazily decoded fields that were never read are known to be unchanged
+        without decoding them. Without that JSON (`keep_json=False`) the
+        fields assigned since the transaction was loaded or saved are
+        returned instead; subtransactions edited in place are only sent once
+        `subtransactions` itself is assigned.
+
+        Returns:
+            dict: The changed fields, as the API expects them; empty if nothing changed.
+        """
+        if self._json is None:
+            return {field: self._save_value(field) for field in self._dirty or ()}
+
+        changes = {}
+        for field, default in self._writable.items():
+            if getattr(self, f"_{field}", None) is _UNSET:
+                continue
+            value = self._save_value(field)
+            original = self._json.get(field, default)
+            if field == "subtransactions":
+                original = [SubTransaction._save(item) for item in original or []]
+            if value != original:
+                changes[field] = value
+        return changes
+
+    def mark_clean(self, changes: dict = None):
+        """
+        Makes saved values the baseline `changes` compares against.
+
+        Pass the `changes()` a request was built from, so fields edited while
+        it was in flight are still reported as changed afterwards.
+
+        Args:
+            changes (dict, optional): The changes that were saved. Defaults to the current `changes()`.
+
+        Returns:
+            Transaction: The transaction itself.
+        """
+        saved = self.changes() if changes is None else changes
+        if self._json is not None:
+            self._json = dict(self._json, **saved)
+        elif self._dirty:
+            for field, value in saved.items():
+                if self._save_value(field) == value:
+                    self._dirty.discard(field)
+        return self
+
     def to_json(self, indent: int = 4):
         """
         Convert the object to a JSON string representation.
@@ -1464,6 +2011,29 @@ class Transaction:
 
 
 class SubTransaction:
+    __slots__ = (
+        "pynab",
+        "_json",
+        "budget",
+        "id",
+        "transaction_id",
+        "amount",
+        "memo",
+        "_payee_id",
+        "payee_name",
+        "_category_id",
+        "category_name",
+        "transfer_account_id",
+        "transfer_transaction_id",
+        "deleted",
+    )
+
+    # The fields sent when a subtransaction is saved
+    _save_fields = ("amount", "payee_id", "payee_name", "category_id", "memo")
+
+    payee_id = _indexed("payee_id")
+    category_id = _indexed("category_id")
+
     def __init__(self, pynab=None, budget: Budget = None, _json: str = None):
         """
         Initialize a new instance of the Schema class.
@@ -1494,9 +2064,9 @@ class SubTransaction:
         self.transaction_id: str = self._json.get("transaction_id", "")
         self.amount: str = self._json.get("amount", 0)
         self.memo: str = self._json.get("memo", "")
-        self.payee_id: str = self._json.get("payee_id", "")
+        self._payee_id: str = self._json.get("payee_id", "")
         self.payee_name: str = self._json.get("payee_name", "")
-        self.category_id: str = self._json.get("category_id", "")
+        self._category_id: str = self._json.get("category_id", "")
         self.category_name: str = self._json.get("category_name", "")
         self.transfer_account_id: str = self._json.get("transfer_account_id", "")
         self.transfer_transaction_id: str = self._json.get(
@@ -1504,6 +2074,55 @@ class SubTransaction:
         )
         self.deleted: str = self._json.get("deleted", False)
 
+        if self.pynab is not None and not self.pynab._keep_json:
+            self._json = None
+
+    def to_dict(self):
+        """
+        Converts the object to a dictionary representation.
+
+        Returns:
+            dict: A dictionary containing the object's attributes.
+        """
+        return {
+            "id": self.id,
+            "transaction_id": self.transaction_id,
+            "amount": self.amount,
+            "memo": self.memo,
+            "payee_id": self.payee_id,
+            "payee_name": self.payee_name,
+            "category_id": self.category_id,
+            "category_name": self.category_name,
+            "transfer_account_id": self.transfer_account_id,
+            "transfer_transaction_id": self.transfer_transaction_id,
+            "deleted": self.deleted,
+        }
+
+    @classmethod
+    def _save(cls, subtransaction: dict = None):
+        """
+        Picks the fields of a subtransaction that are sent when it is saved.
+
+        Args:
+            subtransaction (dict): The subtransaction JSON or `to_dict()`.
+
+        Returns:
+            dict: The subtransaction body.
+        """
+        return {field: subtransaction.get(field) for field in cls._save_fields}
+
+    def to_json(self, indent: int = 4):
+        """
+        Convert the object to a JSON string representation.
+
+        Args:
+            indent (int, optional): The number of spaces to use for indentation. Defaults to 4.
+
+        Returns:
+            str: The JSON string representation of the object.
+        """
+        return json.dumps(self.to_dict(), cls=utils.CustomJsonEncoder, indent=indent)
+
     def transaction(self):
         """
         Returns the transaction associated with the current transaction_id.
@@ -1586,12 +2205,12 @@ class ScheduledTransaction:
         self.budget = budget
 
         self.id: str = self._json.get("id", "")
-        self.date_first: date = isoparse(
+        self.date_first: date = utils.parse_date(
             self._json.get("date_first", constants.EPOCH)
-        ).date()
-        self.date_next: date = isoparse(
+        )
+        self.date_next: date = utils.parse_date(
             self._json.get("date_next", constants.EPOCH)
-        ).date()
+        )
         self.frequency: enums.Frequency = enums.Frequency(
             self._json.get("frequency", "")
         )
@@ -1608,7 +2227,9 @@ class ScheduledTransaction:
         self.scheduled_subtransactions = utils._dict()
         for scheduled_subtransaction_json in _json.get("scheduled_subtransactions", []):
             scheduled_subtransaction = ScheduledSubTransaction(
-                _json=scheduled_subtransaction_json
+                pynab=self.pynab,
+                budget=self.budget,
+                _json=scheduled_subtransaction_json,
             )
             self.scheduled_subtransactions[scheduled_subtransaction.id] = (
                 scheduled_subtransaction
@@ -1692,7 +2313,7 @@ class ScheduledTransaction:
 
 
 class ScheduledSubTransaction:
-    def __init__(self, pynab=None, _json: str = None):
+    def __init__(self, pynab=None, budget: Budget = None, _json: str = None):
         """
         Initializes a new instance of the Schema class.
 
@@ -1713,9 +2334,11 @@ class ScheduledSubTransaction:
         self.pynab = pynab
         self._json: str = _json
 
+        self.budget = budget
+
         self.id: str = self._json.get("id", "")
-        self.scheduled_transaction_id: str = (
-            (self._json.get("scheduled_transaction_id", "")),
+        self.scheduled_transaction_id: str = self._json.get(
+            "scheduled_transaction_id", ""
         )
         self.amount: int = self._json.get("amount", 0)
         self.memo: str = self._json.get("memo", "")
@@ -0,0 +1,471 @@
+import pynab.schemas as schemas
+import pynab.utils as utils
+from datetime import datetime, timezone
+import json
+import sqlite3
+import threading
+import time
+
+
+class SqliteStorage:
+    """
+    A persistent local mirror of YNAB budgets in a SQLite database.
+
+    Every entity of a budget (accounts, payees, payee locations, category
+    groups, categories, months, transactions, subtransactions, scheduled
+    transactions and scheduled subtransactions) is stored as one row holding
+    its JSON, plus a few indexed columns used to filter reads. The server
+    knowledge of the last sync is stored alongside, so `sync` only downloads
+    what changed since then and reads are served from the local tables.
+
+    Attributes:
+        pynab (Pynab): The Pynab instance used to download deltas.
+        path (str): The path of the SQLite database.
+    """
+
+    # Table name -> (key field, indexed fields)
+    _tables = {
+        "accounts": ("id", ("name", "type")),
+        "payees": ("id", ("name", "transfer_account_id")),
+        "payee_locations": ("id", ("payee_id",)),
+        "category_groups": ("id", ("name",)),
+        "categories": ("id", ("category_group_id", "name")),
+        "months": ("month", ()),
+        "transactions": ("id", ("date", "account_id", "payee_id", "category_id")),
+        "subtransactions": ("id", ("transaction_id", "payee_id", "category_id")),
+        "scheduled_transactions": ("id", ("date_next", "account_id")),
+        "scheduled_subtransactions": ("id", ("scheduled_transaction_id",)),
+    }
+
+    # Table name -> schema class used to build objects from stored JSON
+    _schemas = {
+        "accounts": schemas.Account,
+        "payees": schemas.Payee,
+        "payee_locations": schemas.PayeeLocation,
+        "category_groups": schemas.CategoryGroup,
+        "categories": schemas.Category,
+        "months": schemas.Month,
+        "transactions": schemas.Transaction,
+        "subtransactions": schemas.SubTransaction,
+        "scheduled_transactions": schemas.ScheduledTransaction,
+        "scheduled_subtransactions": schemas.ScheduledSubTransaction,
+    }
+
+    def __init__(self, pynab=None, path: str = ":memory:"):
+        """
+        Initializes a new instance of the SqliteStorage class.
+
+        Args:
+            pynab (Pynab, optional): The Pynab instance used to download deltas. Defaults to None.
+            path (str, optional): The path of the SQLite database, created if missing. Defaults to ":memory:".
+        """
+        self.pynab = pynab
+        self.path = path
+
+        self._lock = threading.RLock()
+        # Resolved budget ID -> budget assembled from the mirror, which the
+        # objects returned by `get` are linked to; cleared by `store`
+        self._budgets = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS budgets ("
+                "id TEXT PRIMARY KEY, name TEXT, json TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "budget_id TEXT PRIMARY KEY, resolved_id TEXT NOT NULL, "
+                "server_knowledge INTEGER NOT NULL, synced_on TEXT NOT NULL)"
+            )
+            for table, (_, fields) in self._tables.items():
+                columns = "".join(f", {field} TEXT" for field in fields)
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"budget_id TEXT NOT NULL, id TEXT NOT NULL{columns}, "
+                    f"json TEXT NOT NULL, PRIMARY KEY (budget_id, id))"
+                )
+                for field in fields:
+                    self._connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_{field} "
+                        f"ON {table} (budget_id, {field})"
+                    )
+
+    def close(self):
+        """
+        Closes the database connection.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _resolve(self, budget_id: str = "last-used"):
+        row = self._connection.execute(
+            "SELECT resolved_id FROM sync_state WHERE budget_id = ?", (budget_id,)
+        ).fetchone()
+        return row[0] if row else budget_id
+
+    def server_knowledge(self, budget_id: str = "last-used"):
+        """
+        Returns the server knowledge of the last sync of a budget.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            int: The stored server knowledge, or 0 if the budget was never synced.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT server_knowledge FROM sync_state WHERE budget_id = ?",
+                (budget_id,),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def sync(self, budget: schemas.Budget = None, budget_id: str = "last-used"):
+        """
+        Downloads the changes to a budget since the last sync and applies them to the mirror.
+
+        The first sync of a budget downloads it in full. Later syncs send the
+        stored server knowledge, so only changed entities are downloaded;
+        entities marked as deleted are removed from the mirror.
+
+        Args:
+            budget (schemas.Budget, optional): The budget to sync. Defaults to None.
+            budget_id (str, optional): The ID of the budget to sync. Defaults to "last-used".
+
+        Returns:
+            int: The new server knowledge of the budget.
+
+        Raises:
+            Exception: If there is an error retrieving the budget.
+        """
+        budget_id = budget.id if budget else budget_id
+
+        response = self.pynab.api.endpoints.request_get_budget(
+            budget_id=budget_id,
+            last_knowledge_of_server=self.server_knowledge(budget_id=budget_id),
+        )
+        _json = response.json()
+
+        if response.status_code == 200:
+            data_json = _json.get("data", {})
+            server_knowledge = data_json.get("server_knowledge", 0)
+            self.store(
+                budget_json=data_json.get("budget", {}),
+                budget_id=budget_id,
+                server_knowledge=server_knowledge,
+            )
+            with self.pynab._state_lock:
+                self.pynab._synced_on[budget_id] = time.time()
+            return server_knowledge
+        else:
+            error_json = _json.get("error", {})
+            raise Exception(schemas.Error(pynab=self.pynab, _json=error_json))
+
+    def store(
+        self,
+        budget_json: dict = None,
+        budget_id: str = None,
+        server_knowledge: int = 0,
+    ):
+        """
+        Applies a full or delta budget, as returned by the budget endpoint, to the mirror.
+
+        Args:
+            budget_json (dict, optional): The `budget` object of the response. Defaults to None.
+            budget_id (str, optional): The ID the budget was requested by, e.g. "last-used". Defaults to the budget's own ID.
+            server_knowledge (int, optional): The server knowledge of the response. Defaults to 0.
+
+        Returns:
+            None
+        """
+        resolved_id = budget_json.get("id", "")
+        budget_id = budget_id or resolved_id
+
+        with self._lock, self._connection:
+            summary = {
+                key: value
+                for key, value in budget_json.items()
+                if key not in self._tables
+            }
+            self._connection.execute(
+                "INSERT OR REPLACE INTO budgets (id, name, json) VALUES (?, ?, ?)",
+                (resolved_id, summary.get("name", ""), json.dumps(summary)),
+            )
+
+            for table, (key, fields) in self._tables.items():
+                upserts = []
+                deletes = []
+                for entity_json in budget_json.get(table, []) or []:
+                    entity_id = entity_json.get(key)
+                    if entity_json.get("deleted", False):
+                        deletes.append((resolved_id, entity_id))
+                    else:
+                        if table == "months":
+                            entity_json = self._merge_month(
+                                budget_id=resolved_id, month_json=entity_json
+                            )
+                        upserts.append(
+                            (resolved_id, entity_id)
+                            + tuple(entity_json.get(field) for field in fields)
+                            + (json.dumps(entity_json),)
+                        )
+                if upserts:
+                    placeholders = ", ".join("?" * (len(fields) + 3))
+                    columns = "".join(f", {field}" for field in fields)
+                    self._connection.executemany(
+                        f"INSERT OR REPLACE INTO {table} "
+                        f"(budget_id, id{columns}, json) VALUES ({placeholders})",
+                        upserts,
+                    )
+                if deletes:
+                    self._connection.executemany(
+                        f"DELETE FROM {table} WHERE budget_id = ? AND id = ?",
+                        deletes,
+                    )
+
+            self._budgets.clear()
+            synced_on = datetime.now(timezone.utc).isoformat()
+            for key in {budget_id, resolved_id}:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO sync_state "
+                    "(budget_id, resolved_id, server_knowledge, synced_on) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, resolved_id, server_knowledge, synced_on),
+                )
+
+    def _merge_month(self, budget_id: str = None, month_json: dict = None):
+        """
+        Merges a month from a delta into the stored one.
+
+        Month deltas only list the categories that changed, so the stored
+        categories are kept, the delta's are upserted over them and the ones
+        it marks as deleted are dropped.
+
+        Args:
+            budget_id (str, optional): The resolved ID of the budget. Defaults to None.
+            month_json (dict, optional): The month from the delta. Defaults to None.
+
+        Returns:
+            dict: The merged month.
+        """
+        row = self._connection.execute(
+            "SELECT json FROM months WHERE budget_id = ? AND id = ?",
+            (budget_id, month_json.get("month")),
+        ).fetchone()
+        if row is None:
+            return month_json
+
+        stored_json = json.loads(row[0])
+        categories = {
+            category.get("id"): category
+            for category in stored_json.get("categories", []) or []
+        }
+        for category in month_json.get("categories", []) or []:
+            if category.get("deleted", False):
+                categories.pop(category.get("id"), None)
+            else:
+                categories[category.get("id")] = category
+        stored_json.update(month_json)
+        stored_json["categories"] = list(categories.values())
+        return stored_json
+
+    def _rows(self, table: str = None, budget_id: str = "last-used", **filters):
+        where = ["budget_id = ?"]
+        params = []
+        for field, value in filters.items():
+            if value is None:
+                continue
+            if field == "since_date":
+                where.append("date >= ?")
+            else:
+                where.append(f"{field} = ?")
+            params.append(str(value))
+        with self._lock:
+            params.insert(0, self._resolve(budget_id))
+            return self._connection.execute(
+                f"SELECT json FROM {table} WHERE {' AND '.join(where)}", params
+            ).fetchall()
+
+    def get(self, table: str = None, budget_id: str = "last-used", **filters):
+        """
+        Reads entities of a budget from the mirror.
+
+        The entities are linked to the budget assembled from the mirror, so
+        relationships such as `transaction.account` are resolved locally
+        instead of through the API.
+
+        Args:
+            table (str, optional): The entity table, e.g. "transactions". Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            **filters: Equality filters on the table's indexed columns, e.g. `account_id=...`.
+
+        Returns:
+            dict: The matching entities, keyed by ID.
+        """
+        key = self._tables[table][0]
+        schema = self._schemas[table]
+        budget = self.get_budget(budget_id=budget_id)
+
+        entities = utils._dict()
+        for (entity_json,) in self._rows(table=table, budget_id=budget_id, **filters):
+            entity_json = json.loads(entity_json)
+            entities[entity_json.get(key)] = schema(
+                pynab=self.pynab, budget=budget, _json=entity_json
+            )
+        return entities
+
+    def get_budget(self, budget_id: str = "last-used"):
+        """
+        Assembles a full budget from the mirror without contacting the API.
+
+        The budget is assembled once per sync and shared by later reads.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            schemas.Budget: The budget, or None if it was never synced.
+        """
+        with self._lock:
+            resolved_id = self._resolve(budget_id)
+            if resolved_id in self._budgets:
+                return self._budgets[resolved_id]
+            row = self._connection.execute(
+                "SELECT json FROM budgets WHERE id = ?", (resolved_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        budget_json = json.loads(row[0])
+        for table in self._tables:
+            budget_json[table] = [
+                json.loads(entity_json)
+                for (entity_json,) in self._rows(table=table, budget_id=resolved_id)
+            ]
+        budget = schemas.Budget(pynab=self.pynab, _json=budget_json)
+        with self._lock:
+            self._budgets[resolved_id] = budget
+        return budget
+
+    def get_accounts(self, budget_id: str = "last-used"):
+        """
+        Reads the accounts of a budget from the mirror.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            dict: The accounts, keyed by account ID.
+        """
+        return self.get(table="accounts", budget_id=budget_id)
+
+    def get_payees(self, budget_id: str = "last-used"):
+        """
+        Reads the payees of a budget from the mirror.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            dict: The payees, keyed by payee ID.
+        """
+        return self.get(table="payees", budget_id=budget_id)
+
+    def get_categories(
+        self, budget_id: str = "last-used", category_group_id: str = None
+    ):
+        """
+        Reads the category groups of a budget, with their categories, from the mirror.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            category_group_id (str, optional): Only return this category group. Defaults to None.
+
+        Returns:
+            dict: The category groups, keyed by category group ID, like `Api.get_categories`.
+        """
+        category_groups = self.get(
+            table="category_groups", budget_id=budget_id, id=category_group_id
+        )
+        categories = self.get(
+            table="categories",
+            budget_id=budget_id,
+            category_group_id=category_group_id,
+        )
+        for category in categories.values():
+            if category.category_group_id in category_groups:
+                category_group = category_groups[category.category_group_id]
+                category_group.categories[category.id] = category
+        return category_groups
+
+    def get_months(self, budget_id: str = "last-used"):
+        """
+        Reads the months of a budget from the mirror.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            dict: The months, keyed by "YYYY - Month" like `Api.get_months`.
+        """
+        months = utils._dict()
+        for month in self.get(table="months", budget_id=budget_id).values():
+            month.month = datetime.fromisoformat(str(month.month))
+            months[f"{month.month.strftime('%Y')} - {month.month.strftime('%B')}"] = (
+                month
+            )
+        return months
+
+    def get_transactions(
+        self,
+        budget_id: str = "last-used",
+        account_id: str = None,
+        category_id: str = None,
+        payee_id: str = None,
+        since_date: str = None,
+    ):
+        """
+        Reads the transactions of a budget from the mirror.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            account_id (str, optional): Only return transactions of this account. Defaults to None.
+            category_id (str, optional): Only return transactions of this category. Defaults to None.
+            payee_id (str, optional): Only return transactions of this payee. Defaults to None.
+            since_date (str, optional): Only return transactions on or after this date ("YYYY-MM-DD"). Defaults to None.
+
+        Returns:
+            dict: The transactions, keyed by transaction ID.
+        """
+        return self.get(
+            table="transactions",
+            budget_id=budget_id,
+            account_id=account_id,
+            category_id=category_id,
+            payee_id=payee_id,
+            since_date=since_date,
+        )
+
+    def get_scheduled_transactions(self, budget_id: str = "last-used"):
+        """
+        Reads the scheduled transactions of a budget from the mirror.
+
+        Args:
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            dict: The scheduled transactions, keyed by scheduled transaction ID.
+        """
+        return self.get(table="scheduled_transactions", budget_id=budget_id)
@@ -0,0 +1,357 @@
+from collections import deque
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import gzip
+import io
+import json
+import os
+import requests
+import requests.structures
+import threading
+
+# Replaces the bearer token wherever it appears in a cassette
+SCRUBBED = "<scrubbed>"
+
+# Response headers left out of cassettes; bodies are recorded decoded
+UNRECORDED_HEADERS = {
+    "set-cookie",
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+}
+
+
+class Transport:
+    """
+    Sends single HTTP requests on behalf of `http_utils`.
+
+    Every attempt of every request goes through the transport of its Pynab
+    instance, below retries, rate limiting, coalescing and caching, so a
+    transport only has to turn a request into a `requests.Response`.
+    Subclasses implement `send` and, if they hold resources, `close`.
+    """
+
+    def send(
+        self,
+        method: str = "GET",
+        url: str = None,
+        json: dict = None,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        """
+        Sends a request.
+
+        Args:
+            method (str, optional): The HTTP method. Defaults to "GET".
+            url (str): The absolute URL.
+            json (dict, optional): The JSON data to include in the request body. Defaults to None.
+            headers (dict, optional): The request headers, including the Authorization header. Defaults to None.
+            timeout (float or tuple, optional): The request timeout in seconds, or a `(connect, read)` tuple. Defaults to None.
+            stream (bool, optional): Whether the body is left unread, to be consumed incrementally. Defaults to False.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            requests.RequestException: If the request fails to connect or times out.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Releases the resources held by the transport.
+
+        Returns:
+            None
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SessionTransport(Transport):
+    """
+    Sends requests over a pooled `requests.Session`; the default transport.
+
+    Attributes:
+        session (requests.Session): The session the requests are sent over.
+    """
+
+    def __init__(self, session: requests.Session = None):
+        """
+        Initializes a new instance of the SessionTransport class.
+
+        Args:
+            session (requests.Session, optional): The session to send requests over. Defaults to None (a new `requests.Session`).
+        """
+        self.session = session if session is not None else requests.Session()
+
+    def send(
+        self,
+        method: str = "GET",
+        url: str = None,
+        json: dict = None,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        return self.session.request(
+            method, url, json=json, headers=headers, timeout=timeout, stream=stream
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class Cassette:
+    """
+    A gzip-compressed JSON file of recorded request/response pairs.
+
+    Each interaction holds the request method, the URL path and query, the
+    JSON request body, and the response status, headers and body. Request
+    headers are not recorded, and the bearer token is replaced by
+    `SCRUBBED` wherever else it appears, so cassettes can be shared.
+
+    Attributes:
+        path (str): The path of the cassette file.
+        interactions (list): The recorded interactions, oldest first.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Initializes a new instance of the Cassette class.
+
+        Args:
+            path (str): The path of the cassette file, read if it exists.
+        """
+        self.path = path
+        self.interactions = []
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                self.interactions = json.load(file)["interactions"]
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def target(url: str = None):
+        """
+        Returns the part of a URL interactions are matched on.
+
+        The scheme and host are left out, so a cassette recorded against the
+        YNAB API replays under any `api_url` with the same path.
+
+        Args:
+            url (str): The absolute URL.
+
+        Returns:
+            str: The path and query string, e.g. "/v1/budgets?include_accounts=true".
+        """
+        parts = urlsplit(url)
+        return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+    def save(self):
+        """
+        Writes the interactions to the cassette file.
+
+        Returns:
+            None
+        """
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            json.dump({"version": 1, "interactions": self.interactions}, file)
+
+    def __len__(self):
+        return len(self.interactions)
+
+
+class RecordingTransport(Transport):
+    """
+    Records the requests sent by another transport into a `Cassette`.
+
+    Responses are read in full before they are returned, so streamed requests
+    are recorded too but no longer stream. The cassette is written when the
+    transport is closed, or on `save`.
+
+    Attributes:
+        cassette (Cassette): The cassette being recorded.
+        transport (Transport): The transport actually sending the requests.
+    """
+
+    def __init__(self, path: str = None, transport: Transport = None):
+        """
+        Initializes a new instance of the RecordingTransport class.
+
+        Args:
+            path (str): The path of the cassette file. Interactions already in it are kept.
+            transport (Transport, optional): The transport sending the requests. Defaults to None (a `SessionTransport`).
+        """
+        self.cassette = Cassette(path=path)
+        self.transport = transport if transport is not None else SessionTransport()
+        self._lock = threading.Lock()
+
+    def send(
+        self,
+        method: str = "GET",
+        url: str = None,
+        json: dict = None,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        response = self.transport.send(
+            method, url, json=json, headers=headers, timeout=timeout, stream=stream
+        )
+        token = self._token(headers)
+
+        def scrub(text):
+            return text.replace(token, SCRUBBED) if token and text else text
+
+        interaction = {
+            "request": {
+                "method": method,
+                "target": scrub(Cassette.target(url)),
+                "json": self._scrub_json(json, scrub),
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: scrub(value)
+                    for name, value in response.headers.items()
+                    if name.lower() not in UNRECORDED_HEADERS
+                },
+                "body": scrub(response.content.decode("utf-8", "replace")),
+            },
+        }
+        with self._lock:
+            self.cassette.interactions.append(interaction)
+        return response
+
+    @staticmethod
+    def _token(headers: dict = None):
+        """
+        Returns the bearer token of a request.
+
+        Args:
+            headers (dict): The request headers.
+
+        Returns:
+            str: The token, or None if the request has none.
+        """
+        authorization = (headers or {}).get("Authorization", "")
+        token = authorization[len("Bearer ") :].strip()
+        return token if token and token != "None" else None
+
+    @staticmethod
+    def _scrub_json(value=None, scrub=None):
+        """
+        Scrubs the bearer token from the strings of a JSON value.
+
+        Args:
+            value: The JSON value.
+            scrub (callable): Scrubs a single string.
+
+        Returns:
+            The scrubbed copy of the value.
+        """
+        if isinstance(value, str):
+            return scrub(value)
+        if isinstance(value, dict):
+            return {
+                k: RecordingTransport._scrub_json(v, scrub) for k, v in value.items()
+            }
+        if isinstance(value, list):
+            return [RecordingTransport._scrub_json(v, scrub) for v in value]
+        return value
+
+    def save(self):
+        """
+        Writes the recorded interactions to the cassette file.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.cassette.save()
+
+    def close(self):
+        self.save()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests from a `Cassette` without touching the network.
+
+    A request is matched on its method, URL path and query, and JSON body;
+    if no recorded request has the same body, the first with the same method
+    and URL is used. Repeated requests are answered with the recorded
+    responses in order, and the last one is served again once they run out.
+
+    Attributes:
+        cassette (Cassette): The cassette being replayed.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Initializes a new instance of the ReplayTransport class.
+
+        Args:
+            path (str): The path of the cassette file.
+
+        Raises:
+            FileNotFoundError: If the cassette file does not exist.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No cassette at {path}")
+        self.cassette = Cassette(path=path)
+        self._lock = threading.Lock()
+        # Recorded responses, keyed by (method, target, body) and by (method, target)
+        self._responses = {}
+        for interaction in self.cassette.interactions:
+            request = interaction["request"]
+            key = (request["method"], request["target"])
+            body = self._body_key(request["json"])
+            self._responses.setdefault(key + (body,), deque()).append(
+                interaction["response"]
+            )
+            self._responses.setdefault(key, deque()).append(interaction["response"])
+
+    @staticmethod
+    def _body_key(json_body=None):
+        return json.dumps(json_body, sort_keys=True)
+
+    def send(
+        self,
+        method: str = "GET",
+        url: str = None,
+        json: dict = None,
+        headers: dict = None,
+        timeout: float = None,
+        stream: bool = False,
+    ):
+        key = (method, Cassette.target(url))
+        with self._lock:
+            responses = self._responses.get(
+                key + (self._body_key(json),)
+            ) or self._responses.get(key)
+            if not responses:
+                raise LookupError(f"No recorded response for {method} {url}")
+            recorded = responses.popleft() if len(responses) > 1 else responses[0]
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = requests.structures.CaseInsensitiveDict(recorded["headers"])
+        response._content = recorded["body"].encode("utf-8")
+        response._content_consumed = True
+        response.raw = io.BytesIO(response._content)
+        response.encoding = "utf-8"
+        response.url = url
+        response.elapsed = timedelta(0)
+        return response
@@ -1,10 +1,22 @@
+from concurrent.futures import Future
 from datetime import datetime, date
+from dateutil.parser import isoparse
 from enum import Enum
+from functools import lru_cache
+from itertools import islice
 from pynab import pynab
+from pynab.instrumentation import RequestEvent
+from pynab.retry import Attempt
+import pynab.constants as constants
 
+import codecs
 import json
 import requests
+import requests.adapters
 import logging
+import re
+import threading
+import time
 
 
 class http_utils:
@@ -17,27 +29,346 @@ class http_utils:
         """
         self.pynab = pynab
 
-    def get(self, endpoint: str = None):
+    @staticmethod
+    def create_session(
+        pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False
+    ):
         """
-        Sends a GET request to the specified endpoint.
+        Creates a `requests.Session` backed by a keep-alive connection pool.
 
         Args:
+            pool_connections (int, optional): The number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of connections kept alive per host. Defaults to 10.
+            pool_block (bool, optional): Whether to block when no pooled connection is free. Defaults to False.
+
+        Returns:
+            requests.Session: The pooled session.
+        """
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(
+        self,
+        method: str = "GET",
+        endpoint: str = None,
+        json: dict = None,
+        retry: bool = None,
+        stream: bool = False,
+    ):
+        """
+        Sends a request to the specified endpoint over the pooled session.
+
+        Transient failures are retried according to `pynab.retry_policy`. The
+        timing of every attempt is recorded on the returned response as
+        `response.attempts`, a list of `pynab.retry.Attempt`. If
+        `pynab.instrumentation` is set, the request is passed to its hooks as a
+        `RequestEvent` and counted in its histograms.
+
+        Args:
+            method (str, optional): The HTTP method. Defaults to "GET".
             endpoint (str, optional): The endpoint to send the request to. Defaults to None.
+            json (dict, optional): The JSON data to include in the request body. Defaults to None.
+            retry (bool, optional): True to retry even a non-idempotent request, False to never retry it. Defaults to None (follow the policy).
+            stream (bool, optional): Whether the body is left unread, to be consumed incrementally. Defaults to False.
 
         Returns:
-            Response: The response object returned by the GET request.
+            Response: The response object returned by the server.
+
+        Raises:
+            requests.RequestException: If the final attempt fails to connect or times out.
         """
         url = f"{self.pynab.api_url}{endpoint}"
-        logging.debug(f"GET {url}")
-        response = requests.get(url, headers=self.pynab._headers)
-        if "x-rate-limit" in response.headers:
-            self.pynab._requests_remaining = int(
-                response.headers["x-rate-limit"].split("/")[1]
-            ) - int(response.headers["x-rate-limit"].split("/")[0])
+        if json is None:
+            logging.debug(f"{method} {url}")
         else:
-            self.pynab._requests_remaining -= 1
+            logging.debug(f"{method} {url}\n{json}")
+
+        instrumentation = self.pynab.instrumentation
+        if instrumentation is None:
+            return self._attempt(method, url, json, retry, stream)
+
+        event = RequestEvent(method=method, endpoint=endpoint)
+        instrumentation.started(event)
+        start = time.perf_counter()
+        try:
+            response = self._attempt(method, url, json, retry, stream)
+            event.retries = len(response.attempts) - 1
+            event.status_code = response.status_code
+            event.ttfb = response.elapsed.total_seconds()
+            if not stream:
+                event.bytes = len(response.content)
+                self._time_json(response, event)
+            elif "Content-Length" in response.headers:
+                event.bytes = int(response.headers["Content-Length"])
+            return response
+        except Exception as error:
+            # Every started request is finished, whatever it raised
+            attempts = getattr(error, "attempts", None)
+            if attempts:
+                event.retries = len(attempts) - 1
+            event.error = error
+            raise
+        finally:
+            event.total = time.perf_counter() - start
+            instrumentation.finished(event)
+
+    def _attempt(
+        self,
+        method: str = "GET",
+        url: str = None,
+        json: dict = None,
+        retry: bool = None,
+        stream: bool = False,
+    ):
+        """
+        Sends a request, retrying transient failures according to `pynab.retry_policy`.
+
+        Args:
+            method (str, optional): The HTTP method. Defaults to "GET".
+            url (str): The absolute URL.
+            json (dict, optional): The JSON data to include in the request body. Defaults to None.
+            retry (bool, optional): True to retry even a non-idempotent request, False to never retry it. Defaults to None (follow the policy).
+            stream (bool, optional): Whether the body is left unread. Defaults to False.
+
+        Returns:
+            Response: The final response, with the timing of every attempt as `response.attempts`.
+
+        Raises:
+            requests.RequestException: If the final attempt fails to connect or times out.
+        """
+        retry_policy = self.pynab.retry_policy
+        attempts = []
+        while True:
+            attempt = Attempt(number=len(attempts) + 1)
+            attempts.append(attempt)
+            start = time.perf_counter()
+            try:
+                response = self._send(method, url, json, stream)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                attempt.elapsed = time.perf_counter() - start
+                attempt.error = error
+                error.attempts = attempts
+                if retry_policy is None or not retry_policy.should_retry(
+                    method, None, attempt.number, retry
+                ):
+                    raise
+                attempt.delay = retry_policy.delay(attempt.number)
+                outcome = type(error).__name__
+            else:
+                attempt.elapsed = time.perf_counter() - start
+                attempt.status_code = response.status_code
+                response.attempts = attempts
+                if retry_policy is None or not retry_policy.should_retry(
+                    method, response.status_code, attempt.number, retry
+                ):
+                    return response
+                attempt.delay = retry_policy.delay(attempt.number, response)
+                outcome = response.status_code
+                response.close()
+            logging.warning(
+                f"{method} {url} attempt {attempt.number} failed ({outcome}), "
+                f"retrying in {attempt.delay:.2f}s"
+            )
+            time.sleep(attempt.delay)
+
+    def _time_json(self, response: requests.Response = None, event=None):
+        """
+        Wraps `response.json()` so the time spent decoding is recorded by `pynab.instrumentation`.
+
+        Args:
+            response (requests.Response): The response whose JSON is decoded.
+            event (RequestEvent): The request of the response.
+
+        Returns:
+            None
+        """
+        instrumentation = self.pynab.instrumentation
+        parse = response.json
+
+        def json(**kwargs):
+            start = time.perf_counter()
+            try:
+                return parse(**kwargs)
+            finally:
+                instrumentation.decoded(
+                    event.method, event.template, time.perf_counter() - start
+                )
+
+        response.json = json
+
+    def _send(self, method: str, url: str, json: dict = None, stream: bool = False):
+        """
+        Sends a single attempt of a request through `pynab.transport`, keeping the rate limit bookkeeping up to date.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            json (dict, optional): The JSON data to include in the request body. Defaults to None.
+            stream (bool, optional): Whether the body is left unread. Defaults to False.
+
+        Returns:
+            Response: The response object returned by the server.
+        """
+        rate_limiter = self.pynab.rate_limiter
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        response = self.pynab.transport.send(
+            method,
+            url,
+            json=json,
+            headers=self.pynab._headers,
+            timeout=self.pynab._timeout,
+            stream=stream,
+        )
+        with self.pynab._state_lock:
+            if "x-rate-limit" in response.headers:
+                self.pynab._requests_remaining = int(
+                    response.headers["x-rate-limit"].split("/")[1]
+                ) - int(response.headers["x-rate-limit"].split("/")[0])
+            elif self.pynab._requests_remaining:
+                self.pynab._requests_remaining -= 1
+        if "x-rate-limit" in response.headers and rate_limiter is not None:
+            rate_limiter.update_from_header(response.headers["x-rate-limit"])
+        if response.status_code == 429 and rate_limiter is not None:
+            rate_limiter.exhaust()
         return response
 
+    def get(self, endpoint: str = None, stream: bool = False):
+        """
+        Sends a GET request to the specified endpoint.
+
+        If `pynab.cache` is set, cached responses are returned without
+        contacting the API, and fresh ones are added to it. Unless
+        `pynab.coalesce_requests` is disabled, concurrent identical GETs
+        are coalesced: the first caller sends the request and the others wait
+        for it and receive the same response, whose parsed JSON is shared.
+        Streamed GETs are never coalesced, since their body can only be read
+        once.
+
+        Args:
+            endpoint (str, optional): The endpoint to send the request to. Defaults to None.
+            stream (bool, optional): Whether the body is left unread, to be consumed incrementally. Defaults to False.
+
+        Returns:
+            Response: The response object returned by the GET request.
+        """
+        instrumentation = self.pynab.instrumentation
+        if instrumentation is None:
+            return self._get(endpoint=endpoint, stream=stream)
+        with instrumentation.waiting():
+            return self._get(endpoint=endpoint, stream=stream)
+
+    def _get(self, endpoint: str = None, stream: bool = False):
+        """
+        Sends a GET request through the cache and request coalescing; see `get`.
+
+        Args:
+            endpoint (str, optional): The endpoint to send the request to. Defaults to None.
+            stream (bool, optional): Whether the body is left unread. Defaults to False.
+
+        Returns:
+            Response: The response object returned by the GET request.
+        """
+        if stream:
+            return self.request("GET", endpoint=endpoint, stream=stream)
+
+        cache = self.pynab.cache
+        if cache is not None:
+            response = cache.get(endpoint)
+            if response is not None:
+                logging.debug(f"GET {self.pynab.api_url}{endpoint} served from cache")
+                return response
+            generation = cache.generation
+
+        if not self.pynab.coalesce_requests:
+            response = self.request("GET", endpoint=endpoint)
+            if cache is not None:
+                self._share_json(response)
+                cache.put(endpoint, response, generation)
+            return response
+
+        key = f"{self.pynab.api_url}{endpoint}"
+        with self.pynab._in_flight_lock:
+            flight = self.pynab._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.pynab._in_flight[key] = Future()
+
+        if not leader:
+            logging.debug(f"GET {key} joined the request in flight")
+            return flight.result()
+
+        try:
+            response = self.request("GET", endpoint=endpoint)
+            self._share_json(response)
+            if cache is not None:
+                cache.put(endpoint, response, generation)
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        else:
+            flight.set_result(response)
+            return response
+        finally:
+            with self.pynab._in_flight_lock:
+                del self.pynab._in_flight[key]
+
+    @staticmethod
+    def _share_json(response: requests.Response = None):
+        """
+        Memoizes `response.json()`, so callers sharing a response parse its body once.
+
+        Args:
+            response (requests.Response): The response to memoize.
+
+        Returns:
+            None
+        """
+        parse = response.json
+        lock = threading.Lock()
+        parsed = []
+
+        def json(**kwargs):
+            with lock:
+                if not parsed:
+                    parsed.append(parse(**kwargs))
+            return parsed[0]
+
+        response.json = json
+
+    def _write(self, method: str = "POST", endpoint: str = None, json: dict = None):
+        """
+        Sends a write request and invalidates the cached responses of its budget.
+
+        The cache is invalidated once the write has completed, or failed, so
+        neither a response cached before it nor one fetched while it was in
+        flight is served afterwards.
+
+        Args:
+            method (str, optional): The HTTP method. Defaults to "POST".
+            endpoint (str, optional): The endpoint to send the request to. Defaults to None.
+            json (dict, optional): The JSON data to include in the request body. Defaults to None.
+
+        Returns:
+            Response: The response object returned by the server.
+        """
+        instrumentation = self.pynab.instrumentation
+        try:
+            if instrumentation is None:
+                return self.request(method, endpoint=endpoint, json=json)
+            with instrumentation.waiting():
+                return self.request(method, endpoint=endpoint, json=json)
+        finally:
+            if self.pynab.cache is not None:
+                self.pynab.cache.invalidate(endpoint)
+
     def post(self, endpoint: str = None, json: dict = {}):
         """
         Sends a POST request to the specified endpoint with the provided JSON data.
@@ -49,16 +380,7 @@ class http_utils:
         Returns:
             Response: The response object received from the server.
         """
-        url = f"{self.pynab.api_url}{endpoint}"
-        logging.debug(f"POST {url}\n{json}")
-        response = requests.post(url, json=json, headers=self.pynab._headers)
-        if "x-rate-limit" in response.headers:
-            self.pynab._requests_remaining = int(
-                response.headers["x-rate-limit"].split("/")[1]
-            ) - int(response.headers["x-rate-limit"].split("/")[0])
-        else:
-            self.pynab._requests_remaining -= 1
-        return response
+        return self._write("POST", endpoint=endpoint, json=json)
 
     def patch(self, endpoint: str = None, json: dict = {}):
         """
@@ -71,16 +393,7 @@ class http_utils:
         Returns:
             Response: The response object returned by the PATCH request.
         """
-        url = f"{self.pynab.api_url}{endpoint}"
-        logging.debug(f"PATCH {url}\n{json}")
-        response = requests.patch(url, json=json, headers=self.pynab._headers)
-        if "x-rate-limit" in response.headers:
-            self.pynab._requests_remaining = int(
-                response.headers["x-rate-limit"].split("/")[1]
-            ) - int(response.headers["x-rate-limit"].split("/")[0])
-        else:
-            self.pynab._requests_remaining -= 1
-        return response
+        return self._write("PATCH", endpoint=endpoint, json=json)
 
     def put(self, endpoint: str = None, json: dict = {}):
         """
@@ -93,16 +406,7 @@ class http_utils:
         Returns:
             Response: The response object returned by the server.
         """
-        url = f"{self.pynab.api_url}{endpoint}"
-        logging.debug(f"PUT {url}\n{json}")
-        response = requests.put(url, json=json, headers=self.pynab._headers)
-        if "x-rate-limit" in response.headers:
-            self.pynab._requests_remaining = int(
-                response.headers["x-rate-limit"].split("/")[1]
-            ) - int(response.headers["x-rate-limit"].split("/")[0])
-        else:
-            self.pynab._requests_remaining -= 1
-        return response
+        return self._write("PUT", endpoint=endpoint, json=json)
 
     def delete(self, endpoint: str = None):
         """
@@ -114,16 +418,7 @@ class http_utils:
         Returns:
             requests.Response: The response object returned by the DELETE request.
         """
-        url = f"{self.pynab.api_url}{endpoint}"
-        logging.info(f"DELETE {url}\n{json}")
-        response = requests.delete(url, headers=self.pynab._headers)
-        if "x-rate-limit" in response.headers:
-            self.pynab._requests_remaining = int(
-                response.headers["x-rate-limit"].split("/")[1]
-            ) - int(response.headers["x-rate-limit"].split("/")[0])
-        else:
-            self.pynab._requests_remaining -= 1
-        return response
+        return self._write("DELETE", endpoint=endpoint)
 
 
 class CustomJsonEncoder(json.JSONEncoder):
@@ -157,15 +452,178 @@ class _dict(dict):
     This class extends the built-in `dict` class and adds a `by` method
     for filtering the dictionary items based on a specific field and value.
 
+    Lookups through `by` are served from hash indexes that are built lazily,
+    the first time a field is queried, and kept up to date as items are
+    inserted, replaced and removed. Indexes record the value an item had when
+    it was inserted. Schema fields that the relationship properties look up,
+    e.g. `Transaction.category_id`, report in-place changes through `edited`,
+    which makes every index of that field rebuild on its next lookup; after
+    changing any other attribute of an item in place, call `reindex` (or
+    re-insert the item) so lookups see the new value.
+
     Attributes:
         None
 
     Methods:
         by(field: str = "", value: object = None, first: bool = True) -> Union[object, _dict]:
             Filters the dictionary items based on the specified field and value.
+        merge(delta: _dict) -> _dict:
+            Upserts the items of a delta and drops the ones marked as deleted.
+        reindex(field: str = None) -> None:
+            Drops the index of a field, or of every field, so it is rebuilt on the next lookup.
+        edited(field: str = "") -> None:
+            Records that a field was changed in place, so its indexes are rebuilt.
 
     """
 
+    __slots__ = ("_indexes", "_edits_seen")
+
+    # Sentinel for items whose field value cannot be hashed
+    _UNHASHABLE = object()
+
+    # The number of in-place changes reported by `edited`, keyed by field
+    _edits = {}
+
+    # Serializes index builds and merges, which iterate or rewrite a whole
+    # collection, across the threads sharing a Pynab instance
+    _lock = threading.RLock()
+
+    @staticmethod
+    def edited(field: str = ""):
+        """
+        Records that a field was changed in place on an item of some `_dict`.
+
+        Every index of the field that was built before the change is rebuilt
+        on its next lookup.
+
+        Args:
+            field (str): The name of the field.
+
+        Returns:
+            None
+        """
+        _dict._edits[field] = _dict._edits.get(field, 0) + 1
+
+    def _fresh_index(self, field: str = ""):
+        """
+        Returns the index of a field if it was built after the last in-place change of the field.
+
+        Args:
+            field (str): The name of the field.
+
+        Returns:
+            dict: The index, or None if it has to be (re)built.
+        """
+        index = getattr(self, "_indexes", {}).get(field)
+        if index is None or self._edits_seen[field] != _dict._edits.get(field, 0):
+            return None
+        return index
+
+    def _index_value(self, item: object = None, field: str = ""):
+        value = getattr(item, field, None)
+        try:
+            hash(value)
+        except TypeError:
+            return self._UNHASHABLE
+        return value
+
+    def _index(self, field: str = ""):
+        """
+        Returns the index of a field, building it if needed.
+
+        Args:
+            field (str): The name of the field.
+
+        Returns:
+            dict: The keys of the items, grouped by their value of `field`.
+        """
+        index = self._fresh_index(field)
+        if index is None:
+            with _dict._lock:
+                try:
+                    indexes, edits_seen = self._indexes, self._edits_seen
+                except AttributeError:
+                    indexes, edits_seen = self._indexes, self._edits_seen = {}, {}
+                edits_seen[field] = _dict._edits.get(field, 0)
+                index = {}
+                for k, v in self.items():
+                    index.setdefault(self._index_value(v, field), {})[k] = None
+                indexes[field] = index
+        return index
+
+    def _index_add(self, key: object = None, item: object = None):
+        for field, index in getattr(self, "_indexes", {}).items():
+            index.setdefault(self._index_value(item, field), {})[key] = None
+
+    def _index_remove(self, key: object = None, item: object = None):
+        for field, index in getattr(self, "_indexes", {}).items():
+            value = self._index_value(item, field)
+            keys = index.get(value)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del index[value]
+
+    def __setitem__(self, key, item):
+        if getattr(self, "_indexes", None):
+            if key in self:
+                # Replacing an item moves it in its buckets; dropping the
+                # indexes keeps `by` results in dictionary order.
+                self.reindex()
+            else:
+                self._index_add(key, item)
+        super().__setitem__(key, item)
+
+    def __delitem__(self, key):
+        item = self[key]
+        super().__delitem__(key)
+        self._index_remove(key, item)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        item = super().pop(key)
+        self._index_remove(key, item)
+        return item
+
+    def popitem(self):
+        key, item = super().popitem()
+        self._index_remove(key, item)
+        return key, item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, item in dict(*args, **kwargs).items():
+            self[key] = item
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    def reindex(self, field: str = None):
+        """
+        Drops the index of a field so it is rebuilt on the next lookup.
+
+        Args:
+            field (str, optional): The name of the field, or None to drop every index. Defaults to None.
+
+        Returns:
+            None
+        """
+        indexes = getattr(self, "_indexes", {})
+        if field is None:
+            indexes.clear()
+        else:
+            indexes.pop(field, None)
+
     def by(self, field: str = "", value: object = None, first: bool = True):
         """
         Filters the dictionary items based on the specified field and value.
@@ -179,11 +637,343 @@ class _dict(dict):
             Union[object, _dict]: If `first` is True, returns the first matching item. If `first` is False, returns a new `_dict` object with all matching items.
 
         """
-        items = _dict()
+        try:
+            keys = self._index(field).get(value, ())
+        except TypeError:
+            keys = self._scan(field=field, value=value)
+
+        if first:
+            keys = list(islice(keys, 1))
+        try:
+            items = _dict((k, self[k]) for k in keys)
+        except KeyError:
+            items = None
+        if items is None or any(
+            getattr(v, field, None) is not value and getattr(v, field, None) != value
+            for v in items.values()
+        ):
+            # An item was changed in place; drop the index, so it is rebuilt
+            # next time, and scan instead. Values that are not equal to
+            # themselves (NaN) are matched by identity, like dict keys.
+            self.reindex(field)
+            keys = self._scan(field=field, value=value)
+            if first:
+                keys = keys[:1]
+            items = _dict((k, self[k]) for k in keys)
+
+        if first:
+            return next(iter(items.values()), _dict())
+        return items
+
+    def _scan(self, field: str = "", value: object = None):
+        """
+        Returns the keys of the items matching a value, without an index.
+
+        Args:
+            field (str): The name of the field.
+            value (object): The value to match.
+
+        Returns:
+            list: The matching keys, in dictionary order.
+        """
+        keys = []
         for k, v in self.items():
-            if getattr(v, field, None) == value:
-                if first:
-                    return v
+            current = getattr(v, field, None)
+            if current is value or current == value:
+                keys.append(k)
+        return keys
+
+    def merge(self, delta: dict = None, full: bool = False):
+        """
+        Merges a delta response into the dictionary in place.
+
+        Items of the delta replace the items with the same key, and items whose
+        `deleted` attribute is True are removed. Items that have a `merge`
+        method of their own, like category groups, are merged into in place
+        instead, since a delta only lists the nested entities that changed.
+
+        Args:
+            delta (dict): The items returned by a delta request.
+            full (bool, optional): Whether `delta` is a full response, so items it leaves out were deleted and are removed as well. Defaults to False.
+
+        Returns:
+            _dict: The dictionary itself.
+        """
+        with _dict._lock:
+            if full:
+                for k in [k for k in self if k not in delta]:
+                    del self[k]
+            for k, v in delta.items():
+                if getattr(v, "deleted", False):
+                    self.pop(k, None)
+                elif hasattr(self.get(k), "merge"):
+                    self[k] = self[k].merge(v, full=full)
                 else:
-                    items[k] = v
-        return items
+                    self[k] = v
+        return self
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str = None):
+    """
+    Parses an RFC 3339 / ISO 8601 timestamp as returned by the API.
+
+    The fixed shapes the API uses are parsed with `datetime.fromisoformat`;
+    anything else falls back to `dateutil.parser.isoparse`. Results are
+    memoized, since the same timestamps recur across a budget.
+
+    Args:
+        value (str, optional): The timestamp. Defaults to `constants.EPOCH` when empty.
+
+    Returns:
+        datetime: The parsed timestamp.
+    """
+    value = value or constants.EPOCH
+    try:
+        if value.endswith("Z"):
+            return datetime.fromisoformat(value[:-1] + "+00:00")
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return isoparse(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str = None):
+    """
+    Parses a `YYYY-MM-DD` date, or the date part of a timestamp, as returned by the API.
+
+    Plain dates are parsed with `date.fromisoformat`; anything else goes
+    through `parse_datetime`. Results are memoized, since the same days and
+    months recur across thousands of transactions.
+
+    Args:
+        value (str, optional): The date. Defaults to `constants.EPOCH` when empty.
+
+    Returns:
+        date: The parsed date.
+    """
+    value = value or constants.EPOCH
+    if len(value) == 10:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return parse_datetime(value).date()
+
+
+class JsonStream:
+    """
+    An incremental reader for one array nested inside a streamed JSON document.
+
+    The document is decoded from an iterable of byte chunks, and only the
+    elements of the array found at `path` (e.g. `("data", "transactions")`)
+    are decoded and yielded, one at a time. Consumed text is discarded as it
+    goes, so memory stays proportional to the largest element rather than to
+    the whole document. Values outside the path are skipped by a scanner
+    that only tracks strings and brackets, without being decoded, and every
+    value is scanned once, however many chunks it spans.
+
+    Attributes:
+        path (tuple): The keys leading to the array, from the top-level object.
+    """
+
+    _whitespace = " \t\n\r"
+    # The characters that end a string, that matter inside an array or
+    # object, and that end a number or literal
+    _string_end = re.compile(r'["\\]')
+    _structural = re.compile(r'["\[\]{}]')
+    _scalar_end = re.compile(r"[\s,:\]}]")
+
+    def __init__(self, chunks=None, path: tuple = ("data",)):
+        """
+        Initializes a new instance of the JsonStream class.
+
+        Args:
+            chunks (Iterable[bytes], optional): The UTF-8 encoded document, in chunks. Defaults to None.
+            path (tuple, optional): The keys leading to the array. Defaults to ("data",).
+        """
+        self.path = path
+
+        self._chunks = iter(chunks or ())
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self):
+        """
+        Appends the next chunk to the buffer, dropping the consumed text.
+
+        Returns:
+            bool: False if the stream is exhausted.
+        """
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """
+        Skips whitespace and returns the next character without consuming it.
+
+        Returns:
+            str: The next character, or "" at the end of the stream.
+        """
+        while True:
+            while (
+                self._pos < len(self._buffer)
+                and self._buffer[self._pos] in self._whitespace
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def _expect(self, characters: str):
+        character = self._peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(
+                f"Expecting one of {characters!r}", self._buffer, self._pos
+            )
+        self._pos += 1
+        return character
+
+    def _end(self):
+        """
+        Finds the end of the next JSON value, reading more chunks as needed.
+
+        The value is scanned without being decoded, resuming where the
+        previous chunk left off. A number or literal only ends once a
+        character follows it (or the stream ends), so values split across
+        chunks are not cut short.
+
+        Returns:
+            int: The position in the buffer just past the value.
+
+        Raises:
+            json.JSONDecodeError: If the stream ends before the value does.
+        """
+        if not self._peek():
+            raise json.JSONDecodeError("Expecting value", self._buffer, self._pos)
+        # Scan positions are kept relative to `_pos`, which `_read` rebases
+        offset = 0
+        depth = 0
+        in_string = False
+        scalar = self._buffer[self._pos] not in '"[{'
+        while True:
+            buffer = self._buffer
+            i = self._pos + offset
+            while True:
+                if in_string:
+                    match = self._string_end.search(buffer, i)
+                elif scalar:
+                    match = self._scalar_end.search(buffer, i)
+                else:
+                    match = self._structural.search(buffer, i)
+                if match is None:
+                    i = len(buffer)
+                    break
+                i = match.start()
+                character = buffer[i]
+                if scalar:
+                    return i
+                if in_string:
+                    if character == "\\":
+                        if i + 1 == len(buffer):
+                            break
+                        i += 2
+                        continue
+                    in_string = False
+                    i += 1
+                    if depth == 0:
+                        return i
+                elif character == '"':
+                    in_string = True
+                    i += 1
+                elif character in "[{":
+                    depth += 1
+                    i += 1
+                else:
+                    depth -= 1
+                    i += 1
+                    if depth == 0:
+                        return i
+            offset = i - self._pos
+            if not self._read():
+                if scalar:
+                    return len(self._buffer)
+                raise json.JSONDecodeError(
+                    "Unterminated value", self._buffer, self._pos
+                )
+
+    def _value(self):
+        """
+        Decodes the next complete JSON value, reading more chunks as needed.
+
+        The value is decoded once, after `_end` has found all of it.
+
+        Returns:
+            object: The decoded value.
+        """
+        self._end()
+        value, self._pos = self._json.raw_decode(self._buffer, self._pos)
+        return value
+
+    def _skip(self):
+        """
+        Skips the next JSON value without decoding it.
+
+        Returns:
+            None
+        """
+        self._pos = self._end()
+
+    def _find(self, path: tuple):
+        """
+        Advances to the start of the value at `path` inside the current object.
+
+        Returns:
+            bool: True if the value was found, False if the object ended first.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return False
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == path[0]:
+                if len(path) == 1:
+                    return True
+                if self._peek() == "{":
+                    return self._find(path[1:])
+            self._skip()
+            if self._expect(",}") == "}":
+                return False
+
+    def __iter__(self):
+        """
+        Yields the elements of the array at `path`.
+
+        Yields:
+            object: The decoded elements, in document order.
+        """
+        if not self._find(self.path) or self._peek() == "n":
+            return
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
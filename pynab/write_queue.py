@@ -0,0 +1,553 @@
+from concurrent.futures import Future
+from pynab import constants
+import pynab.schemas as schemas
+
+import logging
+import threading
+import time
+
+
+class _PendingUpdate:
+    """
+    The merged, not yet sent updates of one transaction.
+
+    Fields are merged in queue order: the `changes()` of the transaction
+    object take effect where it was last queued, so they win over fields
+    queued explicitly before it and lose to the ones queued after it.
+
+    Attributes:
+        transaction (schemas.Transaction): The latest transaction object queued, whose `changes()` are sent.
+        changes (dict): Fields queued explicitly before the transaction object.
+        overrides (dict): Fields queued explicitly after the transaction object.
+        futures (list): The futures of every queued update of the transaction.
+        sent (dict): The `changes()` of the transaction object when the body was built, its new baseline once saved.
+    """
+
+    __slots__ = ("transaction", "changes", "overrides", "futures", "sent")
+
+    def __init__(self):
+        self.transaction = None
+        self.changes = {}
+        self.overrides = {}
+        self.futures = []
+        self.sent = {}
+
+    def queue(self, transaction: schemas.Transaction = None, changes: dict = None):
+        """
+        Merges one queued update into the pending one.
+
+        Args:
+            transaction (schemas.Transaction, optional): The changed transaction. Defaults to None.
+            changes (dict, optional): The fields to change. Defaults to None.
+
+        Returns:
+            None
+        """
+        if transaction is not None:
+            self.transaction = transaction
+            self.changes.update(self.overrides)
+            self.overrides = {}
+        if self.transaction is None:
+            self.changes.update(changes or {})
+        else:
+            self.overrides.update(changes or {})
+
+    def body(self):
+        """
+        Returns the fields to send, merged in queue order.
+
+        Returns:
+            dict: The changed fields, as the API expects them.
+        """
+        changes = dict(self.changes)
+        if self.transaction is not None:
+            self.sent = self.transaction.changes()
+            changes.update(self.sent)
+        changes.update(self.overrides)
+        return changes
+
+
+class WriteQueue:
+    """
+    A write-behind queue batching transaction mutations.
+
+    Creates, updates and deletes are queued per budget and return a
+    `concurrent.futures.Future` immediately (await it from asyncio with
+    `asyncio.wrap_future`). A background thread flushes the queue once
+    `max_batch` mutations are pending or the oldest has waited `max_delay`
+    seconds; `flush()` sends everything right away.
+
+    On flush, queued creates of a budget are sent as batched
+    `POST /budgets/{budget_id}/transactions` requests and queued updates as
+    batched `PATCH /budgets/{budget_id}/transactions` requests, each holding
+    at most `max_batch` transactions. Repeated updates of the same transaction
+    are merged into one entry. The API has no batched delete, so deletes are
+    sent one by one, after the creates and updates; a delete supersedes the
+    updates of its transaction still in the queue.
+
+    Each future resolves to the created, updated or deleted
+    `schemas.Transaction` (None for a create whose `import_id` was a
+    duplicate), or raises the error of the request that carried it.
+
+    Attributes:
+        pynab (Pynab): The Pynab instance used to send the batches.
+        max_batch (int): The number of pending mutations that triggers a flush, and the maximum size of a batch.
+        max_delay (float): The maximum number of seconds a mutation waits before it is flushed.
+    """
+
+    def __init__(
+        self,
+        pynab=None,
+        max_batch: int = constants.WRITE_BATCH_SIZE,
+        max_delay: float = constants.WRITE_DELAY,
+    ):
+        """
+        Initializes a new instance of the WriteQueue class.
+
+        Use `Pynab.write_behind` to create the queue of a Pynab instance.
+
+        Args:
+            pynab (Pynab): The Pynab instance used to send the batches.
+            max_batch (int, optional): The number of pending mutations that triggers a flush. Defaults to `constants.WRITE_BATCH_SIZE`.
+            max_delay (float, optional): The maximum number of seconds a mutation waits. Defaults to `constants.WRITE_DELAY`.
+        """
+        self.pynab = pynab
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        # Keyed by budget ID
+        self._creates = {}
+        self._updates = {}
+        self._deletes = {}
+        self._budgets = {}
+        self._pending = 0
+        self._oldest = None
+
+        self._closed = False
+        self._thread = None
+        self._condition = threading.Condition()
+        # Serializes flushes, so mutations reach the API in queue order
+        self._flush_lock = threading.Lock()
+
+    def __len__(self):
+        return self._pending
+
+    def _queue(self, budget: schemas.Budget = None, budget_id: str = "last-used"):
+        """
+        Books a new pending mutation. The caller must hold the condition.
+
+        Args:
+            budget (schemas.Budget, optional): The budget of the mutation. Defaults to None.
+            budget_id (str, optional): The ID of the budget, if `budget` is not given. Defaults to "last-used".
+
+        Returns:
+            str: The budget ID.
+
+        Raises:
+            RuntimeError: If the queue is closed.
+        """
+        if self._closed:
+            raise RuntimeError("The write queue is closed")
+        budget_id = budget.id if budget else budget_id
+        if budget is not None:
+            self._budgets[budget_id] = budget
+        self._pending += 1
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="pynab-write-queue", daemon=True
+            )
+            self._thread.start()
+        self._condition.notify()
+        return budget_id
+
+    def create(
+        self,
+        transaction=None,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+    ):
+        """
+        Queues a transaction to create.
+
+        Args:
+            transaction (Union[schemas.Transaction, dict]): The transaction, or a dictionary with the same fields.
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+
+        Returns:
+            concurrent.futures.Future: Resolves to the created transaction, or None if its import ID was a duplicate.
+        """
+        future = Future()
+        body = self.pynab.api._save_transaction(transaction)
+        with self._condition:
+            budget_id = self._queue(budget=budget, budget_id=budget_id)
+            self._creates.setdefault(budget_id, []).append((body, future, transaction))
+        return future
+
+    def update(
+        self,
+        transaction: schemas.Transaction = None,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        transaction_id: str = None,
+        changes: dict = None,
+    ):
+        """
+        Queues an update of a transaction.
+
+        Pass either a transaction object, whose `changes()` are sent when the
+        queue is flushed, or a transaction ID and the fields to change.
+        Updates of a transaction already in the queue are merged into it in
+        queue order.
+
+        Args:
+            transaction (schemas.Transaction, optional): The changed transaction. Defaults to None.
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            transaction_id (str, optional): The ID of the transaction. Defaults to None.
+            changes (dict, optional): The fields to change, as the API expects them. Defaults to None.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the updated transaction.
+        """
+        future = Future()
+        transaction_id = transaction.id if transaction else transaction_id
+        with self._condition:
+            budget_id = self._queue(budget=budget, budget_id=budget_id)
+            updates = self._updates.setdefault(budget_id, {})
+            pending = updates.get(transaction_id)
+            if pending is None:
+                pending = updates[transaction_id] = _PendingUpdate()
+            else:
+                # Merged into the queued update, which already counts
+                self._pending -= 1
+            pending.queue(transaction=transaction, changes=changes)
+            pending.futures.append(future)
+        return future
+
+    def delete(
+        self,
+        transaction: schemas.Transaction = None,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        transaction_id: str = None,
+    ):
+        """
+        Queues the deletion of a transaction.
+
+        Updates of the transaction still in the queue are dropped, and their
+        futures resolve with the deletion.
+
+        Deleting the object passed to `create` while that create is still
+        queued cancels it: neither request is sent, and both futures resolve to
+        None. Once the create was sent, delete the transaction its future
+        resolves to instead.
+
+        Args:
+            transaction (Union[schemas.Transaction, dict], optional): The transaction object, or the object passed to a queued `create`. Defaults to None.
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            transaction_id (str, optional): The ID of the transaction. Defaults to None.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the deleted transaction.
+
+        Raises:
+            ValueError: If the transaction has no ID and no queued create.
+        """
+        future = Future()
+        with self._condition:
+            creates = self._creates.get(budget.id if budget else budget_id, [])
+            for i, (_, create, source) in enumerate(creates):
+                if transaction is not None and source is transaction:
+                    del creates[i]
+                    self._pending -= 1
+                    break
+            else:
+                create = None
+            if create is None:
+                if transaction is not None:
+                    transaction_id = getattr(transaction, "id", None)
+                if not transaction_id:
+                    raise ValueError(
+                        "The transaction has no ID; delete the transaction "
+                        "its create resolves to"
+                    )
+                self._queue_delete(budget, budget_id, transaction_id, future)
+        if create is not None:
+            create.set_result(None)
+            future.set_result(None)
+        return future
+
+    def _queue_delete(
+        self,
+        budget: schemas.Budget = None,
+        budget_id: str = "last-used",
+        transaction_id: str = None,
+        future: Future = None,
+    ):
+        """
+        Queues a delete, superseding the queued updates of its transaction. The caller must hold the condition.
+
+        Args:
+            budget (schemas.Budget, optional): The budget object. Defaults to None.
+            budget_id (str, optional): The ID of the budget. Defaults to "last-used".
+            transaction_id (str): The ID of the transaction.
+            future (Future): The future of the delete.
+
+        Returns:
+            None
+        """
+        budget_id = self._queue(budget=budget, budget_id=budget_id)
+        futures = self._deletes.setdefault(budget_id, {}).setdefault(transaction_id, [])
+        if futures:
+            self._pending -= 1
+        futures.append(future)
+        pending = self._updates.get(budget_id, {}).pop(transaction_id, None)
+        if pending is not None:
+            self._pending -= 1
+            futures.extend(pending.futures)
+
+    def flush(self):
+        """
+        Sends every queued mutation and waits until they are done.
+
+        Returns:
+            None
+        """
+        with self._flush_lock:
+            with self._condition:
+                creates, self._creates = self._creates, {}
+                updates, self._updates = self._updates, {}
+                deletes, self._deletes = self._deletes, {}
+                budgets = dict(self._budgets)
+                self._pending = 0
+                self._oldest = None
+
+            for budget_id, queued in creates.items():
+                for start in range(0, len(queued), self.max_batch):
+                    self._send_creates(
+                        budgets.get(budget_id),
+                        budget_id,
+                        queued[start : start + self.max_batch],
+                    )
+            for budget_id, queued in updates.items():
+                queued = list(queued.items())
+                for start in range(0, len(queued), self.max_batch):
+                    self._send_updates(
+                        budgets.get(budget_id),
+                        budget_id,
+                        queued[start : start + self.max_batch],
+                    )
+            for budget_id, queued in deletes.items():
+                for transaction_id, futures in queued.items():
+                    self._send_delete(budget_id, transaction_id, futures)
+
+    def close(self):
+        """
+        Flushes the queue and stops its background thread.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        """
+        Flushes the queue whenever it is full or its oldest mutation is due.
+
+        Returns:
+            None
+        """
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._pending >= self.max_batch:
+                        break
+                    if self._oldest is not None:
+                        remaining = self._oldest + self.max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+            self.flush()
+
+    @staticmethod
+    def _fail(futures: list = None, error: BaseException = None):
+        """
+        Fails futures with an error.
+
+        Args:
+            futures (list): The futures to fail.
+            error (BaseException): The error to raise from them.
+
+        Returns:
+            None
+        """
+        for future in futures:
+            future.set_exception(error)
+
+    def _error(self, _json: dict = None):
+        """
+        Builds the exception raised for an error response, as the API methods do.
+
+        Args:
+            _json (dict): The parsed body of the error response.
+
+        Returns:
+            Exception: The exception wrapping the `schemas.Error`.
+        """
+        return Exception(schemas.Error(pynab=self.pynab, _json=_json.get("error", {})))
+
+    def _send_creates(
+        self, budget: schemas.Budget = None, budget_id: str = "", queued: list = None
+    ):
+        """
+        Sends one batch of creates and resolves their futures.
+
+        Args:
+            budget (schemas.Budget): The budget object, if one was queued.
+            budget_id (str): The ID of the budget.
+            queued (list): The `(body, future, transaction)` entries of the batch.
+
+        Returns:
+            None
+        """
+        futures = [future for _, future, _ in queued]
+        try:
+            response = self.pynab.api.endpoints.request_create_transactions(
+                budget_id=budget_id,
+                request_body={"transactions": [body for body, _, _ in queued]},
+            )
+            _json = response.json()
+        except Exception as error:
+            logging.warning(f"Queued creates for {budget_id} failed: {error!r}")
+            return self._fail(futures, error)
+        if response.status_code != 201:
+            return self._fail(futures, self._error(_json))
+
+        data_json = _json.get("data", {})
+        duplicates = set(data_json.get("duplicate_import_ids", []))
+        created = data_json.get("transactions", [])
+        by_import_id = {t["import_id"]: t for t in created if t.get("import_id")}
+        # Transactions without an import ID can only be matched by position,
+        # which is only safe when the response holds exactly one per body.
+        anonymous = [t for t in created if not t.get("import_id")]
+        expected = sum(1 for body, _, _ in queued if not body.get("import_id"))
+        positional = iter(anonymous) if len(anonymous) == expected else None
+
+        for body, future, _ in queued:
+            import_id = body.get("import_id")
+            if import_id in by_import_id:
+                transaction_json = by_import_id[import_id]
+            elif import_id in duplicates:
+                future.set_result(None)
+                continue
+            elif import_id:
+                future.set_exception(
+                    Exception(f"No transaction with import ID {import_id} was created")
+                )
+                continue
+            elif positional is not None:
+                transaction_json = next(positional)
+            else:
+                future.set_exception(
+                    Exception(
+                        f"{len(anonymous)} transactions without an import ID were "
+                        f"created for {expected} queued creates"
+                    )
+                )
+                continue
+            future.set_result(
+                schemas.Transaction(
+                    pynab=self.pynab, budget=budget, _json=transaction_json
+                )
+            )
+
+    def _send_updates(
+        self, budget: schemas.Budget = None, budget_id: str = "", queued: list = None
+    ):
+        """
+        Sends one batch of updates and resolves their futures.
+
+        Args:
+            budget (schemas.Budget): The budget object, if one was queued.
+            budget_id (str): The ID of the budget.
+            queued (list): The `(transaction_id, _PendingUpdate)` pairs of the batch.
+
+        Returns:
+            None
+        """
+        bodies = []
+        sent = []
+        for transaction_id, pending in queued:
+            changes = pending.body()
+            if not changes:
+                for future in pending.futures:
+                    future.set_result(pending.transaction)
+                continue
+            bodies.append({"id": transaction_id, **changes})
+            sent.append((transaction_id, pending))
+        if not sent:
+            return
+
+        futures = [future for _, pending in sent for future in pending.futures]
+        try:
+            response = self.pynab.api.endpoints.request_update_transactions(
+                budget_id=budget_id, request_body={"transactions": bodies}
+            )
+            _json = response.json()
+        except Exception as error:
+            logging.warning(f"Queued updates for {budget_id} failed: {error!r}")
+            return self._fail(futures, error)
+        if response.status_code != 209:
+            return self._fail(futures, self._error(_json))
+
+        updated = {
+            transaction_json.get("id"): transaction_json
+            for transaction_json in _json.get("data", {}).get("transactions", [])
+        }
+        for transaction_id, pending in sent:
+            if pending.transaction is not None:
+                # Fields edited while the request was in flight stay changed
+                pending.transaction.mark_clean(pending.sent)
+            transaction = pending.transaction
+            if transaction_id in updated:
+                transaction = schemas.Transaction(
+                    pynab=self.pynab, budget=budget, _json=updated[transaction_id]
+                )
+            for future in pending.futures:
+                future.set_result(transaction)
+
+    def _send_delete(
+        self, budget_id: str = "", transaction_id: str = None, futures: list = None
+    ):
+        """
+        Sends one delete and resolves its futures.
+
+        Args:
+            budget_id (str): The ID of the budget.
+            transaction_id (str): The ID of the transaction.
+            futures (list): The futures waiting for the deletion.
+
+        Returns:
+            None
+        """
+        try:
+            transaction = self.pynab.api.delete_transaction(
+                budget_id=budget_id, transaction_id=transaction_id
+            )
+        except Exception as error:
+            return self._fail(futures, error)
+        for future in futures:
+            future.set_result(transaction)
@@ -14,6 +14,9 @@ setup(
         "requests",
         "python-dateutil",
     ],
+    extras_require={
+        "frame": ["numpy"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
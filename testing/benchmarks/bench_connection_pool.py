@@ -0,0 +1,69 @@
+"""
+Compares request throughput with and without pooled keep-alive connections.
+
+Runs `Api.get_user` against a local `StubServer` and reports requests per
+second and the number of TCP connections the server accepted for each mode.
+
+Usage:
+    python -m testing.benchmarks.bench_connection_pool [requests]
+"""
+
+from testing.stub_server import StubServer
+from pynab import Pynab
+import requests
+import sys
+import time
+
+USER = {"data": {"user": {"id": "00000000-0000-0000-0000-000000000000"}}}
+
+
+def run(label: str, server: StubServer, call, count: int):
+    """
+    Times `count` calls and prints the throughput.
+
+    Args:
+        label (str): The name of the mode being measured.
+        server (StubServer): The stub server receiving the requests.
+        call (callable): Issues a single request.
+        count (int): The number of requests to send.
+
+    Returns:
+        float: The measured requests per second.
+    """
+    connections = server.connections
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    elapsed = time.perf_counter() - start
+    rps = count / elapsed
+    print(
+        f"{label:<24} {rps:>10.1f} req/s  "
+        f"{server.connections - connections:>6} connections"
+    )
+    return rps
+
+
+def main(count: int = 2000):
+    with StubServer() as server:
+        server.route("GET", "/user", body=USER)
+
+        pooled = Pynab(bearer="benchmark", api_url=server.url, rate_limit=False)
+        unpooled = Pynab(
+            bearer="benchmark", api_url=server.url, keep_alive=False, rate_limit=False
+        )
+
+        run(
+            "requests.get (no pool)",
+            server,
+            lambda: requests.get(f"{server.url}/user", headers=pooled._headers),
+            count,
+        )
+        run("Pynab keep_alive=False", server, unpooled.api.get_user, count)
+        run("Pynab pooled", server, pooled.api.get_user, count)
+
+        pooled.close()
+        unpooled.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
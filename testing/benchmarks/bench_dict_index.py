@@ -0,0 +1,88 @@
+"""
+Compares indexed `_dict.by` lookups with the linear scan they replace.
+
+Builds a budget with many transactions spread over a number of accounts and
+times resolving `Account.transactions` for every account, once with a plain
+attribute scan over all transactions and once through the hash index.
+
+Usage:
+    python -m testing.benchmarks.bench_dict_index [transactions] [accounts]
+"""
+
+from pynab import schemas, utils
+import sys
+import time
+
+
+def scan(collection: utils._dict, field: str, value: object):
+    """
+    Filters a collection with the linear scan `_dict.by` used before indexing.
+
+    Args:
+        collection (utils._dict): The collection to filter.
+        field (str): The name of the field to filter on.
+        value (object): The value to filter for.
+
+    Returns:
+        utils._dict: The matching items.
+    """
+    items = utils._dict()
+    for k, v in collection.items():
+        if getattr(v, field, None) == value:
+            items[k] = v
+    return items
+
+
+def run(label: str, budget: schemas.Budget, lookup):
+    """
+    Times one `lookup` per account and prints the elapsed time.
+
+    Args:
+        label (str): The name of the mode being measured.
+        budget (schemas.Budget): The budget holding the accounts and transactions.
+        lookup (callable): Returns the transactions of an account.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    found = sum(len(lookup(account)) for account in budget.accounts.values())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed * 1000:>10.1f} ms  {found:>8} transactions")
+    return elapsed
+
+
+def main(count: int = 100000, accounts: int = 50):
+    budget = schemas.Budget(
+        _json={
+            "accounts": [
+                {"id": f"account-{i}", "type": "checking"} for i in range(accounts)
+            ],
+            "transactions": [
+                {
+                    "id": f"transaction-{i}",
+                    "date": "2024-01-15",
+                    "cleared": "cleared",
+                    "flag_color": None,
+                    "account_id": f"account-{i % accounts}",
+                }
+                for i in range(count)
+            ],
+        }
+    )
+    for account in budget.accounts.values():
+        account.budget = budget
+
+    transactions = budget.transactions
+    scanned = run(
+        "linear scan",
+        budget,
+        lambda account: scan(transactions, "account_id", account.id),
+    )
+    indexed = run("indexed (cold)", budget, lambda account: account.transactions)
+    warm = run("indexed (warm)", budget, lambda account: account.transactions)
+    print(f"speedup (warm)           {scanned / warm:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
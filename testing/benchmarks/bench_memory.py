@@ -0,0 +1,117 @@
+"""
+Measures the memory held by parsed transactions.
+
+Parses the same transaction JSON into `schemas.Transaction` objects and
+reports the bytes retained per transaction, traced with `tracemalloc`, for:
+
+- the schema class without `__slots__` (as it was before they were added),
+- the slotted class keeping the raw JSON (`keep_json=True`, the default),
+- the slotted class dropping the raw JSON (`keep_json=False`).
+
+Usage:
+    python -m testing.benchmarks.bench_memory [transactions]
+"""
+
+from pynab import Pynab, schemas
+import gc
+import sys
+import tracemalloc
+
+
+def transaction_json(i: int):
+    """
+    Builds the JSON of a transaction as returned by the API.
+
+    Args:
+        i (int): The sequence number of the transaction.
+
+    Returns:
+        dict: The transaction JSON.
+    """
+    return {
+        "id": f"{i:08d}-0000-4000-8000-000000000000",
+        "date": "2024-01-15",
+        "amount": -12340,
+        "memo": f"memo {i}",
+        "cleared": "cleared",
+        "approved": True,
+        "flag_color": None,
+        "flag_name": None,
+        "account_id": "aaaaaaaa-0000-4000-8000-000000000000",
+        "payee_id": "bbbbbbbb-0000-4000-8000-000000000000",
+        "category_id": "cccccccc-0000-4000-8000-000000000000",
+        "transfer_account_id": None,
+        "transfer_transaction_id": None,
+        "matched_transaction_id": None,
+        "import_id": f"YNAB:-12340:2024-01-15:{i}",
+        "import_payee_name": "Grocer",
+        "import_payee_name_original": "GROCER #42",
+        "debt_transaction_type": None,
+        "deleted": False,
+        "account_name": "Checking",
+        "payee_name": "Grocer",
+        "category_name": "Groceries",
+        "subtransactions": [],
+    }
+
+
+def unslotted(cls: type):
+    """
+    Rebuilds a schema class without `__slots__`, so instances carry a `__dict__`.
+
+    Args:
+        cls (type): The slotted schema class.
+
+    Returns:
+        type: An equivalent class without slots.
+    """
+    namespace = {
+        k: v
+        for k, v in vars(cls).items()
+        if k not in cls.__slots__ and k not in ("__slots__", "__dict__", "__weakref__")
+    }
+    return type(cls.__name__, (), namespace)
+
+
+def measure(label: str, cls: type, pynab: Pynab, count: int):
+    """
+    Parses `count` transactions and prints the bytes retained per transaction.
+
+    Args:
+        label (str): The name of the mode being measured.
+        cls (type): The transaction class to instantiate.
+        pynab (Pynab): The Pynab instance passed to the transactions.
+        count (int): The number of transactions to parse.
+
+    Returns:
+        float: The retained bytes per transaction.
+    """
+    gc.collect()
+    tracemalloc.start()
+    transactions = [cls(pynab=pynab, _json=transaction_json(i)) for i in range(count)]
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_transaction = retained / len(transactions)
+    print(f"{label:<32} {per_transaction:>8.0f} bytes/transaction")
+    return per_transaction
+
+
+def main(count: int = 100000):
+    keep = Pynab(bearer="benchmark", keep_json=True)
+    drop = Pynab(bearer="benchmark", keep_json=False)
+
+    before = measure(
+        "__dict__, keep_json=True", unslotted(schemas.Transaction), keep, count
+    )
+    measure("__slots__, keep_json=True", schemas.Transaction, keep, count)
+    after = measure("__slots__, keep_json=False", schemas.Transaction, drop, count)
+    print(f"reduction                        {1 - after / before:>8.0%}")
+
+    keep.close()
+    drop.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,59 @@
+"""
+Compares `utils.parse_date` / `utils.parse_datetime` with `dateutil.parser.isoparse`.
+
+Parses the date of every transaction in a synthetic load, where dates repeat
+the way they do in a real budget (a few years of days), and a set of unique
+RFC 3339 timestamps, reporting the time per call for each parser.
+
+Usage:
+    python -m testing.benchmarks.bench_parse_date [values]
+"""
+
+from dateutil.parser import isoparse
+from datetime import date, timedelta
+from pynab import utils
+import sys
+import time
+
+
+def run(label: str, parse, values: list):
+    """
+    Parses every value and prints the time per call.
+
+    Args:
+        label (str): The name of the parser being measured.
+        parse (callable): Parses a single value.
+        values (list): The strings to parse.
+
+    Returns:
+        float: The elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    for value in values:
+        parse(value)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / len(values) * 1e9:>8.0f} ns/call")
+    return elapsed
+
+
+def main(count: int = 200000):
+    first = date(2021, 1, 1)
+    dates = [(first + timedelta(days=i % 1095)).isoformat() for i in range(count)]
+    timestamps = [
+        f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i // 60 % 60:02d}.{i % 1000:03d}Z"
+        for i in range(count)
+    ]
+
+    slow = run("isoparse(date).date()", lambda value: isoparse(value).date(), dates)
+    utils.parse_date.cache_clear()
+    fast = run("parse_date", utils.parse_date, dates)
+    print(f"speedup                          {slow / fast:>8.1f}x")
+
+    slow = run("isoparse(timestamp)", isoparse, timestamps)
+    utils.parse_datetime.cache_clear()
+    fast = run("parse_datetime (unique values)", utils.parse_datetime, timestamps)
+    print(f"speedup                          {slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,76 @@
+"""
+Compares peak memory of `Api.get_transactions` and the streaming `Api.iter_transactions`.
+
+Serves a large transaction list from a local `StubServer` and reports the
+peak memory traced by `tracemalloc` while walking every transaction and
+summing the amounts, for the buffered and the streamed path. The response body
+is encoded once, before tracing starts.
+
+Usage:
+    python -m testing.benchmarks.bench_streaming [transactions]
+"""
+
+from testing.benchmarks.bench_memory import transaction_json
+from testing.stub_server import StubServer
+from pynab import Pynab
+import json
+import sys
+import time
+import tracemalloc
+
+
+def measure(label: str, walk):
+    """
+    Runs `walk` and prints its peak traced memory and duration.
+
+    Args:
+        label (str): The name of the mode being measured.
+        walk (callable): Fetches the transactions and returns the sum of their amounts.
+
+    Returns:
+        int: The peak traced memory in bytes.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    total = walk()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {peak / 2**20:>8.1f} MiB peak  {elapsed:>6.2f} s  sum={total}")
+    return peak
+
+
+def main(count: int = 50000):
+    with StubServer() as server:
+        server.route(
+            "GET",
+            "/budgets/last-used/transactions",
+            body=json.dumps(
+                {
+                    "data": {
+                        "transactions": [transaction_json(i) for i in range(count)],
+                        "server_knowledge": 1,
+                    }
+                }
+            ).encode(),
+        )
+        pynab = Pynab(bearer="benchmark", api_url=server.url, rate_limit=False)
+
+        # Warm up the connection pool.
+        sum(t.amount for t in pynab.api.iter_transactions())
+
+        buffered = measure(
+            "get_transactions",
+            lambda: sum(t.amount for t in pynab.api.get_transactions().values()),
+        )
+        streamed = measure(
+            "iter_transactions",
+            lambda: sum(t.amount for t in pynab.api.iter_transactions()),
+        )
+        print(f"reduction            {1 - streamed / buffered:>8.1%}")
+
+        pynab.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
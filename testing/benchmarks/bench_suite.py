@@ -0,0 +1,353 @@
+"""
+Runs the offline benchmark suite against a local fake of the YNAB API.
+
+For every budget size, a `FakeYnab` server serves a synthetic budget of that
+many transactions and the suite measures:
+
+- `latency`: the median and 95th percentile duration of the main `Api` methods, end to end,
+- `throughput`: the objects returned per second by the same methods,
+- `parse`: the nanoseconds spent building one `schemas.Transaction`, eagerly and lazily decoded,
+- `memory`: the bytes retained by one `schemas.Transaction`, with and without its raw JSON,
+- `fan_out`: the requests sent while walking the lazy properties of a budget, before and after `Budget.hydrate`.
+
+The results are written as JSON, one record per size, benchmark and metric.
+Given a baseline from an earlier run, every metric that got worse by more than
+the threshold is reported and the exit status is 1, so the suite can gate
+regressions. The 1M transaction budget needs several GiB of memory and is only
+run when asked for.
+
+Usage:
+    python -m testing.benchmarks.bench_suite [--sizes 1000 100000 1000000] [--repeat 5] [--output results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+
+from testing.benchmarks.fake_ynab import FakeYnab, SyntheticBudget
+from pynab import Pynab, schemas
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+SIZES = (1000, 100000)
+
+# Objects sampled by the parse and memory benchmarks
+SAMPLE = 20000
+
+# Metrics where a larger value is an improvement
+HIGHER_IS_BETTER = {"objects_per_second"}
+
+
+def methods(budget: SyntheticBudget = None):
+    """
+    Returns the `Api` calls timed by the latency and throughput benchmarks.
+
+    Args:
+        budget (SyntheticBudget): The budget served by the fake.
+
+    Returns:
+        dict: Callables taking a `Pynab` instance and returning the number of objects received, keyed by benchmark name.
+    """
+    account_id = budget.accounts[0]["id"]
+    return {
+        "get_budgets": lambda pynab: len(pynab.api.get_budgets()),
+        "get_budget": lambda pynab: len(
+            pynab.api.get_budget(budget_id=budget.id).transactions
+        ),
+        "get_accounts": lambda pynab: len(pynab.api.get_accounts(budget_id=budget.id)),
+        "get_categories": lambda pynab: len(
+            pynab.api.get_categories(budget_id=budget.id)
+        ),
+        "get_payees": lambda pynab: len(pynab.api.get_payees(budget_id=budget.id)),
+        "get_months": lambda pynab: len(pynab.api.get_months(budget_id=budget.id)),
+        "get_transactions": lambda pynab: len(
+            pynab.api.get_transactions(budget_id=budget.id)
+        ),
+        "iter_transactions": lambda pynab: sum(
+            1 for _ in pynab.api.iter_transactions(budget_id=budget.id)
+        ),
+        "get_account_transactions": lambda pynab: len(
+            pynab.api.get_account_transactions(
+                budget_id=budget.id, account_id=account_id
+            )
+        ),
+        "get_scheduled_transactions": lambda pynab: len(
+            pynab.api.get_scheduled_transactions(budget_id=budget.id)
+        ),
+    }
+
+
+def record(size: int = 0, benchmark: str = "", metric: str = "", value=0, unit=""):
+    """
+    Builds one result record.
+
+    Args:
+        size (int): The number of transactions in the budget.
+        benchmark (str): The name of the benchmark.
+        metric (str): The name of the metric.
+        value (float): The measured value.
+        unit (str): The unit of the value.
+
+    Returns:
+        dict: The result record.
+    """
+    return {
+        "size": size,
+        "benchmark": benchmark,
+        "metric": metric,
+        "value": round(value, 3),
+        "unit": unit,
+    }
+
+
+def bench_latency(fake: FakeYnab = None, size: int = 0, repeat: int = 5):
+    """
+    Times the main `Api` methods against the fake.
+
+    Every method is called once to warm the connection pool and the fake's
+    encoded bodies, then `repeat` more times.
+
+    Args:
+        fake (FakeYnab): The running fake.
+        size (int): The number of transactions in the budget.
+        repeat (int, optional): The number of timed calls per method. Defaults to 5.
+
+    Returns:
+        list: The result records.
+    """
+    results = []
+    with Pynab(bearer="benchmark", api_url=fake.url, rate_limit=False) as pynab:
+        for name, call in methods(fake.budget).items():
+            call(pynab)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                objects = call(pynab)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            median = statistics.median(timings)
+            p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+            results += [
+                record(size, name, "latency_median", median * 1000, "ms"),
+                record(size, name, "latency_p95", p95 * 1000, "ms"),
+                record(size, name, "objects_per_second", objects / median, "1/s"),
+            ]
+    return results
+
+
+def bench_parse(fake: FakeYnab = None, size: int = 0, repeat: int = 5):
+    """
+    Times building transactions from their JSON, without the network.
+
+    Args:
+        fake (FakeYnab): The running fake.
+        size (int): The number of transactions in the budget.
+        repeat (int, optional): The number of timed runs; the fastest counts. Defaults to 5.
+
+    Returns:
+        list: The result records.
+    """
+    sample = fake.budget.transactions[:SAMPLE]
+    results = []
+    for lazy in (False, True):
+        pynab = Pynab(bearer="benchmark", api_url=fake.url, lazy=lazy)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for transaction_json in sample:
+                schemas.Transaction(pynab=pynab, _json=transaction_json)
+            best = min(best, time.perf_counter_ns() - start)
+        pynab.close()
+        metric = "ns_per_object_lazy" if lazy else "ns_per_object_eager"
+        results.append(
+            record(size, "parse_transaction", metric, best / len(sample), "ns")
+        )
+    return results
+
+
+def bench_memory(fake: FakeYnab = None, size: int = 0):
+    """
+    Measures the memory retained by parsed transactions.
+
+    Args:
+        fake (FakeYnab): The running fake.
+        size (int): The number of transactions in the budget.
+
+    Returns:
+        list: The result records.
+    """
+    body = json.dumps(fake.budget.transactions[:SAMPLE])
+    results = []
+    for keep_json in (True, False):
+        pynab = Pynab(bearer="benchmark", api_url=fake.url, keep_json=keep_json)
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        # Decoded while tracing, so JSON dropped by the objects is not counted
+        batch = json.loads(body)
+        transactions = [
+            schemas.Transaction(pynab=pynab, _json=transaction_json)
+            for transaction_json in batch
+        ]
+        del batch
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        pynab.close()
+        metric = "bytes_per_object_keep_json" if keep_json else "bytes_per_object"
+        results.append(
+            record(
+                size,
+                "memory_transaction",
+                metric,
+                (after - before) / len(transactions),
+                "B",
+            )
+        )
+        del transactions
+    return results
+
+
+def walk(budget: schemas.Budget = None):
+    """
+    Touches the lazy properties an application typically follows from a budget.
+
+    Args:
+        budget (schemas.Budget): The budget to walk.
+
+    Returns:
+        None
+    """
+    budget.settings
+    budget.category_groups
+    budget.months
+    budget.scheduled_transactions
+    for account in budget.accounts.values():
+        account.transactions
+        account.transfer_payees
+    for transaction in list(budget.transactions.values())[:100]:
+        transaction.account
+        transaction.payee
+        transaction.categories
+
+
+def bench_fan_out(fake: FakeYnab = None, size: int = 0):
+    """
+    Counts the requests sent while walking a budget's lazy properties.
+
+    Args:
+        fake (FakeYnab): The running fake.
+        size (int): The number of transactions in the budget.
+
+    Returns:
+        list: The result records.
+    """
+    results = []
+    for hydrated in (False, True):
+        with Pynab(bearer="benchmark", api_url=fake.url, rate_limit=False) as pynab:
+            budget = pynab.api.get_budgets()[fake.budget.id]
+            sent = len(fake.requests)
+            if hydrated:
+                budget.hydrate()
+            walk(budget)
+            metric = "requests_hydrated" if hydrated else "requests_lazy"
+            results.append(
+                record(size, "fan_out", metric, len(fake.requests) - sent, "requests")
+            )
+    return results
+
+
+def run(sizes=SIZES, repeat: int = 5):
+    """
+    Runs every benchmark for every budget size.
+
+    Args:
+        sizes (Iterable[int], optional): The numbers of transactions of the budgets. Defaults to `SIZES`.
+        repeat (int, optional): The number of timed runs per measurement. Defaults to 5.
+
+    Returns:
+        dict: The run metadata under "meta" and the result records under "results".
+    """
+    results = []
+    for size in sizes:
+        with FakeYnab(transactions=size) as fake:
+            fake.warm()
+            results += bench_latency(fake, size, repeat)
+            results += bench_parse(fake, size, repeat)
+            results += bench_memory(fake, size)
+            results += bench_fan_out(fake, size)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "sample": SAMPLE,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict = None, baseline: dict = None, threshold: float = 0.2):
+    """
+    Finds the metrics that got worse than their baseline.
+
+    Args:
+        results (dict): The output of `run`.
+        baseline (dict): The output of an earlier `run`.
+        threshold (float, optional): The relative change tolerated, e.g. 0.2 for 20%. Defaults to 0.2.
+
+    Returns:
+        list: The `(record, baseline value)` of every regressed metric.
+    """
+    key = lambda r: (r["size"], r["benchmark"], r["metric"])
+    previous = {key(r): r["value"] for r in baseline.get("results", [])}
+    regressions = []
+    for r in results["results"]:
+        before = previous.get(key(r))
+        if not before:
+            continue
+        change = (r["value"] - before) / before
+        if r["metric"] in HIGHER_IS_BETTER:
+            change = -change
+        if change > threshold:
+            regressions.append((r, before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the offline benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Writes the results as JSON to this file.")
+    parser.add_argument("--compare", help="A baseline results file to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes, repeat=args.repeat)
+    for r in results["results"]:
+        print(
+            f"{r['size']:>8} {r['benchmark']:<27} {r['metric']:<28} "
+            f"{r['value']:>14,.3f} {r['unit']}"
+        )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for r, before in regressions:
+            print(
+                f"REGRESSION {r['size']} {r['benchmark']} {r['metric']}: "
+                f"{before} -> {r['value']} {r['unit']}"
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
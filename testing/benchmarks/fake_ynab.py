@@ -0,0 +1,399 @@
+"""
+A local fake of the YNAB v1 API serving synthetic budgets of any size.
+
+`FakeYnab` extends `StubServer` with routes for the main read endpoints of
+one generated budget. Response bodies are built and encoded on first request
+and then served from memory, so request timings measure the client rather than
+the fake.
+
+Usage:
+    with FakeYnab(transactions=100000) as fake:
+        pynab = Pynab(bearer="benchmark", api_url=fake.url, rate_limit=False)
+"""
+
+from testing.stub_server import StubServer
+from datetime import date, timedelta
+import json
+import random
+
+BUDGET_ID = "bbbbbbbb-0000-4000-8000-000000000000"
+
+
+def uuid(kind: str = "0", i: int = 0):
+    """
+    Builds a deterministic, UUID-shaped ID.
+
+    Args:
+        kind (str): A single hex digit distinguishing the entity type.
+        i (int): The sequence number of the entity.
+
+    Returns:
+        str: The ID.
+    """
+    return f"{kind * 8}-0000-4000-8000-{i:012d}"
+
+
+class SyntheticBudget:
+    """
+    The JSON of a generated budget.
+
+    Transactions are spread over the accounts, payees and categories and over
+    the days before `end`, with one split transaction in every hundred. The
+    generator is seeded, so the same arguments always yield the same budget.
+
+    Attributes:
+        id (str): The ID of the budget.
+        accounts (list): The account JSON.
+        payees (list): The payee JSON, followed by the transfer payees of the accounts.
+        category_groups (list): The category group JSON, each holding its categories.
+        months (list): The month JSON, each holding its categories.
+        transactions (list): The transaction JSON, with nested subtransactions.
+        scheduled_transactions (list): The scheduled transaction JSON.
+    """
+
+    def __init__(
+        self,
+        transactions: int = 1000,
+        accounts: int = 10,
+        payees: int = 200,
+        categories: int = 50,
+        months: int = 24,
+        seed: int = 0,
+        end: date = date(2024, 12, 31),
+    ):
+        """
+        Initializes a new instance of the SyntheticBudget class.
+
+        Args:
+            transactions (int, optional): The number of transactions. Defaults to 1000.
+            accounts (int, optional): The number of accounts. Defaults to 10.
+            payees (int, optional): The number of payees. Defaults to 200.
+            categories (int, optional): The number of categories, in groups of ten. Defaults to 50.
+            months (int, optional): The number of budget months. Defaults to 24.
+            seed (int, optional): The seed of the generator. Defaults to 0.
+            end (date, optional): The date of the latest transaction. Defaults to 2024-12-31.
+        """
+        rng = random.Random(seed)
+        self.id = BUDGET_ID
+
+        self.accounts = [
+            {
+                "id": uuid("a", i),
+                "name": f"Account {i}",
+                "type": "checking",
+                "on_budget": True,
+                "closed": False,
+                "balance": 0,
+                "cleared_balance": 0,
+                "uncleared_balance": 0,
+                "transfer_payee_id": uuid("f", i),
+                "deleted": False,
+            }
+            for i in range(accounts)
+        ]
+        self.payees = [
+            {"id": uuid("e", i), "name": f"Payee {i}", "deleted": False}
+            for i in range(payees)
+        ] + [
+            {
+                "id": account["transfer_payee_id"],
+                "name": f"Transfer : {account['name']}",
+                "transfer_account_id": account["id"],
+                "deleted": False,
+            }
+            for account in self.accounts
+        ]
+        category_json = [
+            {
+                "id": uuid("c", i),
+                "category_group_id": uuid("d", i // 10),
+                "name": f"Category {i}",
+                "hidden": False,
+                "budgeted": 100000,
+                "activity": -50000,
+                "balance": 50000,
+                "goal_type": None,
+                "deleted": False,
+            }
+            for i in range(categories)
+        ]
+        self.category_groups = [
+            {
+                "id": uuid("d", g),
+                "name": f"Group {g}",
+                "hidden": False,
+                "deleted": False,
+                "categories": category_json[g * 10 : (g + 1) * 10],
+            }
+            for g in range((categories + 9) // 10)
+        ]
+        first_month = date(end.year - (months - 1) // 12, 1, 1)
+        self.months = [
+            {
+                "month": date(first_month.year + m // 12, m % 12 + 1, 1).isoformat(),
+                "income": 0,
+                "budgeted": 0,
+                "activity": 0,
+                "to_be_budgeted": 0,
+                "deleted": False,
+                "categories": category_json,
+            }
+            for m in range(months)
+        ]
+
+        self.transactions = []
+        for i in range(transactions):
+            account = self.accounts[i % accounts]
+            payee = self.payees[rng.randrange(payees)]
+            category = category_json[rng.randrange(categories)]
+            amount = -rng.randrange(100, 500000, 10)
+            day = end - timedelta(days=rng.randrange(365 * 2))
+            transaction = {
+                "id": uuid("7", i),
+                "date": day.isoformat(),
+                "amount": amount,
+                "memo": f"memo {i}" if i % 3 else None,
+                "cleared": ("cleared", "uncleared", "reconciled")[i % 3],
+                "approved": True,
+                "flag_color": (None, "red", "blue")[i % 3],
+                "flag_name": None,
+                "account_id": account["id"],
+                "account_name": account["name"],
+                "payee_id": payee["id"],
+                "payee_name": payee["name"],
+                "category_id": category["id"],
+                "category_name": category["name"],
+                "transfer_account_id": None,
+                "transfer_transaction_id": None,
+                "matched_transaction_id": None,
+                "import_id": f"YNAB:{amount}:{day.isoformat()}:1",
+                "import_payee_name": payee["name"],
+                "import_payee_name_original": payee["name"].upper(),
+                "debt_transaction_type": None,
+                "deleted": False,
+                "subtransactions": [],
+            }
+            if i % 100 == 0:
+                transaction["subtransactions"] = [
+                    {
+                        "id": uuid("5", i * 2 + s),
+                        "transaction_id": transaction["id"],
+                        "amount": amount // 2,
+                        "memo": None,
+                        "payee_id": payee["id"],
+                        "payee_name": payee["name"],
+                        "category_id": category_json[(i + s) % categories]["id"],
+                        "category_name": category_json[(i + s) % categories]["name"],
+                        "transfer_account_id": None,
+                        "transfer_transaction_id": None,
+                        "deleted": False,
+                    }
+                    for s in range(2)
+                ]
+            self.transactions.append(transaction)
+
+        self.scheduled_transactions = [
+            {
+                "id": uuid("6", i),
+                "date_first": "2024-01-01",
+                "date_next": "2025-01-01",
+                "frequency": "monthly",
+                "amount": -100000,
+                "memo": None,
+                "flag_color": None,
+                "flag_name": None,
+                "account_id": self.accounts[i % accounts]["id"],
+                "payee_id": self.payees[i % payees]["id"],
+                "category_id": category_json[i % categories]["id"],
+                "transfer_account_id": None,
+                "deleted": False,
+                "subtransactions": [],
+            }
+            for i in range(min(20, transactions))
+        ]
+
+    def summary(self):
+        """
+        Returns the budget as listed by `GET /budgets`.
+
+        Returns:
+            dict: The budget summary JSON.
+        """
+        return {
+            "id": self.id,
+            "name": "Synthetic Budget",
+            "last_modified_on": "2024-12-31T12:00:00+00:00",
+            "first_month": self.months[0]["month"],
+            "last_month": self.months[-1]["month"],
+            "date_format": {"format": "YYYY-MM-DD"},
+            "currency_format": {
+                "iso_code": "USD",
+                "example_format": "123,456.78",
+                "decimal_digits": 2,
+                "decimal_separator": ".",
+                "symbol_first": True,
+                "group_separator": ",",
+                "currency_symbol": "$",
+                "display_symbol": True,
+            },
+        }
+
+    def detail(self):
+        """
+        Returns the full budget as returned by `GET /budgets/{budget_id}`.
+
+        Returns:
+            dict: The budget detail JSON, with every collection flattened.
+        """
+        subtransactions = [
+            subtransaction
+            for transaction in self.transactions
+            for subtransaction in transaction["subtransactions"]
+        ]
+        return {
+            **self.summary(),
+            "accounts": self.accounts,
+            "payees": self.payees,
+            "payee_locations": [],
+            "category_groups": [
+                {k: v for k, v in group.items() if k != "categories"}
+                for group in self.category_groups
+            ],
+            "categories": [
+                category
+                for group in self.category_groups
+                for category in group["categories"]
+            ],
+            "months": self.months,
+            "transactions": [
+                {k: v for k, v in transaction.items() if k != "subtransactions"}
+                for transaction in self.transactions
+            ],
+            "subtransactions": subtransactions,
+            "scheduled_transactions": [
+                {k: v for k, v in scheduled.items() if k != "subtransactions"}
+                for scheduled in self.scheduled_transactions
+            ],
+            "scheduled_subtransactions": [],
+        }
+
+
+class FakeYnab(StubServer):
+    """
+    A `StubServer` answering the main read endpoints of a `SyntheticBudget`.
+
+    Budget-scoped routes answer both for the budget ID and for "last-used".
+
+    Attributes:
+        budget (SyntheticBudget): The budget being served.
+    """
+
+    def __init__(self, budget: SyntheticBudget = None, **budget_options):
+        """
+        Initializes a new instance of the FakeYnab class.
+
+        Args:
+            budget (SyntheticBudget, optional): The budget to serve. Defaults to None (generated from `budget_options`).
+            **budget_options: Arguments for `SyntheticBudget`, e.g. `transactions=100000`.
+        """
+        super().__init__()
+        self.budget = (
+            budget if budget is not None else SyntheticBudget(**budget_options)
+        )
+        self._bodies = {}
+
+        b = self.budget
+        self._lazy_route("/user", lambda: {"user": {"id": uuid("9", 0)}})
+        self._lazy_route(
+            "/budgets",
+            lambda: {"budgets": [b.summary()], "default_budget": None},
+        )
+        for budget_id in (b.id, "last-used"):
+            prefix = f"/budgets/{budget_id}"
+            self._lazy_route(
+                prefix, lambda: {"budget": b.detail(), "server_knowledge": 1}
+            )
+            self._lazy_route(
+                f"{prefix}/settings",
+                lambda: {
+                    "settings": {
+                        "date_format": b.summary()["date_format"],
+                        "currency_format": b.summary()["currency_format"],
+                    }
+                },
+            )
+            self._lazy_route(
+                f"{prefix}/accounts",
+                lambda: {"accounts": b.accounts, "server_knowledge": 1},
+            )
+            self._lazy_route(
+                f"{prefix}/categories",
+                lambda: {"category_groups": b.category_groups, "server_knowledge": 1},
+            )
+            self._lazy_route(
+                f"{prefix}/payees",
+                lambda: {"payees": b.payees, "server_knowledge": 1},
+            )
+            self._lazy_route(
+                f"{prefix}/months",
+                lambda: {
+                    "months": [
+                        {k: v for k, v in month.items() if k != "categories"}
+                        for month in b.months
+                    ],
+                    "server_knowledge": 1,
+                },
+            )
+            self._lazy_route(
+                f"{prefix}/transactions",
+                lambda: {"transactions": b.transactions, "server_knowledge": 1},
+            )
+            self._lazy_route(
+                f"{prefix}/scheduled_transactions",
+                lambda: {
+                    "scheduled_transactions": b.scheduled_transactions,
+                    "server_knowledge": 1,
+                },
+            )
+            for account in b.accounts:
+                self._lazy_route(
+                    f"{prefix}/accounts/{account['id']}/transactions",
+                    lambda account_id=account["id"]: {
+                        "transactions": [
+                            t for t in b.transactions if t["account_id"] == account_id
+                        ],
+                        "server_knowledge": 1,
+                    },
+                )
+
+    def _lazy_route(self, path: str = "", data=None):
+        """
+        Registers a GET route whose body is built and encoded on first request.
+
+        Args:
+            path (str): The path below `/v1`.
+            data (callable): Returns the `data` of the response.
+
+        Returns:
+            None
+        """
+
+        def body(method, request_path, request_json):
+            payload = self._bodies.get(path)
+            if payload is None:
+                payload = json.dumps({"data": data()}).encode()
+                self._bodies[path] = payload
+            return 200, payload, {}
+
+        self.route("GET", path, body=body)
+
+    def warm(self):
+        """
+        Builds and encodes every response body ahead of the first request.
+
+        Returns:
+            FakeYnab: The server itself.
+        """
+        for (method, path), (_, body, _) in list(self.routes.items()):
+            body(method, path, None)
+        return self
@@ -0,0 +1,44 @@
+from testing.stub_server import StubServer
+import pytest
+
+
+def transaction_json(id: str, amount: int = -1000, deleted: bool = False):
+    """
+    Builds the JSON of a transaction as returned by the API.
+
+    Args:
+        id (str): The ID of the transaction.
+        amount (int, optional): The amount in milliunits. Defaults to -1000.
+        deleted (bool, optional): Whether the transaction is deleted. Defaults to False.
+
+    Returns:
+        dict: The transaction JSON.
+    """
+    return {
+        "id": id,
+        "date": "2024-01-15",
+        "amount": amount,
+        "cleared": "cleared",
+        "approved": True,
+        "flag_color": None,
+        "account_id": "account",
+        "payee_id": "payee",
+        "category_id": "category",
+        "deleted": deleted,
+        "subtransactions": [],
+    }
+
+
+@pytest.fixture
+def server():
+    """
+    Starts a local stub of the YNAB API for the duration of a test.
+
+    Modules that need routes of their own override this fixture with one that
+    takes the shared server and registers them.
+
+    Yields:
+        StubServer: The running stub server, without routes.
+    """
+    with StubServer() as server:
+        yield server
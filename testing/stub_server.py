@@ -0,0 +1,159 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import json
+import threading
+
+
+class StubServer:
+    """
+    A local, in-process stand-in for the YNAB v1 API.
+
+    Routes are registered per method and path and answered with canned JSON, so
+    tests and benchmarks can exercise the full `Pynab` -> `Api` -> `Endpoints`
+    -> `http_utils` stack without a bearer token or network access. The server
+    speaks HTTP/1.1 so keep-alive connections are honoured, and it counts the
+    TCP connections it accepts so connection reuse can be observed.
+
+    Attributes:
+        routes (dict): Registered responses keyed by `(method, path)`.
+        requests (list): The `(method, path, body)` of every request received.
+        connections (int): The number of TCP connections accepted.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initializes a new instance of the StubServer class.
+
+        Args:
+            host (str, optional): The interface to bind to. Defaults to "127.0.0.1".
+            port (int, optional): The port to bind to, 0 picks a free port. Defaults to 0.
+        """
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Returns the base URL to use as `Pynab.api_url`.
+
+        Returns:
+            str: The base URL of the stub API.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def route(
+        self,
+        method: str = "GET",
+        path: str = None,
+        status: int = 200,
+        body=None,
+        headers: dict = None,
+    ):
+        """
+        Registers a canned response.
+
+        Args:
+            method (str, optional): The HTTP method to answer. Defaults to "GET".
+            path (str, optional): The path below `/v1`, with or without a query string.
+            status (int, optional): The status code to return. Defaults to 200.
+            body (dict or callable, optional): The JSON body, or a callable taking `(method, path, request_json)` and returning `(status, body, headers)`.
+            headers (dict, optional): Extra response headers. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.routes[(method, path)] = (status, body, headers or {})
+
+    def start(self):
+        """
+        Starts serving requests on a background thread.
+
+        Returns:
+            StubServer: The running server.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server and releases the listening socket.
+
+        Returns:
+            None
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _respond(self, method: str, raw_path: str, request_json):
+        with self._lock:
+            self.requests.append((method, raw_path, request_json))
+        path = raw_path[len("/v1") :] if raw_path.startswith("/v1") else raw_path
+        route = self.routes.get((method, path)) or self.routes.get(
+            (method, urlsplit(path).path)
+        )
+        if route is None:
+            return (
+                404,
+                {
+                    "error": {
+                        "id": "404.2",
+                        "name": "resource_not_found",
+                        "detail": path,
+                    }
+                },
+                {},
+            )
+        status, body, headers = route
+        if callable(body):
+            return body(method, path, request_json)
+        return status, body, headers
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            wbufsize = -1
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request_json = json.loads(self.rfile.read(length)) if length else None
+                status, body, headers = server._respond(
+                    self.command, self.path, request_json
+                )
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if self.close_connection:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
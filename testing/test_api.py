@@ -0,0 +1,391 @@
+from testing.conftest import transaction_json
+from urllib.parse import parse_qs, urlsplit
+from pynab import Pynab, schemas
+import pytest
+
+BUDGET_A = "aaaaaaaa-0000-0000-0000-000000000000"
+BUDGET_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def test_pynab(server):
+    """
+    Creates a Pynab instance that talks to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Yields:
+        Pynab: The Pynab instance, with server knowledge tracking enabled.
+    """
+    with Pynab(
+        bearer="test", api_url=server.url, track_server_knowledge=True
+    ) as test_pynab:
+        yield test_pynab
+
+
+def test_server_knowledge_is_tracked_per_budget(server, test_pynab):
+    """
+    Test that server knowledge is tracked per budget and deltas are merged.
+
+    Asserts:
+        - Fetching budget B after budget A does not send A's server knowledge.
+        - A delta upserts changed transactions and drops deleted ones.
+        - The merged collection is the one held by the budget.
+    """
+    knowledge = {BUDGET_A: 10, BUDGET_B: 20}
+    deltas = {
+        BUDGET_A: [
+            transaction_json("t1", amount=-2000),
+            transaction_json("t2", deleted=True),
+        ],
+        BUDGET_B: [transaction_json("t4")],
+    }
+    sent = []
+
+    def transactions(budget_id):
+        def body(method, path, request_json):
+            query = parse_qs(urlsplit(path).query)
+            last_knowledge = int(query.get("last_knowledge_of_server", [0])[0])
+            sent.append((budget_id, last_knowledge))
+            if last_knowledge:
+                items = deltas[budget_id]
+            else:
+                items = [
+                    transaction_json("t1"),
+                    transaction_json("t2"),
+                    transaction_json("t3"),
+                ]
+            data = {"transactions": items, "server_knowledge": knowledge[budget_id]}
+            return 200, {"data": data}, {}
+
+        return body
+
+    for budget_id in (BUDGET_A, BUDGET_B):
+        server.route(
+            "GET", f"/budgets/{budget_id}/transactions", body=transactions(budget_id)
+        )
+
+    full_a = test_pynab.api.get_transactions(budget_id=BUDGET_A)
+    test_pynab.api.get_transactions(budget_id=BUDGET_B)
+    merged_a = test_pynab.api.get_transactions(budget_id=BUDGET_A)
+
+    assert sent == [(BUDGET_A, 0), (BUDGET_B, 0), (BUDGET_A, 10)]
+    assert merged_a is full_a
+    assert sorted(merged_a) == ["t1", "t3"]
+    assert merged_a["t1"].amount == -2000
+    assert test_pynab.server_knowledges("get_transactions", budget_id=BUDGET_B) == 20
+
+
+def test_category_delta_merges_into_groups(server, test_pynab):
+    """
+    Test that a categories delta is merged into the tracked category groups.
+
+    Asserts:
+        - Categories left out of the delta are kept in their group.
+        - Changed categories are upserted and deleted ones dropped.
+        - The group's own fields are taken from the delta.
+    """
+
+    def categories(method, path, request_json):
+        if "last_knowledge_of_server" in path:
+            groups = [
+                {
+                    "id": "g",
+                    "name": "Bills",
+                    "categories": [
+                        {"id": "c2", "name": "Groceries"},
+                        {"id": "c3", "name": "Old", "deleted": True},
+                    ],
+                }
+            ]
+        else:
+            groups = [
+                {
+                    "id": "g",
+                    "name": "Monthly",
+                    "categories": [
+                        {"id": "c1", "name": "Rent"},
+                        {"id": "c2", "name": "Food"},
+                        {"id": "c3", "name": "Old"},
+                    ],
+                }
+            ]
+        data = {"category_groups": groups, "server_knowledge": 5}
+        return 200, {"data": data}, {}
+
+    server.route("GET", f"/budgets/{BUDGET_A}/categories", body=categories)
+
+    full = test_pynab.api.get_categories(budget_id=BUDGET_A)
+    group = full["g"]
+    merged = test_pynab.api.get_categories(budget_id=BUDGET_A)
+
+    assert merged is full and merged["g"] is group
+    assert group.name == "Bills"
+    assert {id: c.name for id, c in group.categories.items()} == {
+        "c1": "Rent",
+        "c2": "Groceries",
+    }
+
+
+def test_iter_transactions_streams(server, test_pynab):
+    """
+    Test that `iter_transactions` yields transactions parsed from the streamed body.
+
+    Asserts:
+        - Every transaction is yielded, in order, as a `Transaction`.
+        - No request is sent until iteration starts.
+        - An error response raises.
+    """
+    transactions = [transaction_json(f"t{i}", amount=-i) for i in range(500)]
+    server.route(
+        "GET",
+        f"/budgets/{BUDGET_A}/transactions",
+        body={"data": {"transactions": transactions, "server_knowledge": 1}},
+    )
+
+    iterator = test_pynab.api.iter_transactions(budget_id=BUDGET_A)
+    assert server.requests == []
+
+    streamed = list(iterator)
+    assert [transaction.id for transaction in streamed] == [
+        transaction["id"] for transaction in transactions
+    ]
+    assert streamed[-1].amount == -499
+
+    server.route(
+        "GET",
+        f"/budgets/{BUDGET_B}/transactions",
+        status=404,
+        body={"error": {"id": "404", "name": "not_found", "detail": "missing"}},
+    )
+    with pytest.raises(Exception):
+        list(test_pynab.api.iter_transactions(budget_id=BUDGET_B))
+
+
+def test_iter_scoped_transactions(server, test_pynab):
+    """
+    Test the scoped and scheduled `iter_*` methods and chaining them into a pipeline.
+
+    Asserts:
+        - Each method requests its own endpoint and yields the matching schema objects.
+        - Iterators compose with `filter` and `map` without building a collection.
+    """
+    transactions = [transaction_json(f"t{i}", amount=-i) for i in range(10)]
+    body = {"data": {"transactions": transactions, "server_knowledge": 1}}
+    for path in (
+        "accounts/account/transactions",
+        "categories/category/transactions",
+        "payees/payee/transactions",
+        "months/2024-01-01/transactions",
+    ):
+        server.route("GET", f"/budgets/{BUDGET_A}/{path}", body=body)
+    server.route(
+        "GET",
+        f"/budgets/{BUDGET_A}/scheduled_transactions",
+        body={
+            "data": {
+                "scheduled_transactions": [
+                    {
+                        "id": "s1",
+                        "date_first": "2024-01-01",
+                        "date_next": "2024-02-01",
+                        "frequency": "monthly",
+                        "flag_color": None,
+                        "subtransactions": [],
+                    }
+                ],
+                "server_knowledge": 1,
+            }
+        },
+    )
+
+    api = test_pynab.api
+    iterators = (
+        api.iter_account_transactions(budget_id=BUDGET_A, account_id="account"),
+        api.iter_category_transactions(budget_id=BUDGET_A, category_id="category"),
+        api.iter_payee_transactions(budget_id=BUDGET_A, payee_id="payee"),
+        api.iter_month_transactions(budget_id=BUDGET_A, month_id="2024-01-01"),
+    )
+    for iterator in iterators:
+        odd = filter(lambda transaction: transaction.amount % 2, iterator)
+        assert list(map(lambda transaction: transaction.id, odd)) == [
+            "t1",
+            "t3",
+            "t5",
+            "t7",
+            "t9",
+        ]
+
+    scheduled = list(api.iter_scheduled_transactions(budget_id=BUDGET_A))
+    assert [transaction.id for transaction in scheduled] == ["s1"]
+
+
+def test_hydrate_loads_every_collection_once(server, test_pynab):
+    """
+    Test that hydrating a budget fills every collection from one request.
+
+    Asserts:
+        - Exactly one request is sent, to the full budget endpoint.
+        - Reading any collection or the settings afterwards sends no request.
+        - Every object, including nested ones, is linked back to the budget.
+    """
+    server.route(
+        "GET",
+        f"/budgets/{BUDGET_A}",
+        body={
+            "data": {
+                "budget": {
+                    "id": BUDGET_A,
+                    "name": "Test Budget",
+                    "date_format": {"format": "YYYY-MM-DD"},
+                    "currency_format": {"iso_code": "USD"},
+                    "accounts": [{"id": "account", "type": "checking"}],
+                    "payees": [{"id": "payee"}],
+                    "payee_locations": [],
+                    "category_groups": [{"id": "group"}],
+                    "categories": [{"id": "category", "category_group_id": "group"}],
+                    "months": [
+                        {"month": "2024-01-01", "categories": [{"id": "category"}]}
+                    ],
+                    "transactions": [transaction_json("t1")],
+                    "subtransactions": [],
+                    "scheduled_transactions": [
+                        {
+                            "id": "s1",
+                            "date_first": "2024-01-01",
+                            "date_next": "2024-02-01",
+                            "frequency": "monthly",
+                            "flag_color": None,
+                        }
+                    ],
+                    "scheduled_subtransactions": [
+                        {"id": "ss1", "scheduled_transaction_id": "s1"}
+                    ],
+                },
+                "server_knowledge": 1,
+            }
+        },
+    )
+
+    budget = schemas.Budget(pynab=test_pynab, _json={"id": BUDGET_A})
+    assert budget.hydrate() is budget
+    assert len(server.requests) == 1
+
+    assert budget.name == "Test Budget"
+    assert budget.settings.currency_format.iso_code == "USD"
+    assert list(budget.accounts) == ["account"]
+    assert list(budget.payees) == ["payee"]
+    assert len(budget.payee_locations) == 0
+    assert list(budget.category_groups) == ["group"]
+    assert list(budget.categories) == ["category"]
+    assert len(budget.months) == 1
+    assert list(budget.transactions) == ["t1"]
+    assert len(budget.subtransactions) == 0
+    assert list(budget.scheduled_transactions) == ["s1"]
+    assert list(budget.scheduled_subtransactions) == ["ss1"]
+    assert len(server.requests) == 1
+
+    assert budget.transactions["t1"].budget is budget
+    assert budget.scheduled_subtransactions["ss1"].budget is budget
+    assert list(budget.accounts["account"].transactions) == ["t1"]
+    for month in budget.months.values():
+        assert month.categories["category"].budget is budget
+    assert len(server.requests) == 1
+
+
+def test_hydrate_drops_entities_missing_from_full_budget(server):
+    """
+    Test that hydrating from a full budget removes entities it no longer lists.
+
+    Asserts:
+        - Transactions loaded before but missing from the full budget are removed.
+        - Categories missing from a category group of the full budget are removed.
+    """
+    server.route(
+        "GET",
+        f"/budgets/{BUDGET_A}",
+        body={
+            "data": {
+                "budget": {
+                    "id": BUDGET_A,
+                    "category_groups": [{"id": "group", "categories": [{"id": "c1"}]}],
+                    "transactions": [transaction_json("t1")],
+                },
+                "server_knowledge": 1,
+            }
+        },
+    )
+
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        budget = schemas.Budget(
+            pynab=test_pynab,
+            _json={
+                "id": BUDGET_A,
+                "category_groups": [
+                    {"id": "group", "categories": [{"id": "c1"}, {"id": "c2"}]}
+                ],
+                "transactions": [transaction_json("t1"), transaction_json("t2")],
+            },
+        )
+        group = budget.category_groups["group"]
+        assert budget.hydrate() is budget
+
+    assert list(budget.transactions) == ["t1"]
+    assert budget.category_groups["group"] is group
+    assert list(group.categories) == ["c1"]
+
+
+def test_update_transactions_sends_only_changes(server, test_pynab):
+    """
+    Test that updates send only changed fields and skip unchanged transactions.
+
+    Asserts:
+        - The PATCH body holds the ID and changed fields of changed transactions only.
+        - Updating unchanged transactions sends no request.
+        - A single transaction update sends only its changes.
+    """
+
+    def updated(method, path, request_json):
+        transactions = request_json.get("transactions") or [request_json["transaction"]]
+        data = {
+            "transaction_ids": [t.get("id", "t1") for t in transactions],
+            "transactions": [transaction_json(t.get("id", "t1")) for t in transactions],
+            "transaction": transaction_json("t1"),
+            "server_knowledge": 2,
+        }
+        return (209 if method == "PATCH" else 200), {"data": data}, {}
+
+    server.route("PATCH", f"/budgets/{BUDGET_A}/transactions", body=updated)
+    server.route("PUT", f"/budgets/{BUDGET_A}/transactions/t1", body=updated)
+
+    transactions = [
+        schemas.Transaction(pynab=test_pynab, _json=transaction_json(f"t{i}"))
+        for i in range(1, 4)
+    ]
+    transactions[1].memo = "recategorized"
+    transactions[1].category_id = "groceries"
+
+    result = test_pynab.api.update_transactions(
+        budget_id=BUDGET_A, transactions=transactions
+    )
+    assert result["transaction_ids"] == ["t2"]
+    assert server.requests[-1][2] == {
+        "transactions": [
+            {"id": "t2", "category_id": "groceries", "memo": "recategorized"}
+        ]
+    }
+
+    test_pynab.api.update_transactions(budget_id=BUDGET_A, transactions=transactions)
+    assert len(server.requests) == 1
+
+    transactions[0].approved = False
+    test_pynab.api.update_transaction(budget_id=BUDGET_A, transaction=transactions[0])
+    assert server.requests[-1][2] == {"transaction": {"approved": False}}
+    assert (
+        test_pynab.api.update_transaction(
+            budget_id=BUDGET_A, transaction=transactions[0]
+        )
+        is transactions[0]
+    )
+    assert len(server.requests) == 2
@@ -0,0 +1,132 @@
+from testing.conftest import transaction_json
+from testing.stub_server import StubServer
+from pynab import AsyncPynab
+from pynab import schemas
+import asyncio
+import threading
+import time
+
+BUDGET_IDS = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(4)]
+
+
+def test_async_api_gathers_across_budgets():
+    """
+    Test that `AsyncApi` calls can be fanned out with `asyncio.gather`.
+
+    Asserts:
+        - Each awaited `get_budget` returns the `schemas.Budget` that was requested.
+        - All requests share the pooled connections of the wrapped client.
+    """
+    with StubServer() as server:
+        for budget_id in BUDGET_IDS:
+            server.route(
+                "GET",
+                f"/budgets/{budget_id}",
+                body={"data": {"budget": {"id": budget_id}, "server_knowledge": 1}},
+            )
+
+        async def fetch():
+            async with AsyncPynab(
+                bearer="test", api_url=server.url, max_concurrency=2
+            ) as test_pynab:
+                return await test_pynab.gather(
+                    *(
+                        test_pynab.api.get_budget(budget_id=budget_id)
+                        for budget_id in BUDGET_IDS
+                    )
+                )
+
+        budgets = asyncio.run(fetch())
+
+    assert [budget.id for budget in budgets] == BUDGET_IDS
+    assert all(isinstance(budget, schemas.Budget) for budget in budgets)
+    assert server.connections <= 2
+
+
+def test_concurrent_deltas_merge_one_at_a_time(server):
+    """
+    Test that concurrent delta requests on one Pynab instance keep its tracking consistent.
+
+    Asserts:
+        - Every delta that finishes is merged into the one tracked collection.
+        - The tracked server knowledge is the newest one served.
+    """
+    lock = threading.Lock()
+    served = [0]
+
+    def transactions(method, path, request_json):
+        with lock:
+            served[0] += 1
+            knowledge = served[0]
+        # Each delta holds every change up to its server knowledge
+        items = [transaction_json(f"t{i}", amount=-i) for i in range(1, knowledge + 1)]
+        data = {"transactions": items, "server_knowledge": knowledge}
+        return 200, {"data": data}, {}
+
+    server.route("GET", "/budgets/last-used/transactions", body=transactions)
+
+    async def fetch():
+        async with AsyncPynab(
+            bearer="test",
+            api_url=server.url,
+            max_concurrency=8,
+            track_server_knowledge=True,
+            coalesce_requests=False,
+        ) as test_pynab:
+            full = await test_pynab.api.get_transactions()
+            merged = await test_pynab.gather(
+                *(test_pynab.api.get_transactions() for _ in range(40))
+            )
+            return test_pynab.pynab, full, merged
+
+    test_pynab, full, merged = asyncio.run(fetch())
+
+    assert all(collection is full for collection in merged)
+    assert sorted(full) == sorted(f"t{i}" for i in range(1, 42))
+    assert test_pynab.server_knowledges("get_transactions") == 41
+
+
+def test_older_delta_does_not_overwrite_newer(server):
+    """
+    Test that a delta finishing after a newer one was merged is not merged over it.
+
+    Asserts:
+        - The tracked transaction keeps the value of the newest delta.
+        - The tracked server knowledge does not go back.
+    """
+    lock = threading.Lock()
+    served = [0]
+
+    def transactions(method, path, request_json):
+        with lock:
+            served[0] += 1
+            knowledge = served[0]
+        if knowledge == 2:
+            # The older delta is answered last
+            time.sleep(0.3)
+        data = {
+            "transactions": [transaction_json("t1", amount=-knowledge)],
+            "server_knowledge": knowledge,
+        }
+        return 200, {"data": data}, {}
+
+    server.route("GET", "/budgets/last-used/transactions", body=transactions)
+
+    async def fetch():
+        async with AsyncPynab(
+            bearer="test",
+            api_url=server.url,
+            track_server_knowledge=True,
+            coalesce_requests=False,
+        ) as test_pynab:
+            full = await test_pynab.api.get_transactions()
+            older = asyncio.ensure_future(test_pynab.api.get_transactions())
+            await asyncio.sleep(0.1)
+            await test_pynab.api.get_transactions()
+            await older
+            return test_pynab.pynab, full
+
+    test_pynab, full = asyncio.run(fetch())
+
+    assert full["t1"].amount == -3
+    assert test_pynab.server_knowledges("get_transactions") == 3
@@ -0,0 +1,30 @@
+from testing.benchmarks.bench_suite import compare, run
+import copy
+
+
+def test_suite_runs_and_detects_regressions():
+    """
+    Test that the benchmark suite runs against the fake API and gates regressions.
+
+    Asserts:
+        - Every main `Api` method is served by the fake and measured.
+        - Walking a hydrated budget sends a single request.
+        - A slower latency or a lower throughput beyond the threshold is reported.
+    """
+    results = run(sizes=[50], repeat=1)
+    by_key = {(r["benchmark"], r["metric"]): r for r in results["results"]}
+
+    assert by_key[("get_transactions", "objects_per_second")]["value"] > 0
+    assert by_key[("fan_out", "requests_hydrated")]["value"] == 1
+    assert (
+        by_key[("fan_out", "requests_lazy")]["value"]
+        > by_key[("fan_out", "requests_hydrated")]["value"]
+    )
+    assert compare(results, results) == []
+
+    baseline = copy.deepcopy(results)
+    for r in baseline["results"]:
+        if r["benchmark"] == "get_payees":
+            r["value"] = r["value"] * 2 if r["unit"] == "1/s" else r["value"] / 2
+    regressed = {r["metric"] for r, _ in compare(results, baseline, threshold=0.2)}
+    assert regressed == {"latency_median", "latency_p95", "objects_per_second"}
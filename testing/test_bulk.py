@@ -0,0 +1,187 @@
+from pynab.bulk import BulkWriter
+from pynab import Pynab, enums, schemas
+from datetime import date, datetime
+import pytest
+
+BUDGET = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+def save_transaction(i: int):
+    """
+    Builds a transaction to create.
+
+    Args:
+        i (int): The sequence number of the transaction.
+
+    Returns:
+        dict: The transaction fields.
+    """
+    return {
+        "account_id": "account",
+        "date": "2024-01-15",
+        "amount": -i,
+        "memo": f"memo {i}",
+        "cleared": "cleared",
+        "approved": True,
+        "import_id": f"YNAB:{-i}:2024-01-15:1",
+    }
+
+
+@pytest.fixture
+def server(server):
+    """
+    Adds an endpoint creating transactions to the stub server.
+
+    Chunks holding a transaction with the memo "reject" fail with a 400, and
+    import IDs are reported as duplicates when they were seen before.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        StubServer: The stub server.
+    """
+    seen = set()
+
+    def create(method, path, request_json):
+        transactions = request_json.get("transactions") or [request_json["transaction"]]
+        if any(transaction["memo"] == "reject" for transaction in transactions):
+            error = {"id": "400", "name": "bad_request", "detail": "rejected"}
+            return 400, {"error": error}, {}
+        created, duplicates = [], []
+        for transaction in transactions:
+            if transaction["import_id"] in seen:
+                duplicates.append(transaction["import_id"])
+            else:
+                seen.add(transaction["import_id"])
+                created.append(
+                    dict(transaction, id=transaction["memo"], subtransactions=[])
+                )
+        data = {
+            "transaction_ids": [transaction["id"] for transaction in created],
+            "transactions": created,
+            "duplicate_import_ids": duplicates,
+            "server_knowledge": len(seen),
+        }
+        if "transaction" in request_json:
+            data["transaction"] = data.pop("transactions")[0]
+        return 201, {"data": data}, {}
+
+    server.route("POST", f"/budgets/{BUDGET}/transactions", body=create)
+    return server
+
+
+@pytest.fixture
+def test_pynab(server):
+    """
+    Creates a Pynab instance that talks to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Yields:
+        Pynab: The Pynab instance.
+    """
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        yield test_pynab
+
+
+def test_bulk_writer_chunks_and_aggregates(server, test_pynab):
+    """
+    Test that the bulk writer splits transactions and aggregates the chunks.
+
+    Asserts:
+        - No request holds more than `chunk_size` transactions or `max_bytes` of JSON.
+        - Transaction IDs are aggregated in order, duplicates are reported.
+        - A rejected chunk is reported with its transactions, the others are created.
+    """
+    transactions = [save_transaction(i) for i in range(1, 1001)]
+    transactions[-1] = dict(transactions[-1], import_id=transactions[0]["import_id"])
+    transactions[500] = dict(transactions[500], memo="reject")
+
+    writer = BulkWriter(
+        pynab=test_pynab, budget_id=BUDGET, chunk_size=100, max_bytes=16 * 1024
+    )
+    result = writer.create(transactions)
+
+    sizes = [
+        len(request_json["transactions"]) for _, _, request_json in server.requests
+    ]
+    assert sum(sizes) == 1000
+    assert max(sizes) <= 100
+    assert result.chunks == len(sizes) > 10
+
+    assert not result.ok
+    assert len(result.failures) == 1
+    failure = result.failures[0]
+    assert failure.status_code == 400
+    assert isinstance(failure.error, schemas.Error)
+    assert any(t["memo"] == "reject" for t in failure.transactions)
+    assert result.failed_transactions == failure.transactions
+
+    created = 1000 - len(failure.transactions) - 1
+    assert len(result.transaction_ids) == created
+    assert result.transaction_ids[0] == "memo 1"
+    assert result.duplicate_import_ids == [transactions[0]["import_id"]]
+
+
+def test_bulk_writer_serializes_dates_and_enums(server, test_pynab):
+    """
+    Test that dates and enums in transaction dictionaries are sent as JSON values.
+
+    Asserts:
+        - A `date` or `datetime` is sent as an ISO date, an enum as its value.
+        - The chunk is created instead of failing to encode.
+    """
+    transactions = [
+        dict(save_transaction(1), date=date(2024, 1, 1)),
+        dict(
+            save_transaction(2),
+            date=datetime(2024, 1, 2, 12, 30),
+            cleared=enums.TransactionClearedStatus.RECONCILED,
+            flag_color=enums.TransactionFlagColor.RED,
+        ),
+    ]
+    result = BulkWriter(pynab=test_pynab, budget_id=BUDGET).create(transactions)
+
+    assert result.ok
+    sent = server.requests[0][2]["transactions"]
+    assert [t["date"] for t in sent] == ["2024-01-01", "2024-01-02"]
+    assert (sent[1]["cleared"], sent[1]["flag_color"]) == ("reconciled", "red")
+
+
+def test_create_transactions_sends_every_transaction(server, test_pynab):
+    """
+    Test that `create_transactions` serializes each transaction, not the first one repeatedly.
+
+    Asserts:
+        - The request body holds every transaction, with their subtransactions.
+        - A single transaction returns the IDs and the created transaction.
+    """
+    transactions = [
+        schemas.Transaction(
+            _json=dict(
+                save_transaction(i),
+                flag_color=None,
+                subtransactions=[{"id": "sub", "amount": -i, "memo": "split"}],
+            )
+        )
+        for i in range(1, 4)
+    ]
+    created = test_pynab.api.create_transactions(
+        budget_id=BUDGET, transactions=transactions
+    )
+    _, _, request_json = server.requests[-1]
+    assert [t["memo"] for t in request_json["transactions"]] == [
+        "memo 1",
+        "memo 2",
+        "memo 3",
+    ]
+    assert request_json["transactions"][1]["subtransactions"][0]["amount"] == -2
+    assert [transaction.id for transaction in created] == ["memo 1", "memo 2", "memo 3"]
+
+    single = test_pynab.api.create_transactions(
+        budget_id=BUDGET, transactions=[save_transaction(4)]
+    )
+    assert single["transaction_ids"] == ["memo 4"]
+    assert single["transaction"].amount == -4
@@ -0,0 +1,130 @@
+from pynab.cache import ResponseCache
+from pynab import Pynab
+import pytest
+import time
+
+BUDGET_A = "aaaaaaaa-0000-0000-0000-000000000000"
+BUDGET_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def server(server):
+    """
+    Adds the user, categories and transactions endpoints of two budgets to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        StubServer: The stub server.
+    """
+    server.route("GET", "/user", body={"data": {"user": {"id": "user"}}})
+    for budget_id in (BUDGET_A, BUDGET_B):
+        server.route(
+            "GET",
+            f"/budgets/{budget_id}/categories",
+            body={"data": {"category_groups": [], "server_knowledge": 1}},
+        )
+        server.route(
+            "GET",
+            f"/budgets/{budget_id}/transactions",
+            body={"data": {"transactions": [], "server_knowledge": 1}},
+        )
+        server.route(
+            "PATCH",
+            f"/budgets/{budget_id}/categories/category",
+            body={"data": {"category": {"id": "category"}}},
+        )
+    return server
+
+
+def paths(server):
+    """
+    Returns the paths of the requests the stub server received.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        list: The request paths relative to the API root, in order.
+    """
+    return [path[len("/v1") :] for _, path, _ in server.requests]
+
+
+def test_cached_endpoints_skip_the_network(server):
+    """
+    Test that repeated GETs of cached endpoints are served from the cache.
+
+    Asserts:
+        - The user and categories are fetched once; transactions every time.
+        - Hits and misses are counted for cacheable endpoints only.
+    """
+    cache = ResponseCache()
+    with Pynab(bearer="test", api_url=server.url, cache=cache) as test_pynab:
+        for _ in range(3):
+            test_pynab.api.get_user()
+            test_pynab.api.get_categories(budget_id=BUDGET_A)
+            test_pynab.api.get_transactions(budget_id=BUDGET_A)
+
+    assert paths(server).count("/user") == 1
+    assert paths(server).count(f"/budgets/{BUDGET_A}/categories") == 1
+    assert paths(server).count(f"/budgets/{BUDGET_A}/transactions") == 3
+    assert cache.stats()["hits"] == 4
+    assert cache.stats()["misses"] == 2
+    assert len(cache) == 2
+
+
+def test_writes_invalidate_their_budget(server):
+    """
+    Test that a write drops the cached responses of its budget only.
+
+    Asserts:
+        - Updating a category of budget A refetches A's categories.
+        - Budget B's categories and the user stay cached.
+    """
+    cache = ResponseCache()
+    with Pynab(bearer="test", api_url=server.url, cache=cache) as test_pynab:
+        endpoints = test_pynab.api.endpoints
+        for budget_id in (BUDGET_A, BUDGET_B):
+            endpoints.request_get_categories(budget_id=budget_id)
+        endpoints.request_get_user()
+
+        endpoints.request_update_category(
+            budget_id=BUDGET_A, category_id="category", request_body={}
+        )
+        assert cache.invalidations == 1
+
+        for budget_id in (BUDGET_A, BUDGET_B):
+            endpoints.request_get_categories(budget_id=budget_id)
+        endpoints.request_get_user()
+
+    assert paths(server).count(f"/budgets/{BUDGET_A}/categories") == 2
+    assert paths(server).count(f"/budgets/{BUDGET_B}/categories") == 1
+    assert paths(server).count("/user") == 1
+
+
+def test_ttl_and_lru_eviction(server):
+    """
+    Test that entries expire after their TTL and are evicted by size.
+
+    Asserts:
+        - An expired response is fetched again.
+        - Exceeding `max_bytes` evicts the least recently used response.
+    """
+    cache = ResponseCache(ttls={"/user": 0.2, "/budgets/*/categories": 60})
+    with Pynab(bearer="test", api_url=server.url, cache=cache) as test_pynab:
+        endpoints = test_pynab.api.endpoints
+        endpoints.request_get_user()
+        time.sleep(0.3)
+        endpoints.request_get_user()
+        assert paths(server).count("/user") == 2
+
+        size = len(endpoints.request_get_categories(budget_id=BUDGET_A).content)
+        cache.max_bytes = 2 * size
+        endpoints.request_get_categories(budget_id=BUDGET_B)
+        endpoints.request_get_categories(budget_id=BUDGET_A)
+
+    assert cache.evictions == 1
+    assert cache.size <= cache.max_bytes
+    assert len(cache) == 2
+    assert cache.get("/user") is None
@@ -0,0 +1,46 @@
+from testing.conftest import transaction_json
+from pynab.frame import TransactionFrame
+from pynab import enums
+from datetime import date
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def test_transaction_frame():
+    """
+    Test that a frame built from API JSON filters, groups and converts back.
+
+    Asserts:
+        - Columns have the documented dtypes and codes.
+        - Masks select the matching rows.
+        - Sums by category and by month match the amounts.
+        - Rows convert back into transactions.
+    """
+    rows = [transaction_json(f"t{i}", amount=-1000 * (i + 1)) for i in range(4)]
+    rows[1].update(category_id="other", date="2024-02-03", cleared="uncleared")
+    rows[3].update(category_id=None, flag_color="red")
+
+    frame = TransactionFrame.from_json(transactions=rows)
+
+    assert frame.amount.dtype == np.int64
+    assert frame.date.dtype == np.dtype("datetime64[D]")
+    assert frame.labels["category_id"] == ["category", "other"]
+    assert frame.category_id.tolist() == [0, 1, 0, -1]
+
+    uncleared = frame[frame.where(cleared=enums.TransactionClearedStatus.UNCLEARED)]
+    assert uncleared.id.tolist() == ["t1"]
+    assert len(frame[frame.where(flag_color="red", max_amount=-4000)]) == 1
+    assert len(frame[frame.where(payee_id="missing")]) == 0
+    assert frame[frame.where(since_date="2024-02-01")].id.tolist() == ["t1"]
+
+    assert frame.sum_by("category_id") == {
+        "category": -4000,
+        "other": -2000,
+        None: -4000,
+    }
+    assert frame.sum_by("month") == {date(2024, 1, 1): -8000, date(2024, 2, 1): -2000}
+
+    transactions = frame[frame.amount < -2000].to_transactions()
+    assert list(transactions) == ["t2", "t3"]
+    assert transactions["t3"].flag_color == enums.TransactionFlagColor.RED
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from pynab import Pynab
+from pynab import schemas
+from pynab.retry import RetryPolicy
+import pytest
+import requests
+import time
+
+USER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def server(server):
+    """
+    Adds the user endpoint to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        StubServer: The stub server.
+    """
+    server.route("GET", "/user", body={"data": {"user": {"id": USER_ID}}})
+    return server
+
+
+def test_pooled_session_reuses_connection(server):
+    """
+    Test that a Pynab instance sends all of its requests over one pooled connection.
+
+    Asserts:
+        - Every request returns a `schemas.User`.
+        - The stub server accepted a single TCP connection.
+    """
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        for _ in range(5):
+            user = test_pynab.api.get_user()
+            assert isinstance(user, schemas.User)
+            assert user.id == USER_ID
+    assert server.connections == 1
+
+
+def test_keep_alive_disabled_opens_connection_per_request(server):
+    """
+    Test that `keep_alive=False` opens a fresh connection for each request.
+
+    Asserts:
+        - The stub server accepted one TCP connection per request.
+    """
+    with Pynab(bearer="test", api_url=server.url, keep_alive=False) as test_pynab:
+        for _ in range(3):
+            test_pynab.api.get_user()
+    assert server.connections == 3
+
+
+def flaky(failures: int, status: int = 503):
+    """
+    Builds a stub route body that fails `failures` times before succeeding.
+
+    Args:
+        failures (int): The number of failing responses to send first.
+        status (int, optional): The status of the failing responses. Defaults to 503.
+
+    Returns:
+        callable: A `StubServer` route body.
+    """
+    calls = []
+
+    def body(method, path, request_json):
+        calls.append(path)
+        if len(calls) <= failures:
+            error = {"error": {"id": str(status), "name": "unavailable", "detail": ""}}
+            return status, error, {"Retry-After": "0"}
+        return 200, {"data": {"user": {"id": USER_ID}}}, {}
+
+    return body
+
+
+def test_transient_errors_are_retried(server):
+    """
+    Test that idempotent requests are retried on transient statuses.
+
+    Asserts:
+        - The request succeeds after two 503 responses.
+        - The per-attempt timings record both failures and the final success.
+    """
+    server.route("GET", "/user", body=flaky(2))
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        response = test_pynab.api.endpoints.request_get_user()
+
+    assert response.status_code == 200
+    assert [attempt.status_code for attempt in response.attempts] == [503, 503, 200]
+    assert all(attempt.elapsed > 0 for attempt in response.attempts)
+
+
+def test_retry_after_is_capped_at_max_backoff():
+    """
+    Test that a Retry-After header is honoured up to the policy's maximum backoff.
+
+    Asserts:
+        - A shorter Retry-After is used as is.
+        - A longer one, in seconds or as a date, is capped at `max_backoff`.
+    """
+    policy = RetryPolicy(max_backoff=5.0)
+    response = requests.Response()
+    for value, expected in [
+        ("2", 2.0),
+        ("3600", 5.0),
+        ("Fri, 31 Dec 9999 23:59:59 GMT", 5.0),
+    ]:
+        response.headers["Retry-After"] = value
+        assert policy.delay(attempt=1, response=response) == expected
+
+
+def test_non_idempotent_requests_are_not_retried(server):
+    """
+    Test that POST requests are only retried when the caller opts in.
+
+    Asserts:
+        - A POST is not retried by default.
+        - A POST is retried with `retry=True`.
+    """
+    server.route("POST", "/user", body=flaky(2))
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        http_utils = test_pynab.api.endpoints.http_utils
+        assert http_utils.request("POST", endpoint="/user", json={}).status_code == 503
+        response = http_utils.request("POST", endpoint="/user", json={}, retry=True)
+
+    assert response.status_code == 200
+    assert len(response.attempts) == 2
+
+
+@pytest.mark.parametrize("coalesce_requests, expected", [(True, 1), (False, 8)])
+def test_concurrent_identical_gets_are_coalesced(server, coalesce_requests, expected):
+    """
+    Test that concurrent identical GETs share one request in flight.
+
+    Asserts:
+        - With coalescing, eight concurrent `get_user` calls send a single request
+          and parse its body once; without it, each call sends its own.
+        - A GET sent after the shared one completes goes out on its own.
+    """
+
+    def slow_user(method, path, request_json):
+        time.sleep(0.5)
+        return 200, {"data": {"user": {"id": USER_ID}}}, {}
+
+    server.route("GET", "/user", body=slow_user)
+
+    with Pynab(
+        bearer="test", api_url=server.url, coalesce_requests=coalesce_requests
+    ) as test_pynab:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(
+                executor.map(
+                    lambda _: test_pynab.api.endpoints.request_get_user(), range(8)
+                )
+            )
+        assert len(server.requests) == expected
+        assert len({id(response) for response in responses}) == expected
+        if coalesce_requests:
+            assert responses[0].json() is responses[-1].json()
+        assert test_pynab._in_flight == {}
+
+        test_pynab.api.get_user()
+        assert len(server.requests) == expected + 1
@@ -0,0 +1,142 @@
+from pynab.ingest import ImportIndex, Ingestor, read_csv
+from pynab import Pynab
+from datetime import date
+import io
+import pytest
+
+BUDGET = "aaaaaaaa-0000-0000-0000-000000000000"
+
+CSV = """Date,Payee,Amount,Memo
+01/15/2024,Grocer,-12.34,
+01/15/2024,Grocer,-12.34,second visit
+01/16/2024,Employer,"2,500.00",Salary
+"""
+
+
+@pytest.fixture
+def server(server):
+    """
+    Adds an endpoint creating transactions to the stub server.
+
+    Import IDs listed in `server.existing` are reported as duplicates.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        StubServer: The stub server.
+    """
+
+    def create(method, path, request_json):
+        transactions = request_json["transactions"]
+        duplicates = [
+            t["import_id"] for t in transactions if t["import_id"] in server.existing
+        ]
+        data = {
+            "transaction_ids": [
+                t["import_id"] for t in transactions if t["import_id"] not in duplicates
+            ],
+            "transactions": [],
+            "duplicate_import_ids": duplicates,
+        }
+        return 201, {"data": data}, {}
+
+    server.existing = set()
+    server.route("POST", f"/budgets/{BUDGET}/transactions", body=create)
+    return server
+
+
+def test_ingest_is_idempotent(server, tmp_path):
+    """
+    Test that ingesting the same CSV twice only sends its rows once.
+
+    Asserts:
+        - Import IDs follow YNAB's format, counting same-day, same-amount rows.
+        - Duplicates reported by the API are indexed like created rows.
+        - A second run with the same index sends no request.
+    """
+    server.existing.add("YNAB:2500000:2024-01-16:1")
+    path = str(tmp_path / "imports.sqlite")
+
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        with ImportIndex(path=path) as index:
+            rows = read_csv(
+                io.StringIO(CSV), account_id="account", date_format="%m/%d/%Y"
+            )
+            result = Ingestor(
+                pynab=test_pynab, budget_id=BUDGET, index=index, batch_size=2
+            ).ingest(rows)
+
+        assert (result.rows, result.skipped) == (3, 0)
+        assert result.ok
+        assert result.transaction_ids == [
+            "YNAB:-12340:2024-01-15:1",
+            "YNAB:-12340:2024-01-15:2",
+        ]
+        assert result.duplicate_import_ids == ["YNAB:2500000:2024-01-16:1"]
+        assert len(server.requests) == 2
+        assert server.requests[0][2]["transactions"][1]["memo"] == "second visit"
+
+        with ImportIndex(path=path) as index:
+            assert len(index) == 3
+            rows = read_csv(
+                io.StringIO(CSV), account_id="account", date_format="%m/%d/%Y"
+            )
+            again = Ingestor(pynab=test_pynab, budget_id=BUDGET, index=index).ingest(
+                rows
+            )
+
+        assert (again.rows, again.skipped) == (3, 3)
+        assert len(server.requests) == 2
+
+
+def test_ingest_twice_on_one_ingestor(server):
+    """
+    Test that one Ingestor generates the same import IDs on every run.
+
+    Asserts:
+        - The occurrences of the first run do not carry over to the second.
+        - The second run skips every row and sends no request.
+    """
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        ingestor = Ingestor(pynab=test_pynab, budget_id=BUDGET)
+        first = ingestor.ingest(
+            read_csv(io.StringIO(CSV), account_id="account", date_format="%m/%d/%Y")
+        )
+        again = ingestor.ingest(
+            read_csv(io.StringIO(CSV), account_id="account", date_format="%m/%d/%Y")
+        )
+
+    assert len(first.transaction_ids) == 3
+    assert (again.rows, again.skipped) == (3, 3)
+    assert len(server.requests) == 1
+
+
+def test_ingest_accepts_rows_with_import_ids(server):
+    """
+    Test that rows keep their own import IDs and repeated rows are sent once.
+
+    Asserts:
+        - An explicit import ID is used as is.
+        - A row repeated within a batch is only sent once.
+    """
+    rows = [
+        {"account_id": "account", "date": "2024-01-15", "amount": -1000},
+        {
+            "account_id": "account",
+            "date": date(2024, 1, 15),
+            "amount": -1000,
+            "import_id": "bank:42",
+        },
+        {
+            "account_id": "account",
+            "date": date(2024, 1, 15),
+            "amount": -1000,
+            "import_id": "bank:42",
+        },
+    ]
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        result = Ingestor(pynab=test_pynab, budget_id=BUDGET).ingest(rows)
+
+    assert result.transaction_ids == ["YNAB:-1000:2024-01-15:1", "bank:42"]
+    assert result.skipped == 1
@@ -0,0 +1,132 @@
+from testing.stub_server import StubServer
+from testing.conftest import transaction_json
+from pynab.instrumentation import Instrumentation, endpoint_template
+from pynab.retry import RetryPolicy
+from pynab.transport import Transport
+from pynab import Pynab
+import pytest
+
+BUDGET = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+@pytest.mark.parametrize(
+    "endpoint, template",
+    [
+        ("/user", "/user"),
+        (
+            f"/budgets/{BUDGET}/transactions?since_date=2024-01-01",
+            "/budgets/{budget_id}/transactions",
+        ),
+        (
+            "/budgets/last-used/accounts/a1/transactions",
+            "/budgets/{budget_id}/accounts/{account_id}/transactions",
+        ),
+        (
+            "/budgets/last-used/months/2024-01-01/categories/c1",
+            "/budgets/{budget_id}/months/{month}/categories/{category_id}",
+        ),
+        (
+            "/budgets/last-used/transactions/import",
+            "/budgets/{budget_id}/transactions/import",
+        ),
+    ],
+)
+def test_endpoint_template(endpoint, template):
+    """
+    Test that IDs and query strings are left out of endpoint templates.
+
+    Args:
+        endpoint (str): The endpoint.
+        template (str): The expected template.
+
+    Asserts:
+        - The template of the endpoint is as expected.
+    """
+    assert endpoint_template(endpoint) == template
+
+
+def test_requests_are_hooked_and_counted():
+    """
+    Test that requests run the hooks and are counted per endpoint template.
+
+    Asserts:
+        - The hooks see the method, template, status, size and retry count of each request.
+        - Requests of different IDs are counted under one template; a retried request once.
+        - JSON decoding and schema construction are timed separately.
+    """
+    calls = []
+
+    def flaky(method, path, request_json):
+        calls.append(path)
+        if len(calls) == 1:
+            return 503, {"error": {"id": "503"}}, {"Retry-After": "0"}
+        return 200, {"data": {"transaction": transaction_json("t2")}}, {}
+
+    with StubServer() as server:
+        server.route(
+            "GET",
+            f"/budgets/{BUDGET}/transactions/t1",
+            body={"data": {"transaction": transaction_json("t1")}},
+        )
+        server.route("GET", f"/budgets/{BUDGET}/transactions/t2", body=flaky)
+
+        instrumentation = Instrumentation()
+        before, after = [], []
+        instrumentation.before_request.append(before.append)
+        instrumentation.after_request.append(after.append)
+        with Pynab(
+            bearer="test",
+            api_url=server.url,
+            retry_policy=RetryPolicy(backoff_factor=0),
+            instrumentation=instrumentation,
+        ) as test_pynab:
+            test_pynab.api.get_transaction(budget_id=BUDGET, transaction_id="t1")
+            test_pynab.api.get_transaction(budget_id=BUDGET, transaction_id="t2")
+
+    template = "/budgets/{budget_id}/transactions/{transaction_id}"
+    assert before == after
+    assert [(e.method, e.template, e.status_code, e.retries) for e in after] == [
+        ("GET", template, 200, 0),
+        ("GET", template, 200, 1),
+    ]
+    assert all(e.bytes > 0 and e.total >= e.ttfb for e in after)
+    assert after[0].dns is None
+
+    snapshot = instrumentation.snapshot()
+    stats = snapshot["endpoints"][f"GET {template}"]
+    assert (stats["requests"], stats["retries"], stats["errors"]) == (2, 1, 0)
+    assert stats["statuses"] == {200: 2}
+    assert stats["latency"]["count"] == stats["decode"]["count"] == 2
+    assert stats["latency"]["buckets"][float("inf")] == 2
+    assert snapshot["builds"]["get_transaction"]["count"] == 2
+
+
+def test_failed_requests_are_finished():
+    """
+    Test that a request failing with any exception still runs the after hooks.
+
+    Asserts:
+        - The exception is raised to the caller.
+        - The after hooks see the request with its error, and it is counted as an error.
+    """
+
+    class BrokenTransport(Transport):
+        def send(self, method="GET", url=None, json=None, **kwargs):
+            raise ValueError("invalid header")
+
+    instrumentation = Instrumentation()
+    after = []
+    instrumentation.after_request.append(after.append)
+    with Pynab(
+        bearer="test",
+        api_url="http://localhost",
+        transport=BrokenTransport(),
+        instrumentation=instrumentation,
+    ) as test_pynab:
+        with pytest.raises(ValueError):
+            test_pynab.api.get_transaction(budget_id=BUDGET, transaction_id="t1")
+
+    assert [type(event.error) for event in after] == [ValueError]
+    assert after[0].total is not None
+    stats = instrumentation.snapshot()["endpoints"]
+    assert [(s["requests"], s["errors"]) for s in stats.values()] == [(1, 1)]
@@ -0,0 +1,134 @@
+from testing.stub_server import StubServer
+from pynab.cache import ResponseCache
+from pynab.metrics import CONTENT_TYPE, Metrics, MetricsServer
+from pynab import Pynab, schemas
+import pytest
+import requests
+import threading
+
+BUDGET = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+def samples(text: str = ""):
+    """
+    Parses the samples of a Prometheus text exposition.
+
+    Args:
+        text (str): The exposition.
+
+    Returns:
+        dict: The sample values, keyed by sample name with labels.
+    """
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_metrics_are_exposed_for_scraping():
+    """
+    Test that request, error, rate limit, cache and sync metrics are scraped over HTTP.
+
+    Asserts:
+        - Requests are counted per endpoint template and status, with latency histograms.
+        - API errors are counted by error ID.
+        - The rate limit budget, cache counters and sync lag are exposed.
+    """
+    with StubServer() as server:
+        server.route(
+            "GET",
+            "/user",
+            body={"data": {"user": {"id": "user"}}},
+            headers={"X-Rate-Limit": "3/200"},
+        )
+        server.route(
+            "GET",
+            f"/budgets/{BUDGET}/accounts",
+            body={"data": {"accounts": [], "server_knowledge": 5}},
+        )
+
+        metrics = Metrics()
+        test_pynab = metrics.register(
+            Pynab(
+                bearer="test",
+                api_url=server.url,
+                cache=ResponseCache(),
+                track_server_knowledge=True,
+            ),
+            client="main",
+        )
+        with pytest.raises(ValueError):
+            metrics.register(Pynab(bearer="test"), client="main")
+
+        with test_pynab, metrics.serve(port=0) as metrics_server:
+            test_pynab.api.get_user()
+            test_pynab.api.get_user()
+            test_pynab.api.get_accounts(budget_id=BUDGET)
+            error = test_pynab.api.get_payees(budget_id=BUDGET)
+            assert isinstance(error, schemas.Error)
+
+            response = requests.get(metrics_server.url)
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert requests.get(metrics_server.url + "/other").status_code == 404
+
+    values = samples(response.text)
+    user = 'client="main",method="GET",endpoint="/user"'
+    payees = 'client="main",method="GET",endpoint="/budgets/{budget_id}/payees"'
+    assert values[f'pynab_requests_total{{{user},status="200"}}'] == 1
+    assert values[f'pynab_requests_total{{{payees},status="404"}}'] == 1
+    assert values[f"pynab_request_errors_total{{{payees}}}"] == 1
+    assert values[f'pynab_request_duration_seconds_bucket{{{user},le="+Inf"}}'] == 1
+    assert values[f"pynab_request_duration_seconds_count{{{user}}}"] == 1
+    assert (
+        values['pynab_schema_build_seconds_count{client="main",api_method="get_user"}']
+        == 2
+    )
+    assert values['pynab_api_errors_total{client="main",error_id="404.2"}'] == 1
+    assert values['pynab_rate_limit_remaining{client="main"}'] == 195
+    assert values['pynab_cache_hits_total{client="main"}'] == 1
+    assert values['pynab_cache_hit_ratio{client="main"}'] == pytest.approx(1 / 3)
+    lag = values[f'pynab_sync_lag_seconds{{client="main",budget_id="{BUDGET}"}}']
+    assert 0 <= lag < 60
+
+
+def test_rate_limit_is_omitted_until_known():
+    """
+    Test that the rate limit gauge is only exposed once something tracks it.
+
+    Asserts:
+        - Without a rate limiter or a rate limit header, no sample is exposed, even after requests.
+        - With a rate limiter, its remaining tokens are exposed.
+    """
+    with StubServer() as server:
+        server.route("GET", "/user", body={"data": {"user": {"id": "user"}}})
+
+        metrics = Metrics()
+        untracked = metrics.register(
+            Pynab(bearer="test", api_url=server.url, rate_limit=False),
+            client="untracked",
+        )
+        limited = metrics.register(
+            Pynab(bearer="test", api_url=server.url), client="limited"
+        )
+        with untracked, limited:
+            untracked.api.get_user()
+            limited.api.get_user()
+            values = samples(metrics.exposition())
+
+    assert 'pynab_rate_limit_remaining{client="untracked"}' not in values
+    assert values['pynab_rate_limit_remaining{client="limited"}'] == 199
+
+
+def test_unstarted_metrics_server_closes():
+    """
+    Test that closing a metrics server that was never started returns.
+
+    Asserts:
+        - `close` returns instead of waiting for a serving loop that never ran.
+    """
+    metrics_server = MetricsServer(metrics=Metrics(), port=0)
+    closing = threading.Thread(target=metrics_server.close, daemon=True)
+    closing.start()
+    closing.join(timeout=5)
+    assert not closing.is_alive()
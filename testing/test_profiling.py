@@ -0,0 +1,57 @@
+from testing.benchmarks.fake_ynab import FakeYnab
+from pynab.profiling import PropertyProfiler, PropertyStats
+from pynab import Pynab, schemas
+import json
+import pytest
+
+
+def test_profiler_attributes_fetches_and_scans_to_access_sites(tmp_path):
+    """
+    Test that property accesses are grouped by site, with their fetches and scans.
+
+    Asserts:
+        - A property read in a loop is one row, counting every access.
+        - The access that fetched a collection, and the one that built an index, are flagged.
+        - The schema classes are restored when the profiler stops, and only one profiler runs at a time.
+    """
+    with FakeYnab(transactions=30, accounts=3) as fake:
+        with Pynab(bearer="test", api_url=fake.url, rate_limit=False) as test_pynab:
+            budget = schemas.Budget(pynab=test_pynab, _json={"id": fake.budget.id})
+            original = schemas.Transaction.payee
+
+            with PropertyProfiler() as profiler:
+                with pytest.raises(RuntimeError):
+                    PropertyProfiler().start()
+                for transaction in budget.transactions.values():
+                    transaction.payee
+                for account in budget.accounts.values():
+                    account.transactions
+
+            assert schemas.Transaction.payee is original
+
+    # Sum the rows of each property over the access sites in this file
+    stats = {}
+    for row in profiler.sorted_stats():
+        if __file__ in row.site:
+            total = stats.setdefault(row.name, PropertyStats(name=row.name))
+            for field in ("count", "fetches", "requests", "scans", "scanned"):
+                setattr(total, field, getattr(total, field) + getattr(row, field))
+    assert (stats["Transaction.payee"].count, stats["Transaction.payee"].fetches) == (
+        30,
+        1,
+    )
+    assert (stats["Budget.payees"].count, stats["Budget.payees"].requests) == (30, 1)
+    assert stats["Budget.transactions"].fetches == 1
+    assert (
+        stats["Account.transactions"].count,
+        stats["Account.transactions"].scans,
+    ) == (
+        3,
+        1,
+    )
+    assert stats["Account.transactions"].scanned == 30
+    assert "Transaction.payee at " in profiler.report()
+
+    path = tmp_path / "profile.json"
+    profiler.dump(str(path))
+    assert {row["name"] for row in json.loads(path.read_text())} >= set(stats)
@@ -0,0 +1,40 @@
+from pynab.rate_limit import RateLimiter
+import pytest
+import time
+
+
+def test_rate_limiter_queues_when_empty():
+    """
+    Test that requests beyond the bucket size are paced at the refill rate.
+
+    Asserts:
+        - The first `limit` acquisitions do not wait.
+        - The next acquisition waits roughly one refill interval.
+    """
+    rate_limiter = RateLimiter(limit=2, period=0.2)
+
+    assert rate_limiter.acquire() == 0
+    assert rate_limiter.acquire() == 0
+
+    start = time.monotonic()
+    waited = rate_limiter.acquire()
+    assert waited == pytest.approx(0.1, abs=0.05)
+    assert time.monotonic() - start >= waited
+
+
+def test_rate_limiter_follows_header():
+    """
+    Test that the bucket is re-synchronised from the `x-rate-limit` header.
+
+    Asserts:
+        - A nearly exhausted window leaves a single request without a wait.
+        - Once that request is spent the projected wait is one refill interval.
+    """
+    rate_limiter = RateLimiter()
+    assert rate_limiter.wait_time() == 0
+
+    rate_limiter.update_from_header("199/200")
+    assert rate_limiter.wait_time() == 0
+
+    rate_limiter.update_from_header("200/200")
+    assert rate_limiter.wait_time() == pytest.approx(18.0, abs=0.1)
@@ -0,0 +1,138 @@
+from testing.conftest import transaction_json
+from pynab import Pynab, enums, schemas, utils
+import pytest
+
+
+@pytest.mark.parametrize("keep_json", [True, False])
+def test_transaction_is_slotted(keep_json):
+    """
+    Test that transactions are slotted and only keep their JSON when asked to.
+
+    Asserts:
+        - Transactions and subtransactions have no instance `__dict__`.
+        - The raw JSON is kept or dropped according to `keep_json`.
+        - Parsed attributes are unaffected.
+    """
+    _json = transaction_json("t1")
+    _json["subtransactions"] = [{"id": "s1", "transaction_id": "t1", "amount": -500}]
+
+    with Pynab(bearer="test", keep_json=keep_json) as test_pynab:
+        transaction = schemas.Transaction(pynab=test_pynab, _json=_json)
+
+    subtransaction = transaction.subtransactions["s1"]
+    assert not hasattr(transaction, "__dict__")
+    assert not hasattr(subtransaction, "__dict__")
+    assert (transaction._json is _json) is keep_json
+    assert (subtransaction._json is not None) is keep_json
+    assert transaction.amount == -1000
+    assert subtransaction.amount == -500
+
+
+def test_lazy_transaction_decodes_on_access():
+    """
+    Test that lazily decoded fields are decoded on first access and cached.
+
+    Asserts:
+        - Lazy fields are not decoded when the transaction is created.
+        - Accessing a field decodes it once; later accesses return the cached value.
+        - The JSON is kept even when `keep_json` is False.
+    """
+    _json = transaction_json("t1")
+    _json["subtransactions"] = [{"id": "s1", "transaction_id": "t1", "amount": -500}]
+
+    with Pynab(bearer="test", lazy=True, keep_json=False) as test_pynab:
+        transaction = schemas.Transaction(pynab=test_pynab, _json=_json)
+
+    assert transaction._date is schemas._UNSET
+    assert transaction._subtransactions is schemas._UNSET
+    assert transaction._json is _json
+
+    assert transaction.date.isoformat() == "2024-01-15"
+    assert transaction.date is transaction._date
+    assert transaction._cleared is schemas._UNSET
+    assert list(transaction.subtransactions) == ["s1"]
+    assert transaction.subtransactions is transaction.subtransactions
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_transaction_changes(lazy):
+    """
+    Test that a transaction reports only the writable fields that changed.
+
+    Asserts:
+        - A freshly loaded transaction has no changes.
+        - Changed fields are returned as JSON values; unread lazy fields are skipped.
+        - `mark_clean` makes the current values the new baseline.
+        - Without the JSON, only assigned fields are returned, never untouched subtransactions.
+    """
+    with Pynab(bearer="test", lazy=lazy) as test_pynab:
+        transaction = schemas.Transaction(
+            pynab=test_pynab, _json=transaction_json("t1")
+        )
+        assert transaction.changes() == {}
+
+        transaction.category_id = "groceries"
+        transaction.cleared = enums.TransactionClearedStatus.RECONCILED
+        assert transaction.changes() == {
+            "category_id": "groceries",
+            "cleared": "reconciled",
+        }
+        assert (transaction._date is schemas._UNSET) is lazy
+
+        transaction.mark_clean()
+        assert transaction.changes() == {}
+
+    with Pynab(bearer="test", keep_json=False) as test_pynab:
+        transaction = schemas.Transaction(
+            pynab=test_pynab, _json=transaction_json("t1")
+        )
+    assert transaction.changes() == {}
+
+    transaction.amount = -2000
+    transaction.category_id = "groceries"
+    saved = transaction.changes()
+    assert saved == {"amount": -2000, "category_id": "groceries"}
+
+    transaction.amount = -3000
+    transaction.mark_clean(saved)
+    assert transaction.changes() == {"amount": -3000}
+    transaction.mark_clean()
+    assert transaction.changes() == {}
+
+
+def test_edited_transactions_are_found_by_new_value():
+    """
+    Test that `_dict.by` lookups see relationship fields edited in place.
+
+    Asserts:
+        - A transaction whose category was changed is found under the new category, not the old one.
+        - The same holds for subtransactions.
+    """
+    _json = transaction_json("t0")
+    _json["subtransactions"] = [{"id": "s1", "transaction_id": "t0", "payee_id": "a"}]
+    transactions = utils._dict(
+        (t.id, t)
+        for t in (
+            schemas.Transaction(_json=_json),
+            schemas.Transaction(_json=transaction_json("t1")),
+        )
+    )
+    subtransactions = transactions["t0"].subtransactions
+    assert list(
+        transactions.by(field="category_id", value="category", first=False)
+    ) == [
+        "t0",
+        "t1",
+    ]
+    assert subtransactions.by(field="payee_id", value="b") == {}
+
+    transactions["t0"].category_id = "groceries"
+    subtransactions["s1"].payee_id = "b"
+
+    assert list(
+        transactions.by(field="category_id", value="groceries", first=False)
+    ) == ["t0"]
+    assert list(
+        transactions.by(field="category_id", value="category", first=False)
+    ) == ["t1"]
+    assert subtransactions.by(field="payee_id", value="b") is subtransactions["s1"]
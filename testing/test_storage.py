@@ -0,0 +1,153 @@
+from testing.conftest import transaction_json
+from urllib.parse import parse_qs, urlsplit
+from pynab.storage import SqliteStorage
+from pynab import Pynab
+import pytest
+
+BUDGET = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def test_pynab(server):
+    """
+    Creates a Pynab instance that talks to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Yields:
+        Pynab: The Pynab instance.
+    """
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        yield test_pynab
+
+
+def test_sync_applies_deltas_and_persists(server, test_pynab, tmp_path):
+    """
+    Test that the SQLite mirror syncs deltas and serves reads after a restart.
+
+    Asserts:
+        - The first sync downloads the full budget, the second sends its server knowledge.
+        - Deleted entities are removed and changed ones are replaced.
+        - A new storage on the same file reads the budget without contacting the API.
+    """
+    sent = []
+
+    def budget(method, path, request_json):
+        query = parse_qs(urlsplit(path).query)
+        last_knowledge = int(query.get("last_knowledge_of_server", [0])[0])
+        sent.append(last_knowledge)
+        if last_knowledge:
+            transactions = [
+                transaction_json("t1", amount=-5000),
+                transaction_json("t2", deleted=True),
+            ]
+            accounts = []
+        else:
+            transactions = [
+                transaction_json("t1"),
+                transaction_json("t2"),
+                transaction_json("t3"),
+            ]
+            accounts = [{"id": "account", "name": "Checking", "type": "checking"}]
+        data = {
+            "budget": {
+                "id": BUDGET,
+                "name": "Test Budget",
+                "accounts": accounts,
+                "transactions": transactions,
+            },
+            "server_knowledge": 7 if last_knowledge else 5,
+        }
+        return 200, {"data": data}, {}
+
+    server.route("GET", f"/budgets/{BUDGET}", body=budget)
+
+    path = str(tmp_path / "pynab.sqlite")
+    with SqliteStorage(pynab=test_pynab, path=path) as storage:
+        assert storage.sync(budget_id=BUDGET) == 5
+        assert storage.sync(budget_id=BUDGET) == 7
+
+    assert sent == [0, 5]
+
+    with SqliteStorage(pynab=test_pynab, path=path) as storage:
+        assert storage.server_knowledge(budget_id=BUDGET) == 7
+        transactions = storage.get_transactions(budget_id=BUDGET, account_id="account")
+        assert sorted(transactions) == ["t1", "t3"]
+        assert transactions["t1"].amount == -5000
+
+        budget = storage.get_budget(budget_id=BUDGET)
+        assert budget.name == "Test Budget"
+        assert sorted(budget._transactions) == ["t1", "t3"]
+        assert list(budget._accounts) == ["account"]
+
+    assert len(sent) == 2
+
+
+def test_reads_match_api_shapes_and_merge_month_deltas(server, test_pynab):
+    """
+    Test that mirror reads are shaped like the Api's and stay local.
+
+    Asserts:
+        - Months are keyed like `Api.get_months` and categories are grouped like `Api.get_categories`.
+        - Relationships of the returned objects resolve from the mirror without a request.
+        - A month delta keeps the stored categories it does not mention.
+    """
+
+    def budget(method, path, request_json):
+        query = parse_qs(urlsplit(path).query)
+        if int(query.get("last_knowledge_of_server", [0])[0]):
+            months = [
+                {
+                    "month": "2024-01-01",
+                    "income": 200,
+                    "categories": [
+                        {"id": "c1", "category_group_id": "g", "budgeted": 10},
+                        {"id": "c2", "deleted": True},
+                    ],
+                }
+            ]
+            return 200, {"data": {"budget": {"id": BUDGET, "months": months}}}, {}
+        months = [
+            {
+                "month": "2024-01-01",
+                "income": 100,
+                "categories": [
+                    {"id": "c1", "category_group_id": "g", "budgeted": 1},
+                    {"id": "c2", "category_group_id": "g", "budgeted": 2},
+                    {"id": "c3", "category_group_id": "g", "budgeted": 3},
+                ],
+            }
+        ]
+        data = {
+            "budget": {
+                "id": BUDGET,
+                "name": "Test Budget",
+                "accounts": [{"id": "account", "name": "Checking", "type": "checking"}],
+                "category_groups": [{"id": "g", "name": "Bills"}],
+                "categories": [{"id": "c1", "category_group_id": "g"}],
+                "months": months,
+                "transactions": [transaction_json("t1")],
+            },
+            "server_knowledge": 5,
+        }
+        return 200, {"data": data}, {}
+
+    server.route("GET", f"/budgets/{BUDGET}", body=budget)
+
+    with SqliteStorage(pynab=test_pynab) as storage:
+        storage.sync(budget_id=BUDGET)
+        requests = len(server.requests)
+
+        transactions = storage.get_transactions(budget_id=BUDGET)
+        assert transactions["t1"].account.name == "Checking"
+        category_groups = storage.get_categories(budget_id=BUDGET)
+        assert list(category_groups["g"].categories) == ["c1"]
+        assert list(storage.get_months(budget_id=BUDGET)) == ["2024 - January"]
+        assert len(server.requests) == requests
+
+        storage.sync(budget_id=BUDGET)
+        month = storage.get_months(budget_id=BUDGET)["2024 - January"]
+        assert month.income == 200
+        assert sorted(month.categories) == ["c1", "c3"]
+        assert month.categories["c1"].budgeted == 10
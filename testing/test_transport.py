@@ -0,0 +1,69 @@
+from testing.conftest import transaction_json
+from pynab.transport import Cassette, RecordingTransport, ReplayTransport
+from pynab import Pynab
+import gzip
+import pytest
+
+TOKEN = "secret-token"
+
+
+@pytest.fixture
+def server(server):
+    """
+    Adds endpoints whose responses mention the bearer token to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        StubServer: The stub server.
+    """
+    server.route("GET", "/user", body={"data": {"user": {"id": TOKEN}}})
+    server.route(
+        "GET",
+        "/budgets/last-used/transactions",
+        body={
+            "data": {
+                "transactions": [transaction_json("t1"), transaction_json("t2")],
+                "server_knowledge": 7,
+            }
+        },
+    )
+    return server
+
+
+def test_record_then_replay(server, tmp_path):
+    """
+    Test that recorded interactions replay offline, with the bearer token scrubbed.
+
+    Asserts:
+        - The cassette is gzip-compressed and never contains the token.
+        - Replayed responses parse like the recorded ones, streamed or not, under any API URL.
+        - A request that was not recorded raises a LookupError.
+    """
+    path = str(tmp_path / "budget.json.gz")
+    with Pynab(
+        bearer=TOKEN, api_url=server.url, transport=RecordingTransport(path=path)
+    ) as test_pynab:
+        test_pynab.api.get_user()
+        recorded = test_pynab.api.get_transactions()
+
+    with gzip.open(path, "rt") as file:
+        content = file.read()
+    assert TOKEN not in content
+    assert len(Cassette(path=path)) == 2
+
+    requests_sent = len(server.requests)
+    with Pynab(
+        bearer="other",
+        api_url="http://replay.invalid/v1",
+        rate_limit=False,
+        transport=ReplayTransport(path=path),
+    ) as test_pynab:
+        assert test_pynab.api.get_user().id == "<scrubbed>"
+        replayed = test_pynab.api.get_transactions()
+        assert list(replayed) == list(recorded) == ["t1", "t2"]
+        assert [t.id for t in test_pynab.api.iter_transactions()] == ["t1", "t2"]
+        with pytest.raises(LookupError):
+            test_pynab.api.get_payees()
+    assert len(server.requests) == requests_sent
@@ -0,0 +1,105 @@
+from datetime import date, datetime, timedelta, timezone
+from pynab.utils import JsonStream, _dict, parse_date, parse_datetime
+import json
+
+
+class Item:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def test_by_index_follows_changes():
+    """
+    Test that `_dict.by` lookups stay correct as the collection changes.
+
+    Asserts:
+        - Matches are returned in dictionary order.
+        - Inserted, replaced, merged and removed items are reflected in lookups.
+        - An item changed in place is found under its new value after `reindex`.
+        - Unhashable values fall back to a scan.
+        - A value that is not equal to itself (NaN) is matched by identity, without looping.
+    """
+    items = _dict()
+    for i in range(9):
+        items[i] = Item(group=i % 3, tags=[i])
+
+    assert list(items.by(field="group", value=1, first=False)) == [1, 4, 7]
+    assert items.by(field="group", value=2).group == 2
+    assert items.by(field="group", value=5) == {}
+
+    items[9] = Item(group=1, tags=[])
+    items.pop(4)
+    del items[7]
+    items.merge({1: Item(group=0, deleted=False), 2: Item(group=1, deleted=True)})
+    assert list(items.by(field="group", value=1, first=False)) == [9]
+    assert list(items.by(field="group", value=0, first=False)) == [0, 1, 3, 6]
+
+    items[9].group = 2
+    assert list(items.by(field="group", value=1, first=False)) == []
+    items[3].group = 2
+    items.reindex("group")
+    assert list(items.by(field="group", value=2, first=False)) == [3, 5, 8, 9]
+
+    assert items.by(field="tags", value=[5]) is items[5]
+
+    nan = float("nan")
+    items[0].group = nan
+    items.reindex("group")
+    assert items.by(field="group", value=nan) is items[0]
+    assert items.by(field="group", value=float("nan")) == {}
+
+
+def test_parse_dates():
+    """
+    Test that the fast date parsers handle the shapes the API returns.
+
+    Asserts:
+        - Plain dates, RFC 3339 timestamps and the epoch default are parsed.
+        - Unusual ISO 8601 shapes fall back to `isoparse`.
+    """
+    assert parse_date("2024-01-15") == date(2024, 1, 15)
+    assert parse_date("2024-01-15T23:59:59Z") == date(2024, 1, 15)
+    assert parse_date(None) == date(1970, 1, 1)
+    assert parse_datetime("2024-01-15T10:20:30.123Z") == datetime(
+        2024, 1, 15, 10, 20, 30, 123000, tzinfo=timezone.utc
+    )
+    assert parse_datetime("2024-01-15T10:20:30-05:00").utcoffset() == timedelta(
+        hours=-5
+    )
+    assert parse_datetime("2024-W03-1") == datetime(2024, 1, 15)
+
+
+def test_json_stream_skips_values_outside_the_path():
+    """
+    Test that `JsonStream` yields the array at its path from a document split into small chunks.
+
+    Asserts:
+        - Strings holding brackets, quotes and escapes, nested values and split numbers are handled.
+        - Values outside the path are skipped without being decoded.
+        - Each yielded element and key is decoded exactly once.
+    """
+    document = {
+        "meta": {"note": 'tricky "]}[{" \\ \u00e9', "sizes": [[1, 2], {"a": None}]},
+        "big": list(range(2000)),
+        "data": {
+            "count": 12345.5e-3,
+            "transactions": [{"id": "t1", "memo": "a}b"}, {"id": "t2"}, 1.25, None],
+        },
+    }
+    text = json.dumps(document).encode()
+    chunks = [text[i : i + 3] for i in range(0, len(text), 3)]
+
+    stream = JsonStream(chunks, path=("data", "transactions"))
+    decoded = []
+    raw_decode = stream._json.raw_decode
+
+    def counting_raw_decode(buffer, pos):
+        value, end = raw_decode(buffer, pos)
+        decoded.append(value)
+        return value, end
+
+    stream._json.raw_decode = counting_raw_decode
+    assert list(stream) == document["data"]["transactions"]
+    assert decoded == ["meta", "big", "data", "count", "transactions"] + list(
+        document["data"]["transactions"]
+    )
@@ -0,0 +1,286 @@
+from testing.conftest import transaction_json
+from pynab import Pynab, schemas
+from datetime import date
+import pytest
+
+BUDGET = "aaaaaaaa-0000-0000-0000-000000000000"
+
+
+@pytest.fixture
+def server(server):
+    """
+    Adds endpoints creating, updating and deleting transactions to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Returns:
+        StubServer: The stub server.
+    """
+
+    def create(method, path, request_json):
+        created = [
+            dict(
+                transaction_json(f"new-{i}"),
+                memo=transaction["memo"],
+                import_id=transaction["import_id"],
+            )
+            for i, transaction in enumerate(request_json["transactions"])
+            if transaction["import_id"] != "duplicate"
+        ]
+        data = {
+            "transaction_ids": [transaction["id"] for transaction in created],
+            "transactions": created,
+            "duplicate_import_ids": ["duplicate"],
+        }
+        return 201, {"data": data}, {}
+
+    def update(method, path, request_json):
+        updated = [
+            dict(transaction_json(transaction["id"]), **transaction)
+            for transaction in request_json["transactions"]
+        ]
+        data = {
+            "transaction_ids": [transaction["id"] for transaction in updated],
+            "transactions": updated,
+        }
+        return 209, {"data": data}, {}
+
+    server.route("POST", f"/budgets/{BUDGET}/transactions", body=create)
+    server.route("PATCH", f"/budgets/{BUDGET}/transactions", body=update)
+    server.route(
+        "DELETE",
+        f"/budgets/{BUDGET}/transactions/t3",
+        body={"data": {"transaction": transaction_json("t3", deleted=True)}},
+    )
+    return server
+
+
+@pytest.fixture
+def test_pynab(server):
+    """
+    Creates a Pynab instance that talks to the stub server.
+
+    Args:
+        server (StubServer): The running stub server.
+
+    Yields:
+        Pynab: The Pynab instance.
+    """
+    with Pynab(bearer="test", api_url=server.url) as test_pynab:
+        yield test_pynab
+
+
+def save_transaction(memo: str = "", import_id: str = None):
+    """
+    Builds a transaction to create.
+
+    Args:
+        memo (str, optional): The memo of the transaction. Defaults to "".
+        import_id (str, optional): The import ID of the transaction. Defaults to None.
+
+    Returns:
+        dict: The transaction fields.
+    """
+    return {
+        "account_id": "account",
+        "date": date(2024, 1, 15),
+        "amount": -1000,
+        "memo": memo,
+        "import_id": import_id,
+    }
+
+
+def test_flush_batches_and_merges_mutations(server, test_pynab):
+    """
+    Test that a flush sends one batch per kind and resolves every future.
+
+    Asserts:
+        - Creates and updates of a budget are sent as one POST and one PATCH.
+        - Repeated updates of a transaction are merged; a delete supersedes them.
+        - Futures resolve to the created, updated or deleted transactions.
+    """
+    queue = test_pynab.write_behind(max_batch=100, max_delay=60)
+
+    created = [
+        queue.create(save_transaction("a"), budget_id=BUDGET),
+        queue.create(save_transaction("b", import_id="duplicate"), budget_id=BUDGET),
+        queue.create(save_transaction("c"), budget_id=BUDGET),
+    ]
+
+    t1 = schemas.Transaction(pynab=test_pynab, _json=transaction_json("t1"))
+    t1.memo = "first"
+    first = queue.update(t1, budget_id=BUDGET)
+    t1.category_id = "groceries"
+    second = queue.update(t1, budget_id=BUDGET)
+    flagged = queue.update(
+        budget_id=BUDGET, transaction_id="t2", changes={"flag_color": "red"}
+    )
+    superseded = queue.update(
+        budget_id=BUDGET, transaction_id="t3", changes={"memo": "gone"}
+    )
+    deleted = queue.delete(budget_id=BUDGET, transaction_id="t3")
+
+    assert len(queue) == 6
+    assert server.requests == []
+    queue.flush()
+    assert len(queue) == 0
+
+    methods = [method for method, _, _ in server.requests]
+    assert methods == ["POST", "PATCH", "DELETE"]
+    assert [t["memo"] for t in server.requests[0][2]["transactions"]] == ["a", "b", "c"]
+    assert server.requests[0][2]["transactions"][0]["date"] == "2024-01-15"
+    assert server.requests[1][2] == {
+        "transactions": [
+            {"id": "t1", "memo": "first", "category_id": "groceries"},
+            {"id": "t2", "flag_color": "red"},
+        ]
+    }
+
+    assert [future.result() and future.result().memo for future in created] == [
+        "a",
+        None,
+        "c",
+    ]
+    assert first.result() is second.result()
+    assert first.result().category_id == "groceries"
+    assert t1.changes() == {}
+    assert flagged.result().id == "t2"
+    assert superseded.result() is deleted.result()
+    assert deleted.result().deleted
+
+
+def test_updates_merge_in_queue_order(server, test_pynab):
+    """
+    Test that explicit changes and transaction objects are merged in queue order.
+
+    Asserts:
+        - Explicit changes queued after a transaction object win over its changes.
+        - A transaction object queued after explicit changes wins over them.
+    """
+    queue = test_pynab.write_behind(max_batch=100, max_delay=60)
+
+    t1 = schemas.Transaction(pynab=test_pynab, _json=transaction_json("t1"))
+    t1.memo = "b"
+    queue.update(t1, budget_id=BUDGET)
+    queue.update(budget_id=BUDGET, transaction_id="t1", changes={"memo": "c"})
+
+    t2 = schemas.Transaction(pynab=test_pynab, _json=transaction_json("t2"))
+    queue.update(budget_id=BUDGET, transaction_id="t2", changes={"memo": "c"})
+    t2.memo = "b"
+    queue.update(t2, budget_id=BUDGET)
+    queue.flush()
+
+    assert server.requests[-1][2] == {
+        "transactions": [{"id": "t1", "memo": "c"}, {"id": "t2", "memo": "b"}]
+    }
+
+
+def test_queue_flushes_on_size_and_delay(server, test_pynab):
+    """
+    Test that the background thread flushes on the size and time thresholds.
+
+    Asserts:
+        - Reaching `max_batch` flushes without waiting for the delay.
+        - A lone mutation is flushed once it has waited `max_delay`.
+        - Errors are raised from the futures of their batch.
+    """
+    queue = test_pynab.write_behind(max_batch=2, max_delay=60)
+    futures = [queue.create(save_transaction(m), budget_id=BUDGET) for m in "ab"]
+    assert [future.result(timeout=5).memo for future in futures] == ["a", "b"]
+
+    queue.max_delay = 0.1
+    future = queue.update(budget_id=BUDGET, transaction_id="t1", changes={"memo": "x"})
+    assert future.result(timeout=5).memo == "x"
+
+    missing = queue.create(save_transaction("c"), budget_id="missing")
+    with pytest.raises(Exception):
+        missing.result(timeout=5)
+
+
+def test_edits_in_flight_are_not_lost(server, test_pynab):
+    """
+    Test that a field edited while its update is in flight is still sent later.
+
+    Asserts:
+        - Only the fields sent become the new baseline of the transaction.
+        - The edit made during the request is sent by the next flush.
+    """
+    queue = test_pynab.write_behind(max_batch=100, max_delay=60)
+    t1 = schemas.Transaction(pynab=test_pynab, _json=transaction_json("t1"))
+
+    def update(method, path, request_json):
+        t1.category_id = "edited in flight"
+        updated = [transaction_json(t["id"]) for t in request_json["transactions"]]
+        data = {"transaction_ids": ["t1"], "transactions": updated}
+        return 209, {"data": data}, {}
+
+    server.route("PATCH", f"/budgets/{BUDGET}/transactions", body=update)
+    t1.memo = "sent"
+    queue.update(t1, budget_id=BUDGET)
+    queue.flush()
+
+    assert t1.changes() == {"category_id": "edited in flight"}
+    queue.update(t1, budget_id=BUDGET)
+    queue.flush()
+    assert server.requests[-1][2] == {
+        "transactions": [{"id": "t1", "category_id": "edited in flight"}]
+    }
+
+
+def test_creates_are_matched_by_import_id(server, test_pynab):
+    """
+    Test that created transactions resolve the futures of their own creates.
+
+    Asserts:
+        - Futures are matched by import ID when the response is reordered.
+        - A create missing from the response fails instead of taking another's transaction.
+    """
+
+    def create(method, path, request_json):
+        created = [
+            dict(
+                transaction_json(t["import_id"]),
+                memo=t["memo"],
+                import_id=t["import_id"],
+            )
+            for t in reversed(request_json["transactions"])
+            if t["import_id"] != "lost"
+        ]
+        data = {"transaction_ids": [t["id"] for t in created], "transactions": created}
+        return 201, {"data": data}, {}
+
+    server.route("POST", f"/budgets/{BUDGET}/transactions", body=create)
+    queue = test_pynab.write_behind(max_batch=100, max_delay=60)
+    futures = [
+        queue.create(save_transaction(memo, import_id=memo), budget_id=BUDGET)
+        for memo in ("a", "lost", "c")
+    ]
+    queue.flush()
+
+    assert futures[0].result().memo == "a"
+    assert futures[2].result().memo == "c"
+    with pytest.raises(Exception):
+        futures[1].result()
+
+
+def test_deleting_a_queued_create_cancels_it(server, test_pynab):
+    """
+    Test that deleting the object of a queued create cancels the create.
+
+    Asserts:
+        - Neither request is sent and both futures resolve to None.
+        - Deleting a transaction without an ID and without a queued create raises.
+    """
+    queue = test_pynab.write_behind(max_batch=100, max_delay=60)
+    transaction = save_transaction("a")
+    created = queue.create(transaction, budget_id=BUDGET)
+    deleted = queue.delete(transaction, budget_id=BUDGET)
+
+    assert len(queue) == 0
+    assert created.result() is None and deleted.result() is None
+    queue.flush()
+    assert server.requests == []
+
+    with pytest.raises(ValueError):
+        queue.delete(schemas.Transaction(_json={}), budget_id=BUDGET)